@@ -1,6 +1,9 @@
 import os
 
 from celery import Celery
+from celery.signals import worker_process_shutdown, worker_shutdown
+
+from fin_track.logqueue import stop_listeners
 
 # Atur default settings Django untuk Celery
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "fin_track.settings")
@@ -12,3 +15,7 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 
 # Temukan task secara otomatis di apps
 app.autodiscover_tasks()
+
+# log yang masih di antrian ditulis ke file sebelum worker (dan proses child prefork) berhenti
+worker_process_shutdown.connect(stop_listeners, weak=False)
+worker_shutdown.connect(stop_listeners, weak=False)
@@ -1,16 +1,73 @@
 import json
 import logging
-import traceback
+
+# atribut bawaan LogRecord, atribut lain (logger.info(..., extra={...})) ditulis sebagai field json
+RESERVED_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {
+    "message",
+    "asctime",
+    "taskName",
+}
 
 
 class JSONFormatter(logging.Formatter):
+    """
+    Formatter 1 baris json per record.
+    event > msg % args (hanya diformat saat record benar-benar ditulis), msg dict tanpa args ditulis
+    sebagai object json. Traceback exc_info / stack_info dan field extra ikut ditulis.
+    Bagian yang sama antar record (name + level, timestamp per detik) di cache
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.encoder = json.JSONEncoder(default=str)
+        # {(name, levelname): '"name": ..., "level": ...'}
+        self.static_fields = {}
+        # timestamp detik terakhir > (detik, json timestamp)
+        self.last_timestamp = (None, None)
+
+    def timestamp(self, record):
+        # format default memakai milidetik, hanya datefmt (tanpa milidetik) yang bisa di cache per detik
+        if not self.datefmt:
+            return self.encoder.encode(self.formatTime(record))
+        second = int(record.created)
+        cached_second, value = self.last_timestamp
+        if cached_second != second:
+            value = self.encoder.encode(self.formatTime(record, self.datefmt))
+            self.last_timestamp = (second, value)
+        return value
+
+    def event(self, record):
+        if isinstance(record.msg, str) or record.args:
+            return record.getMessage()
+        # dict (misal statistik pemrosesan) tetap ditulis sebagai object json
+        return record.msg
+
     def format(self, record):
-        log_record = {
-            "timestamp": self.formatTime(record, self.datefmt),
-            "name": record.name,
-            "level": record.levelname,
-            "func": record.funcName,
-            "event": record.msg,
-        }
-
-        return json.dumps(log_record)
+        key = (record.name, record.levelname)
+        static = self.static_fields.get(key)
+        if static is None:
+            static = self.static_fields[key] = (
+                f'"name": {self.encoder.encode(record.name)}, '
+                f'"level": {self.encoder.encode(record.levelname)}'
+            )
+
+        encode = self.encoder.encode
+        parts = [
+            f'{{"timestamp": {self.timestamp(record)}',
+            static,
+            f'"func": {encode(record.funcName)}',
+            f'"event": {encode(self.event(record))}',
+        ]
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            parts.append(f'"exc_info": {encode(record.exc_text)}')
+        if record.stack_info:
+            parts.append(f'"stack_info": {encode(self.formatStack(record.stack_info))}')
+
+        for name, value in record.__dict__.items():
+            if name not in RESERVED_ATTRS and not name.startswith("_"):
+                parts.append(f"{encode(name)}: {encode(value)}")
+
+        return ", ".join(parts) + "}"
@@ -0,0 +1,115 @@
+from logging.handlers import QueueHandler, RotatingFileHandler
+from queue import Queue
+import gzip
+import logging
+import os
+import shutil
+import threading
+
+# semua BackgroundQueueHandler, untuk flush saat worker celery berhenti
+instances = set()
+
+
+def compress_file(source, dest):
+    # source (file log hasil rotasi) > dest (.gz), source dihapus setelah selesai
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+class GzipRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler dengan file hasil rotasi dikompres gzip (debug.log.1.gz, debug.log.2.gz, ...).
+    Kompresi berjalan di thread terpisah, penulisan log tidak menunggu kompresi selesai
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.compressor = None
+        super().__init__(*args, **kwargs)
+
+    def rotation_filename(self, default_name):
+        return f"{default_name}.gz"
+
+    def rotate(self, source, dest):
+        # file lama di rename dulu (cepat) lalu dikompres di background
+        if not os.path.exists(source):
+            return
+        plain = dest.removesuffix(".gz")
+        os.rename(source, plain)
+        self.compressor = threading.Thread(
+            target=compress_file, args=(plain, dest), name="log-compressor"
+        )
+        self.compressor.start()
+
+    def wait_compress(self):
+        if self.compressor is not None:
+            self.compressor.join()
+            self.compressor = None
+
+    def doRollover(self):
+        # urutan .1.gz > .2.gz harus menunggu kompresi rotasi sebelumnya selesai
+        self.wait_compress()
+        super().doRollover()
+
+    def close(self):
+        self.wait_compress()
+        super().close()
+
+
+class BackgroundQueueHandler(QueueHandler):
+    """
+    QueueHandler untuk settings.LOGGING, format json dan penulisan file dilakukan thread listener.
+    Listener (handler.listener, dibuat dictConfig dari key "handlers") dijalankan saat record pertama
+    di tiap proses, sehingga proses hasil fork (worker celery prefork) memiliki thread listener sendiri
+    """
+
+    def __init__(self, queue=None):
+        super().__init__(queue if queue is not None else Queue())
+        self.listener = None
+        self.pid = None
+        self.listener_lock = threading.Lock()
+        instances.add(self)
+
+    def start(self):
+        with self.listener_lock:
+            if self.pid == os.getpid() or self.listener is None:
+                return
+            if self.pid is not None:
+                # proses hasil fork > thread listener proses induk tidak ikut, antrian dibuat baru
+                self.queue = self.listener.queue = type(self.queue)()
+            self.listener.start()
+            self.pid = os.getpid()
+
+    def stop(self):
+        # tunggu semua record di antrian selesai ditulis
+        with self.listener_lock:
+            if self.pid != os.getpid():
+                return
+            self.listener.stop()
+            self.pid = None
+        for handler in self.listener.handlers:
+            handler.flush()
+
+    def prepare(self, record):
+        # record tidak diformat di sini (msg dict tetap dict untuk JSONFormatter),
+        # traceback disimpan sebagai teks agar frame tidak tertahan di antrian
+        record = logging.makeLogRecord(record.__dict__)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        if self.pid != os.getpid():
+            self.start()
+        super().emit(record)
+
+    def close(self):
+        self.stop()
+        super().close()
+
+
+def stop_listeners(**kwargs):
+    # dipanggil dari signal worker_process_shutdown / worker_shutdown celery
+    for handler in list(instances):
+        handler.stop()
@@ -156,6 +156,14 @@ CELERY_BEAT_SCHEDULE = {
         "task": "finlogic.tasks.check_and_process_file_task",
         "schedule": crontab(hour="8,12,16,20,0,4", minute=0),
     },
+    "cleanup_processing_runs_task": {
+        "task": "finlogic.tasks.cleanup_processing_runs_task",
+        "schedule": crontab(hour=2, minute=30),
+    },
+    "send_notification_digest_task": {
+        "task": "finlogic.tasks.send_notification_digest_task",
+        "schedule": crontab(hour="8,20", minute=30),
+    },
     # "test_run_check_and_process_file_task": {
     #     "task": "finlogic.tasks.check_and_process_file_task",
     #     "schedule": timedelta(minutes=3)
@@ -186,26 +194,100 @@ LOGGING = {
         "console": {"class": "logging.StreamHandler", "formatter": "simple"},
         "file_debug": {
             "level": "DEBUG",
-            "class": "logging.handlers.RotatingFileHandler",
+            "class": "fin_track.logqueue.GzipRotatingFileHandler",
             "filename": os.path.join(BASE_DIR.parent, "logs", "debug.log"),
             "formatter": "json",
-            "maxBytes": 1024 * 5,
-            "backupCount": 3,
+            "maxBytes": 1024 * 1024 * 10,
+            "backupCount": 5,
         },
         "file_error": {
             "level": "ERROR",
-            "class": "logging.handlers.RotatingFileHandler",
+            "class": "fin_track.logqueue.GzipRotatingFileHandler",
             "formatter": "json",
             "filename": os.path.join(BASE_DIR.parent, "logs", "error.log"),
-            "maxBytes": 1024 * 5,
-            "backupCount": 3,
+            "maxBytes": 1024 * 1024 * 10,
+            "backupCount": 5,
+        },
+        # format json dan penulisan file dilakukan thread listener, logger tidak menunggu disk
+        "queue": {
+            "class": "fin_track.logqueue.BackgroundQueueHandler",
+            "handlers": ["file_debug", "file_error"],
+            "respect_handler_level": True,
         },
     },
     "loggers": {
         "fintrack": {
-            "handlers": ["file_debug", "file_error"],
+            "handlers": ["queue"],
             "level": "DEBUG",
             "propagate": True,
         }
     },
 }
+
+# simpan salinan worksheet di database (finlogic.WorksheetMirror)
+# worksheet hanya di download ulang jika header, kolom key atau baris yang akan ditimpa berbeda dengan salinan
+SHEETS_MIRROR = True
+# False > mirror dipercaya tanpa cek ke google sheets (tanpa request baca sama sekali)
+SHEETS_MIRROR_VERIFY = True
+
+# file baru yang tertinggal (misal setelah server mati) diproses sekaligus dalam 1 task
+# data_N.csv berurutan digabung lalu dikirim ke google sheets dalam 1 update
+PROCESS_BACKLOG = True
+# jumlah proses untuk parsing file backlog, None > sesuai jumlah cpu
+BACKLOG_WORKERS = None
+
+# True > file lama selalu di hash ulang walaupun ukuran, mtime dan inode file tidak berubah
+FILE_HASH_PARANOID = False
+
+# algoritma hash file baru (sha256 / blake2b), disimpan di FileIntegrity.hash_algorithm
+FILE_HASH_ALGORITHM = "sha256"
+
+# file lama yang hanya bertambah di akhir > hanya baris baru yang diproses jika isi sebelumnya tidak berubah
+TAIL_PROCESSING = True
+
+# file berukuran minimal PARALLEL_PARSE_MIN_BYTES di parsing paralel per chunk baris
+PARALLEL_PARSE_MIN_BYTES = 64 * 1024 * 1024
+# jumlah proses untuk parsing paralel, None > sesuai jumlah cpu
+PARALLEL_PARSE_WORKERS = None
+
+# engine agregasi data file (python / numpy), numpy harus diinstall terpisah
+# numpy tidak terinstall > engine python, hasil grouping sama
+AGGREGATION_BACKEND = "python"
+
+# fungsi yang menerima statistik tiap pemrosesan file (dict RunStats.as_dict), contoh ["modul.fungsi"]
+# finlogic.run_history.save_run > simpan ke model ProcessingRun
+# finlogic.metrics.record_run > tambah ke metric prometheus (/metrics/)
+RUN_STATS_HOOKS = ["finlogic.run_history.save_run", "finlogic.metrics.record_run"]
+
+# ProcessingRun lebih lama dari PROCESSING_RUN_RETENTION_DAYS hari dihapus setiap hari
+PROCESSING_RUN_RETENTION_DAYS = 90
+# True > diringkas dulu ke ProcessingRunDaily (jumlah run, total counter, persentil tahap) sebelum dihapus
+PROCESSING_RUN_ROLLUP = True
+
+# baris data yang ditolak (field kosong) ditulis ke file csv di QUARANTINE_DIR, 1 file per pemrosesan
+QUARANTINE_DIR = os.path.join(BASE_DIR.parent, "logs", "quarantine")
+# jumlah nomor baris ditolak yang ditampilkan di log ringkasan dan email
+VALIDATION_SAMPLE_ROWS = 20
+
+# notifikasi non-kritis (file tidak berubah, berhasil diproses, file tidak ditemukan) disimpan di outbox
+# dan dikirim sebagai 1 email ringkasan per penerima oleh send_notification_digest_task
+# False > semua notifikasi langsung dikirim per pesan
+NOTIFICATION_DIGEST = True
+# pesan yang sama untuk penerima yang sama yang belum terkirim digabung jadi 1 baris digest (count bertambah)
+# selama baris itu dibuat dalam window (detik). Setelah digest terkirim pesan yang sama muncul lagi di digest berikutnya
+NOTIFICATION_DEDUPE_WINDOW = 60 * 60 * 24
+# notifikasi yang sudah terkirim lebih lama dari NOTIFICATION_RETENTION_DAYS hari dihapus
+NOTIFICATION_RETENTION_DAYS = 30
+
+# metric prometheus di /metrics/
+# metric semua worker celery dijumlahkan di redis METRICS_REDIS_URL, kosong > memakai
+# CELERY_BROKER_URL jika broker nya redis. Tanpa redis metric disimpan di memori proses
+# (hanya berisi data proses web itu sendiri, warning dicatat saat backend dibuat)
+METRICS_REDIS_URL = os.environ.get("METRICS_REDIS_URL") or (
+    CELERY_BROKER_URL
+    if CELERY_BROKER_URL and CELERY_BROKER_URL.startswith(("redis://", "rediss://"))
+    else None
+)
+METRICS_BACKEND = "redis" if METRICS_REDIS_URL else "memory"
+# diisi > request /metrics/ harus memakai header "Authorization: Bearer <token>"
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
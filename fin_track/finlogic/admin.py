@@ -1,3 +1,93 @@
 from django.contrib import admin
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils import timezone
+from datetime import timedelta
+from .models import Notification, ProcessingRun, ProcessingRunDaily
+from .run_history import daily_stage_stats
+from .run_stats import STAGES
+
 
 # Register your models here.
+@admin.register(ProcessingRun)
+class ProcessingRunAdmin(admin.ModelAdmin):
+    list_display = [
+        "started_at",
+        "file_name",
+        "outcome",
+        "wall_time",
+        "rows_read",
+        "rows_skipped",
+        "api_calls",
+        "error_class",
+    ]
+    list_filter = ["outcome"]
+    search_fields = ["file_name", "error_class"]
+    date_hierarchy = "started_at"
+    change_list_template = "admin/finlogic/processingrun/change_list.html"
+
+    def has_add_permission(self, request):
+        # riwayat hanya dibuat oleh task
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "stats/",
+                self.admin_site.admin_view(self.stats_view),
+                name="finlogic_processingrun_stats",
+            ),
+            *super().get_urls(),
+        ]
+
+    def stats_view(self, request):
+        # persentil p50 / p95 waktu tiap tahap per hari, ?days=N (default 30 hari)
+        try:
+            days = max(int(request.GET.get("days", 30)), 1)
+        except ValueError:
+            days = 30
+        rows = daily_stage_stats(timezone.now() - timedelta(days=days))
+        stages = [name for name in STAGES if any(name in row["stages"] for row in rows)]
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Durasi tahap pemrosesan",
+            "days": days,
+            "stages": stages,
+            "rows": [
+                {
+                    "day": row["day"],
+                    "runs": row["runs"],
+                    "stages": [row["stages"].get(name) for name in stages],
+                }
+                for row in rows
+            ],
+        }
+        return TemplateResponse(
+            request, "admin/finlogic/processingrun/stats.html", context
+        )
+
+
+@admin.register(ProcessingRunDaily)
+class ProcessingRunDailyAdmin(admin.ModelAdmin):
+    list_display = ["day", "outcome", "runs", "wall_time", "rows_read", "api_calls"]
+    list_filter = ["outcome"]
+    date_hierarchy = "day"
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ["created_at", "recipient", "subject", "count", "sent_at"]
+    list_filter = ["subject", ("sent_at", admin.EmptyFieldListFilter)]
+    search_fields = ["recipient", "subject"]
+    date_hierarchy = "created_at"
+
+    def has_add_permission(self, request):
+        # notifikasi hanya dibuat oleh sistem
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,737 @@
+from collections import deque
+import csv
+import hashlib
+import io
+import itertools
+import operator
+import os
+import time
+import zlib
+from .hashing import new_hasher
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ukuran buffer baca file, byte yang sama dipakai untuk hash dan parsing csv
+BUFFER_SIZE = 1024 * 1024
+# rata-rata chunk ~CHUNK_MASK + 1 baris setelah CHUNK_MIN_ROWS, paling banyak CHUNK_MAX_ROWS baris
+CHUNK_MASK = 4095
+CHUNK_MIN_ROWS = 512
+CHUNK_MAX_ROWS = 32768
+# chunk yang di parsing paralel dikirim ke proses worker per PARSE_BATCH_BYTES
+PARSE_BATCH_BYTES = 1024 * 1024
+# batch yang sudah dikirim tapi hasilnya belum digabung, paling banyak IN_FLIGHT_PER_WORKER x jumlah worker
+IN_FLIGHT_PER_WORKER = 2
+
+
+class CsvAggregator:
+    """
+    Agregasi data file csv secara streaming.
+    Baris dibaca sebagai tuple dengan index kolom dari header, hasilnya disimpan sebagai total berjalan
+    per (month, category) dan per (month, date) sehingga memori hanya sebanyak jumlah group
+    """
+
+    def __init__(self, on_missing=None):
+        # callback untuk baris yang memiliki field kosong > on_missing(nomor_baris, [nama_field], isi_baris)
+        self.on_missing = on_missing
+
+        # {month: {category: total}}
+        self.grouped_data_category = {}
+        # {month: {date: total}}
+        self.grouped_monthly_data = {}
+        # jumlah baris per group > {(month, category): count} dan {(month, date): count}
+        self.category_counts = {}
+        self.monthly_counts = {}
+
+        self.rows = 0
+        self.skipped = 0
+
+    def feed(self, f, start=0):
+        # start > jumlah baris data yang sudah diproses sebelumnya, untuk nomor baris on_missing
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return self
+
+        n = len(header)
+        idx_date = header.index("date")
+        idx_category = header.index("category")
+        idx_price = header.index("price")
+
+        grouped_data_category = self.grouped_data_category
+        grouped_monthly_data = self.grouped_monthly_data
+        category_counts = self.category_counts
+        monthly_counts = self.monthly_counts
+        # cache month per date, "2025-11-08" => "2025-11"
+        months = {}
+
+        i = start
+        for row in reader:
+            # baris kosong dilewati tanpa dihitung (sama seperti csv.DictReader)
+            if not row:
+                continue
+            i += 1
+
+            # cek field kosong hanya jika perlu, kolom yang kurang dianggap kosong
+            if len(row) != n or "" in row:
+                missing_fields = [
+                    header[j] for j in range(n) if j >= len(row) or not row[j]
+                ]
+                if missing_fields:
+                    self.skipped += 1
+                    if self.on_missing:
+                        self.on_missing(i, missing_fields, row)
+                    continue
+
+            date = row[idx_date]
+            category = row[idx_category]
+            price = int(row[idx_price])
+
+            month = months.get(date)
+            if month is None:
+                month = months[date] = "-".join(date.split("-")[:2])
+
+            categories = grouped_data_category.get(month)
+            if categories is None:
+                categories = grouped_data_category[month] = {}
+            categories[category] = categories.get(category, 0) + price
+
+            dates = grouped_monthly_data.get(month)
+            if dates is None:
+                dates = grouped_monthly_data[month] = {}
+            dates[date] = dates.get(date, 0) + price
+
+            key = (month, category)
+            category_counts[key] = category_counts.get(key, 0) + 1
+            key = (month, date)
+            monthly_counts[key] = monthly_counts.get(key, 0) + 1
+
+        self.rows += i - start
+        return self
+
+
+def factorize(values):
+    # nilai unik berurutan sesuai kemunculan pertama dan kode integer tiap nilai
+    uniques, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return uniques[order], rank[inverse.reshape(-1)]
+
+
+def factorize_strings(values):
+    # sama dengan factorize untuk list string, tanpa mengurutkan string dengan numpy
+    uniques = list(dict.fromkeys(values))
+    index = {value: i for i, value in enumerate(uniques)}
+    codes = np.fromiter(
+        map(index.__getitem__, values), dtype=np.int64, count=len(values)
+    )
+    return uniques, codes
+
+
+def group_totals(keys, prices):
+    # key unik (urut kemunculan pertama), total price dan jumlah baris per key
+    key_values, key_codes = factorize(keys)
+    totals = np.zeros(len(key_values), dtype=np.int64)
+    np.add.at(totals, key_codes, prices)
+    counts = np.bincount(key_codes, minlength=len(key_values))
+    return key_values, totals, counts
+
+
+class NumpyAggregator(CsvAggregator):
+    """
+    Agregasi data file csv dengan numpy.
+    Kolom date, category dan price disimpan sebagai array, month dan category diubah ke kode integer
+    lalu total per group dihitung dengan np.add.at / np.bincount.
+    Baris beberapa bagian file (misal semua chunk 1 batch) bisa dibaca dulu dengan collect lalu di agregasi
+    sekaligus dengan aggregate_groups, total tiap bagian dipisah dari hasil agregasi.
+    Hasil grouped_* dan *_counts sama dengan CsvAggregator termasuk urutan key
+    """
+
+    def __init__(self, on_missing=None):
+        super().__init__(on_missing)
+        # baris yang sudah dibaca tapi belum di agregasi > date, category, price dan
+        # jumlah baris tiap bagian file [(bagian, jumlah baris)]
+        self.columns = ([], [], [], [])
+
+    def feed(self, f, start=0):
+        self.collect(f, start)
+        (result,) = self.aggregate_groups(1)
+        self.merge(*result)
+        return self
+
+    def collect(self, f, start=0, group=0):
+        # baca baris data ke self.columns tanpa agregasi, hasil > jumlah baris data
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return 0
+
+        n = len(header)
+        idx_date = header.index("date")
+        idx_category = header.index("category")
+        idx_price = header.index("price")
+        dates, categories, prices, spans = self.columns
+
+        # baris kosong dilewati tanpa dihitung (sama seperti csv.DictReader)
+        rows = list(filter(None, reader))
+        if set(map(len, rows)) <= {n} and not any(
+            map(operator.contains, rows, itertools.repeat(""))
+        ):
+            # semua baris lengkap > kolom diambil sekaligus tanpa loop per baris
+            if rows:
+                dates.extend(map(operator.itemgetter(idx_date), rows))
+                categories.extend(map(operator.itemgetter(idx_category), rows))
+                prices.extend(map(operator.itemgetter(idx_price), rows))
+                spans.append((group, len(rows)))
+            self.rows += len(rows)
+            return len(rows)
+
+        count = 0
+        for i, row in enumerate(rows, start=start + 1):
+            if len(row) != n or "" in row:
+                missing_fields = [
+                    header[j] for j in range(n) if j >= len(row) or not row[j]
+                ]
+                if missing_fields:
+                    self.skipped += 1
+                    if self.on_missing:
+                        self.on_missing(i, missing_fields, row)
+                    continue
+
+            dates.append(row[idx_date])
+            categories.append(row[idx_category])
+            prices.append(row[idx_price])
+            count += 1
+        spans.append((group, count))
+        self.rows += len(rows)
+        return len(rows)
+
+    def collect_text(self, header, text, group=0):
+        # text > baris data tanpa header. Tanpa tanda kutip dan semua baris lengkap (kasus umum) kolom
+        # diambil dari hasil split seluruh text sekaligus, selain itu dibaca dengan csv.reader
+        columns = next(csv.reader([header]))
+        n = len(columns)
+        if text and '"' not in text and "\r" not in text:
+            lines = list(filter(None, text.split("\n")))
+            if set(map(operator.methodcaller("count", ","), lines)) == {n - 1}:
+                fields = ",".join(lines).split(",")
+                if "" not in fields:
+                    dates, categories, prices, spans = self.columns
+                    dates.extend(fields[columns.index("date") :: n])
+                    categories.extend(fields[columns.index("category") :: n])
+                    prices.extend(fields[columns.index("price") :: n])
+                    spans.append((group, len(lines)))
+                    self.rows += len(lines)
+                    return len(lines)
+        return self.collect(
+            itertools.chain([header], io.StringIO(text, newline="")), group=group
+        )
+
+    def aggregate_groups(self, size):
+        """
+        Agregasi semua baris hasil collect dalam 1 kali operasi numpy.
+        Hasil > list size item (grouped_data_category, grouped_monthly_data, category_counts,
+        monthly_counts), 1 item per bagian file
+        """
+        dates, categories, prices, spans = self.columns
+        self.columns = ([], [], [], [])
+        results = [({}, {}, {}, {}) for _ in range(size)]
+        if not dates:
+            return results
+
+        prices = np.fromiter(map(int, prices), dtype=np.int64, count=len(prices))
+        span_groups, span_counts = zip(*spans)
+        groups = np.repeat(np.array(span_groups, dtype=np.int64), span_counts)
+        date_values, date_codes = factorize_strings(dates)
+        # month dihitung per date unik, "2025-11-08" => "2025-11"
+        month_values, date_months = factorize_strings(
+            ["-".join(date.split("-")[:2]) for date in date_values]
+        )
+        month_values = np.array(month_values, dtype=object)
+        date_values = np.array(date_values, dtype=object)
+        category_values, category_codes = factorize_strings(categories)
+        category_values = np.array(category_values, dtype=object)
+        n_categories = len(category_values)
+        n_keys = len(month_values) * n_categories
+
+        # total per (bagian, month, category), key = bagian * jumlah (month, category) + kode (month, category)
+        keys = groups * n_keys + date_months[date_codes] * n_categories + category_codes
+        key_values, totals, counts = group_totals(keys, prices)
+        key_groups, key_values = np.divmod(key_values, n_keys)
+        month_codes, category_codes = np.divmod(key_values, n_categories)
+        for group, month, category, total, count in zip(
+            key_groups.tolist(),
+            month_values[month_codes].tolist(),
+            category_values[category_codes].tolist(),
+            totals.tolist(),
+            counts.tolist(),
+        ):
+            grouped_data_category, _, category_counts, _ = results[group]
+            grouped_data_category.setdefault(month, {})[category] = total
+            category_counts[(month, category)] = count
+
+        # total per (bagian, date), date sudah menentukan month
+        keys = groups * len(date_values) + date_codes
+        key_values, totals, counts = group_totals(keys, prices)
+        key_groups, date_codes = np.divmod(key_values, len(date_values))
+        for group, month, date, total, count in zip(
+            key_groups.tolist(),
+            month_values[date_months[date_codes]].tolist(),
+            date_values[date_codes].tolist(),
+            totals.tolist(),
+            counts.tolist(),
+        ):
+            _, grouped_monthly_data, _, monthly_counts = results[group]
+            grouped_monthly_data.setdefault(month, {})[date] = total
+            monthly_counts[(month, date)] = count
+        return results
+
+    def merge(self, grouped_data_category, grouped_monthly_data, *counts):
+        # tambahkan hasil aggregate_groups ke total berjalan
+        for merged, grouped in (
+            (self.grouped_data_category, grouped_data_category),
+            (self.grouped_monthly_data, grouped_monthly_data),
+        ):
+            for month, items in grouped.items():
+                merged_items = merged.setdefault(month, {})
+                for key, total in items.items():
+                    merged_items[key] = merged_items.get(key, 0) + total
+        for merged, items in zip((self.category_counts, self.monthly_counts), counts):
+            for key, count in items.items():
+                merged[key] = merged.get(key, 0) + count
+
+
+# engine agregasi untuk settings.AGGREGATION_BACKEND
+AGGREGATORS = {"python": CsvAggregator, "numpy": NumpyAggregator}
+
+
+def get_aggregator(backend="python"):
+    # numpy tidak terinstall > engine python, hasilnya sama
+    if backend not in AGGREGATORS:
+        raise ValueError(f"Engine agregasi tidak didukung: {backend}")
+    if backend == "numpy" and np is None:
+        return CsvAggregator
+    return AGGREGATORS[backend]
+
+
+def executor_workers(executor):
+    # jumlah proses worker ProcessPoolExecutor, executor lain > jumlah cpu
+    workers = getattr(executor, "_max_workers", None)
+    return workers if isinstance(workers, int) else os.cpu_count() or 1
+
+
+def parse_chunks(header, items, backend="python"):
+    """
+    Agregasi beberapa chunk baris, dipakai langsung atau di proses worker ProcessPoolExecutor.
+    Nomor baris di missing dihitung dari awal chunk, diubah ke nomor baris file oleh ChunkedAggregator
+    """
+    aggregator_class = get_aggregator(backend)
+    if aggregator_class is NumpyAggregator:
+        return parse_chunks_numpy(header, items)
+    results = []
+    for data in items:
+        missing = []
+        aggregator = aggregator_class(
+            on_missing=lambda i, fields, row: missing.append((i, fields, row))
+        ).feed(itertools.chain([header], io.StringIO(data.decode("utf-8"), newline="")))
+        results.append(
+            (
+                aggregator.rows,
+                aggregator.grouped_data_category,
+                aggregator.grouped_monthly_data,
+                missing,
+            )
+        )
+    return results
+
+
+def parse_chunks_numpy(header, items):
+    # baris semua chunk dibaca dulu lalu di agregasi numpy sekaligus, total per chunk dipisah dari hasilnya
+    aggregator = NumpyAggregator(
+        on_missing=lambda i, fields, row: missing[-1].append((i, fields, row))
+    )
+    rows, missing = [], []
+    for group, data in enumerate(items):
+        missing.append([])
+        rows.append(aggregator.collect_text(header, data.decode("utf-8"), group))
+    results = aggregator.aggregate_groups(len(items))
+    return [
+        (count, result[0], result[1], chunk_missing)
+        for count, result, chunk_missing in zip(rows, results, missing)
+    ]
+
+
+class ChunkedAggregator:
+    """
+    Agregasi file csv per chunk baris.
+    Batas chunk ditentukan isi baris (content-defined), chunk ditutup setelah baris yang crc32-nya
+    cocok dengan CHUNK_MASK sehingga perubahan 1 baris hanya mengubah fingerprint chunk baris tersebut.
+    Chunk yang fingerprint-nya ada di chunk file sebelumnya tidak di parsing, total chunk sebelumnya dipakai ulang.
+    Chunk baru di parsing per batch PARSE_BATCH_BYTES, jika executor diisi batch di parsing paralel.
+    Hasil chunk tetap digabung dan callback baris kosong tetap dipanggil berurutan sehingga hasilnya
+    sama dengan parsing serial
+    """
+
+    def __init__(
+        self,
+        previous=None,
+        header=None,
+        start=0,
+        size=0,
+        on_missing=None,
+        executor=None,
+        backend="python",
+    ):
+        # previous > {"header": ..., "chunks": [...]} hasil pemrosesan file sebelumnya
+        previous = previous or {}
+        self.header = header
+        self.previous_header = previous.get("header")
+        self.previous = {chunk["hash"]: chunk for chunk in previous.get("chunks", [])}
+        self.on_missing = on_missing
+
+        # chunk > {"hash", "rows", "category": {month: {category: total}}, "monthly": {month: {date: total}}}
+        self.chunks = []
+        self.reused = 0
+        self.parsed = 0
+        # waktu hash file (wall dan cpu) di dalam scan_lines, untuk statistik tahap hash
+        self.hash_time = 0.0
+        self.hash_cpu_time = 0.0
+
+        self.start = start
+        self.row = start
+        # jumlah byte yang sudah dibaca
+        self.size = size
+        self.lines = []
+        self.quotes = 0
+
+        self.executor = executor
+        # engine agregasi per chunk, lihat get_aggregator
+        self.backend = backend
+        # error saat parsing paralel, sisa chunk di parsing serial
+        self.executor_error = None
+        # chunk yang belum selesai berurutan > {"hash", "data", "result", "future", "index"}
+        self.queue = deque()
+        # chunk baru yang belum dikirim ke executor
+        self.batch = []
+        self.batch_bytes = 0
+        # future batch yang sudah dikirim berurutan, dibatasi agar memori tidak bertambah sesuai ukuran file
+        self.in_flight = deque()
+        self.max_in_flight = (
+            IN_FLIGHT_PER_WORKER * executor_workers(executor) if executor else 0
+        )
+
+    def feed(self, lines, size, quoted=True):
+        # lines > baris lengkap tanpa newline dari 1 blok file berukuran size byte
+        # quoted False > tidak ada tanda kutip di blok ini, jumlah kutip per baris tidak perlu dihitung
+        self.size += size
+        if self.header is None:
+            if not lines:
+                return
+            self.header = lines[0].decode("utf-8") + "\n"
+            lines = lines[1:]
+
+        if not quoted and not self.quotes % 2:
+            self.feed_unquoted(lines)
+            return
+
+        pending = self.lines
+        count = len(pending)
+        crc32 = zlib.crc32
+        for line in lines:
+            pending.append(line)
+            count += 1
+            if quoted:
+                self.quotes += line.count(b'"')
+            # chunk tidak ditutup di tengah field yang berisi newline (jumlah tanda kutip ganjil)
+            if (
+                count >= CHUNK_MIN_ROWS
+                and (not crc32(line) & CHUNK_MASK or count >= CHUNK_MAX_ROWS)
+                and not self.quotes % 2
+            ):
+                self.close_chunk()
+                pending, count = self.lines, 0
+
+    def feed_unquoted(self, lines):
+        # blok tanpa tanda kutip > batas chunk sama dengan loop per baris di feed, tapi baris kandidat
+        # (crc32 & CHUNK_MASK == 0) dicari dengan iterator C dan chunk diambil per slice
+        candidates = itertools.compress(
+            itertools.count(),
+            map(
+                operator.not_,
+                map(
+                    operator.and_,
+                    map(zlib.crc32, lines),
+                    itertools.repeat(CHUNK_MASK),
+                ),
+            ),
+        )
+        start = 0
+        for i in itertools.chain(candidates, [None]):
+            stop = len(lines) if i is None else i + 1
+            # chunk dipotong di CHUNK_MAX_ROWS baris sebelum baris kandidat berikutnya
+            while len(self.lines) + stop - start >= CHUNK_MAX_ROWS:
+                cut = start + CHUNK_MAX_ROWS - len(self.lines)
+                self.lines.extend(lines[start:cut])
+                self.close_chunk()
+                start = cut
+            if i is not None and len(self.lines) + stop - start >= CHUNK_MIN_ROWS:
+                self.lines.extend(lines[start:stop])
+                self.close_chunk()
+                start = stop
+        self.lines.extend(lines[start:])
+
+    def close_chunk(self, newline=True):
+        # newline False > baris terakhir file tidak diakhiri newline
+        data = b"\n".join(self.lines) + (b"\n" if newline else b"")
+        self.lines, self.quotes = [], 0
+
+        fingerprint = hashlib.blake2b(data, digest_size=16).hexdigest()
+        chunk = None
+        if self.header == self.previous_header:
+            chunk = self.previous.get(fingerprint)
+
+        if chunk is not None:
+            self.reused += 1
+            self.queue.append({"chunk": chunk})
+        else:
+            self.parsed += 1
+            entry = {"hash": fingerprint, "data": data}
+            self.queue.append(entry)
+            if self.executor is None and get_aggregator(self.backend) is CsvAggregator:
+                # serial dengan engine python > chunk langsung di parsing tanpa batch
+                (entry["result"],) = parse_chunks(self.header, [data], self.backend)
+                self.drain_queue()
+                return
+            # chunk baru di parsing per batch (di proses worker atau serial) agar engine numpy
+            # meng-agregasi semua baris batch sekaligus
+            self.batch.append(entry)
+            self.batch_bytes += len(data)
+            if self.batch_bytes >= PARSE_BATCH_BYTES:
+                self.submit_batch()
+
+        self.drain_queue()
+
+    def submit_batch(self):
+        batch, self.batch, self.batch_bytes = self.batch, [], 0
+        if not batch:
+            return
+        if self.executor is not None:
+            try:
+                future = self.executor.submit(
+                    parse_chunks,
+                    self.header,
+                    [entry["data"] for entry in batch],
+                    self.backend,
+                )
+            except Exception as e:
+                # misal worker celery (prefork) tidak boleh membuat proses anak
+                self.fallback(e)
+            else:
+                for i, entry in enumerate(batch):
+                    entry["future"], entry["index"] = future, i
+                self.in_flight.append(future)
+                # batch terlama ditunggu dan digabung sebelum batch berikutnya dikirim
+                while len(self.in_flight) > self.max_in_flight:
+                    self.drain_queue(until=self.in_flight.popleft())
+                return
+        results = parse_chunks(
+            self.header, [entry["data"] for entry in batch], self.backend
+        )
+        for entry, result in zip(batch, results):
+            entry["result"] = result
+
+    def fallback(self, e):
+        self.executor, self.executor_error = None, e
+
+    def drain_queue(self, wait=False, until=None):
+        # chunk digabung berurutan, berhenti di chunk yang hasil parsing-nya belum selesai
+        # wait True > tunggu semua batch yang sudah dikirim, until > tunggu sampai batch future until
+        while self.queue:
+            entry = self.queue[0]
+            if "chunk" not in entry and "result" not in entry:
+                future = entry.get("future")
+                # chunk masih di batch yang belum dikirim atau belum selesai di parsing
+                if future is None or (
+                    not wait and future is not until and not future.done()
+                ):
+                    return
+                try:
+                    entry["result"] = future.result()[entry["index"]]
+                except Exception as e:
+                    self.fallback(e)
+                    (entry["result"],) = parse_chunks(
+                        self.header, [entry["data"]], self.backend
+                    )
+            self.queue.popleft()
+            self.add_chunk(entry)
+
+    def add_chunk(self, entry):
+        chunk = entry.get("chunk")
+        if chunk is None:
+            rows, category, monthly, missing = entry["result"]
+            chunk = {
+                "hash": entry["hash"],
+                "rows": rows,
+                "category": category,
+                "monthly": monthly,
+            }
+            if missing:
+                # baris ditolak disimpan di chunk agar tetap dilaporkan saat chunk dipakai ulang
+                chunk["missing"] = [list(item) for item in missing]
+        replay_missing([chunk], self.on_missing, self.row)
+        self.row += chunk["rows"]
+        self.chunks.append(chunk)
+
+    def finish(self, rest=b""):
+        # rest > sisa file setelah newline terakhir
+        if rest:
+            self.size += len(rest)
+            if self.header is None:
+                self.header = rest.decode("utf-8")
+            else:
+                self.lines.append(rest)
+        if self.lines:
+            self.close_chunk(newline=not rest)
+        self.submit_batch()
+        self.drain_queue(wait=True)
+
+        # total semua chunk, format sama dengan CsvAggregator
+        self.grouped_data_category, self.grouped_monthly_data = {}, {}
+        for chunk in self.chunks:
+            for merged, grouped in (
+                (self.grouped_data_category, chunk["category"]),
+                (self.grouped_monthly_data, chunk["monthly"]),
+            ):
+                for month, items in grouped.items():
+                    merged_items = merged.setdefault(month, {})
+                    for key, total in items.items():
+                        merged_items[key] = merged_items.get(key, 0) + total
+
+        self.rows = self.row - self.start
+        # posisi byte setelah baris lengkap terakhir, None jika file tidak diakhiri newline
+        # (baris terakhir mungkin belum selesai ditulis)
+        self.offset = None if rest or self.header is None else self.size
+        return self
+
+    def state(self):
+        # disimpan di FileChunkState
+        return {"header": self.header, "chunks": self.chunks}
+
+
+def replay_missing(chunks, on_missing, start=0):
+    # panggil on_missing untuk baris ditolak yang tersimpan di chunk, nomor baris dihitung dari start
+    if not on_missing:
+        return
+    row = start
+    for chunk in chunks:
+        for i, missing_fields, data in chunk.get("missing", ()):
+            on_missing(row + i, missing_fields, data)
+        row += chunk["rows"]
+
+
+def scan_lines(raw, hasher, aggregator):
+    # file dibaca per BUFFER_SIZE, byte yang sama masuk ke hasher lalu dipecah per baris
+    rest = b""
+    for block in iter(lambda: raw.read(BUFFER_SIZE), b""):
+        wall, cpu = time.perf_counter(), time.process_time()
+        hasher.update(block)
+        aggregator.hash_time += time.perf_counter() - wall
+        aggregator.hash_cpu_time += time.process_time() - cpu
+        data = rest + block
+        lines = data.split(b"\n")
+        rest = lines.pop()
+        aggregator.feed(lines, len(data) - len(rest), quoted=b'"' in data)
+    return aggregator.finish(rest)
+
+
+def ingest_file(
+    path, hasher, previous=None, on_missing=None, executor=None, backend="python"
+):
+    """
+    Hash dan agregasi file csv dalam 1 kali baca.
+    previous > chunk hasil pemrosesan file sebelumnya, hanya chunk yang berubah yang di parsing
+    executor > ProcessPoolExecutor untuk parsing chunk paralel
+    backend > engine agregasi (python / numpy)
+    """
+    with open(path, "rb", buffering=0) as raw:
+        return scan_lines(
+            raw,
+            hasher,
+            ChunkedAggregator(
+                previous=previous,
+                on_missing=on_missing,
+                executor=executor,
+                backend=backend,
+            ),
+        )
+
+
+def ingest_tail(
+    path,
+    hasher,
+    offset,
+    prefix_hash,
+    start=0,
+    previous=None,
+    on_missing=None,
+    executor=None,
+    backend="python",
+):
+    """
+    Agregasi hanya bagian file setelah offset (baris baru di file yang terus bertambah).
+    Prefix file sampai offset di hash dulu, jika hash tidak sama dengan prefix_hash dikembalikan None
+    dan file harus diproses dari awal. Hasher berisi hash seluruh file setelah selesai.
+    previous > chunk prefix file, baris ditolak di prefix dipanggil ulang ke on_missing
+    """
+    with open(path, "rb", buffering=0) as raw:
+        head, remaining = b"", offset
+        wall, cpu = time.perf_counter(), time.process_time()
+        while remaining:
+            chunk = raw.read(min(BUFFER_SIZE, remaining))
+            if not chunk:
+                return None
+            # simpan awal file sampai baris header lengkap
+            if b"\n" not in head:
+                head += chunk
+            hasher.update(chunk)
+            remaining -= len(chunk)
+
+        if hasher.hexdigest() != prefix_hash:
+            return None
+        replay_missing(previous or (), on_missing)
+
+        # header diambil dari baris pertama prefix agar index kolom tetap sama
+        header = head.split(b"\n", 1)[0] + b"\n"
+        aggregator = ChunkedAggregator(
+            header=header.decode("utf-8"),
+            start=start,
+            size=offset,
+            on_missing=on_missing,
+            executor=executor,
+            backend=backend,
+        )
+        # waktu baca dan hash prefix ikut dihitung sebagai waktu hash
+        aggregator.hash_time = time.perf_counter() - wall
+        aggregator.hash_cpu_time = time.process_time() - cpu
+        return scan_lines(raw, hasher, aggregator)
+
+
+def aggregate_file(path, algorithm="sha256", backend="python"):
+    """
+    Hash dan agregasi satu file csv, dipakai sebagai fungsi worker ProcessPoolExecutor (harus bisa di pickle).
+    Baris dengan field kosong dikembalikan di missing agar dicatat di ValidationReport proses utama
+    """
+    missing = []
+    hasher = new_hasher(algorithm)
+    aggregator = ingest_file(
+        path,
+        hasher,
+        on_missing=lambda i, fields, row: missing.append((i, fields, row)),
+        backend=backend,
+    )
+    # callback tidak bisa di pickle
+    aggregator.on_missing = None
+    return hasher.hexdigest(), aggregator, missing
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class FinlogicConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "finlogic"
+
+    def ready(self):
+        # daftarkan signal celery untuk metric antrian email
+        from finlogic import metrics  # noqa: F401
@@ -0,0 +1,233 @@
+from django.db import transaction
+from .aggregators import AGGREGATORS, aggregate_file, get_aggregator
+from .fake_sheets import FakeSheetsClient, FakeSpreadsheet
+from .file_processors import HEADERS, ProcessFile
+from .file_readers import file_number
+from .hashing import file_digest
+from .models import FileIntegrity, WorksheetMirror
+from pathlib import Path
+import calendar
+import random
+import time
+import tracemalloc
+
+# urutan benchmark di hasil dan pilihan --benchmark bench_pipeline
+BENCHMARKS = (
+    "hash",
+    "group_file_data",
+    "ingest_python",
+    "ingest_numpy",
+    "category_lookup",
+    "category_plan",
+    "monthly_lookup",
+    "monthly_plan",
+    "end_to_end",
+)
+
+
+def unused_file_name():
+    # data_N.csv dengan N setelah nomor file terbesar di database
+    numbers = [
+        file_number(name)
+        for name in FileIntegrity.objects.values_list("filename", flat=True)
+    ]
+    return f"data_{max(numbers, default=0) + 1}.csv"
+
+
+def generate_csv(
+    path, size_mb=1, months=12, categories=10, seed=0, start_month="2025-01"
+):
+    """
+    Membuat file csv data pengeluaran acak berukuran kurang lebih size_mb.
+    Tanggal tersebar di months bulan mulai start_month dengan categories kategori berbeda,
+    seed yang sama menghasilkan file yang sama persis
+    """
+    rng = random.Random(seed)
+    names = [f"Kategori {i + 1}" for i in range(categories)]
+    subcategories = {name: [f"{name} {j + 1}" for j in range(3)] for name in names}
+
+    year, month = map(int, start_month.split("-"))
+    dates = []
+    for _ in range(months):
+        days = calendar.monthrange(year, month)[1]
+        dates.extend(f"{year}-{month:02d}-{day:02d}" for day in range(1, days + 1))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    target = int(size_mb * 1024 * 1024)
+    header = "date,category,subcategory,price\n".encode()
+    rows, size = 0, len(header)
+    with open(path, "wb") as f:
+        f.write(header)
+        while size < target:
+            # ditulis per 1000 baris agar tidak 1 write per baris
+            lines = []
+            for _ in range(1000):
+                category = rng.choice(names)
+                lines.append(
+                    f"{rng.choice(dates)},{category},{rng.choice(subcategories[category])},"
+                    f"{rng.randrange(1000, 500000, 500)}\n"
+                )
+            block = "".join(lines).encode()
+            f.write(block)
+            rows += len(lines)
+            size += len(block)
+    return {"rows": rows, "bytes": size}
+
+
+def measure(func, repeat=3):
+    # waktu terbaik dari beberapa kali percobaan, peak memory diukur di 1 percobaan terpisah
+    # karena tracemalloc memperlambat eksekusi
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+
+class PipelineBenchmark:
+    """
+    Benchmark tiap tahap pemrosesan file csv dengan worksheet palsu di memori.
+    Worksheet sudah berisi semua group file dengan total lama sehingga diff planning
+    menghasilkan update untuk setiap baris
+    """
+
+    def __init__(self, path, rows=None, latency=0):
+        self.path = Path(path)
+        # latency per request google sheets palsu (detik)
+        self.latency = latency
+        self.bytes = self.path.stat().st_size
+        # None > worksheet kosong (hanya header) untuk grouping awal
+        self.sheets = None
+        # nama file di database yang belum dipakai file asli, end_to_end membuat FileIntegrity dengan nama ini
+        self.file_name = unused_file_name()
+
+        obj = self.process_file()
+        obj.group_file_data()
+        self.rows = rows if rows is not None else obj.aggregator.rows
+        obj.latest_category_expense_data = obj.category_expense_totals()
+        obj.latest_monthly_expense_data = obj.monthly_expense_totals()
+        self.obj = obj
+
+        self.sheets = {
+            "Category Expense": [HEADERS["Category Expense"]]
+            + [
+                [*key.split("|", 1), str(total // 2)]
+                for key, total in obj.latest_category_expense_data.items()
+            ],
+            "Monthly Expense": [HEADERS["Monthly Expense"]]
+            + [
+                [month, str(item["total_new"] // 2), "0", "1"]
+                for month, item in obj.latest_monthly_expense_data.items()
+            ],
+        }
+        # {row_index: row} seperti hasil get_sheets_rows
+        self.sheet_rows = {
+            name: dict(enumerate(values[1:], start=2))
+            for name, values in self.sheets.items()
+        }
+
+    def process_file(self):
+        file = {"is_new_file": True, "file_name": self.file_name, "file": self.path}
+        # spreadsheet terakhir disimpan untuk statistik request API
+        self.spreadsheet = FakeSpreadsheet(self.sheets, latency=self.latency)
+        return ProcessFile(file, client=FakeSheetsClient(self.spreadsheet))
+
+    def hash(self):
+        file_digest(self.path)
+
+    def group_file_data(self):
+        self.process_file().group_file_data()
+
+    def ingest_python(self):
+        aggregate_file(self.path, backend="python")
+
+    def ingest_numpy(self):
+        aggregate_file(self.path, backend="numpy")
+
+    def available(self, name):
+        # ingest_numpy dilewati jika numpy tidak terinstall (engine jatuh ke python)
+        backend = name.removeprefix("ingest_")
+        return backend == name or get_aggregator(backend) is AGGREGATORS[backend]
+
+    def category_lookup(self):
+        self.obj.category_lookup(self.sheet_rows["Category Expense"])
+
+    def category_plan(self):
+        self.obj.plan_category_expense(self.sheet_rows["Category Expense"])
+
+    def monthly_lookup(self):
+        self.obj.monthly_lookup(self.sheet_rows["Monthly Expense"])
+
+    def monthly_plan(self):
+        self.obj.plan_monthly_expense(self.sheet_rows["Monthly Expense"])
+
+    def end_to_end(self):
+        # tahap yang sama dengan check_and_process_file_task tanpa kirim email,
+        # perubahan database di rollback agar setiap percobaan mulai dari kondisi yang sama
+        with transaction.atomic():
+            # mirror worksheet asli tidak dibaca (dihapus di dalam transaksi yang di rollback),
+            # setiap percobaan mulai dari mirror kosong seperti worksheet palsu
+            WorksheetMirror.objects.all().delete()
+            obj = self.process_file()
+            if obj.check_changes_data_file():
+                obj.group_file_data()
+                obj.process_sheets()
+                obj.change_data_model()
+            transaction.set_rollback(True)
+
+    def size(self, name):
+        # (rows, bytes) yang diproses 1 kali benchmark, bytes 0 > MB/s tidak dihitung
+        if name.startswith("category"):
+            return len(self.sheet_rows["Category Expense"]), 0
+        if name.startswith("monthly"):
+            return len(self.sheet_rows["Monthly Expense"]), 0
+        return self.rows, self.bytes
+
+    def run(self, names=BENCHMARKS, repeat=3):
+        results = {}
+        for name in names:
+            if not self.available(name):
+                continue
+            seconds, peak = measure(getattr(self, name), repeat)
+            rows, size = self.size(name)
+            results[name] = {
+                "seconds": seconds,
+                "rows": rows,
+                "bytes": size,
+                "rows_per_sec": rows / seconds if seconds else None,
+                "mb_per_sec": (
+                    size / (1024 * 1024) / seconds if size and seconds else None
+                ),
+                "peak_memory_bytes": peak,
+            }
+            if name == "end_to_end":
+                # request dan byte google sheets dalam 1 kali pemrosesan
+                results[name]["api"] = self.spreadsheet.stats()
+        return results
+
+
+def backend_speedup(results):
+    # waktu ingest engine python dibagi engine numpy, > 1 berarti numpy lebih cepat
+    python, numpy = results.get("ingest_python"), results.get("ingest_numpy")
+    if not python or not numpy or not numpy["seconds"]:
+        return None
+    return python["seconds"] / numpy["seconds"]
+
+
+def compare_results(results, baseline):
+    # perubahan waktu tiap benchmark terhadap hasil sebelumnya, positif > lebih lambat
+    changes = {}
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous["seconds"]:
+            continue
+        changes[name] = (result["seconds"] - previous["seconds"]) / previous["seconds"]
+    return changes
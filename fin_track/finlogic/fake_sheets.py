@@ -0,0 +1,298 @@
+from collections import Counter, deque
+import gspread
+import time
+
+from .file_processors import HEADERS, SheetsClient
+from .run_stats import payload_size
+
+
+def parse_range(label):
+    # "'Category Expense'!A2:B" > ("Category Expense", "A2:B")
+    name, _, cells = label.rpartition("!")
+    if name.startswith("'") and name.endswith("'"):
+        name = name[1:-1].replace("''", "'")
+    return name, cells
+
+
+class FakeResponse:
+    # response requests minimal untuk gspread.exceptions.APIError
+
+    def __init__(self, status_code, message):
+        self.status_code = status_code
+        self.text = message
+        self.error = {
+            "code": status_code,
+            "message": message,
+            "status": "RESOURCE_EXHAUSTED" if status_code == 429 else "INTERNAL",
+        }
+
+    def json(self):
+        return {"error": self.error}
+
+
+def api_error(status_code, message=None):
+    if message is None:
+        message = (
+            "Quota exceeded for quota metric 'Requests' per minute"
+            if status_code == 429
+            else "Internal error encountered."
+        )
+    return gspread.exceptions.APIError(FakeResponse(status_code, message))
+
+
+class FakeWorksheet:
+    """
+    Worksheet google sheets di memori, isi sel disimpan sebagai list baris berisi string
+    seperti hasil get_all_values. Pemanggilan API dicatat di spreadsheet
+    """
+
+    def __init__(self, spreadsheet, title, values=None, row_count=1000):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.values = [[str(value) for value in row] for row in values or []]
+        self.row_count = max(row_count, len(self.values))
+
+    def get_all_values(self, *args, **kwargs):
+        # salinan baru setiap baca, sama seperti google sheets
+        def get():
+            rows = self.get_range("A1:ZZZ")
+            width = max((len(row) for row in rows), default=0)
+            return [row + [""] * (width - len(row)) for row in rows]
+
+        return self.spreadsheet.request("get_all_values", None, get)
+
+    def batch_update(self, data, raw=True, value_input_option=None, **kwargs):
+        # data > [{"range": "C5", "values": [[...]]}]
+        data = list(data)
+        return self.spreadsheet.request(
+            "batch_update",
+            data,
+            lambda: self.update_ranges(data),
+            partial=lambda: self.update_ranges(data, len(data) // 2),
+        )
+
+    def append_rows(self, values, value_input_option=None, **kwargs):
+        def append():
+            # baris baru ditulis setelah baris terakhir yang berisi data
+            last = len(self.values)
+            while last and not any(self.values[last - 1]):
+                last -= 1
+            end = last + len(values)
+            if end > self.row_count:
+                self.row_count = end
+            self.set_range(f"A{last + 1}", values)
+            return {
+                "updates": {"updatedRange": f"A{last + 1}", "updatedRows": len(values)}
+            }
+
+        return self.spreadsheet.request("append_rows", values, append)
+
+    def add_rows(self, rows):
+        def add():
+            self.row_count += rows
+            return {}
+
+        return self.spreadsheet.request("add_rows", {"rows": rows}, add)
+
+    def update_ranges(self, data, limit=None):
+        # limit > hanya sebagian range yang ditulis (simulasi kegagalan sebagian)
+        for item in data[:limit]:
+            self.set_range(item["range"], item["values"])
+        return {
+            "totalUpdatedCells": sum(
+                len(row) for item in data for row in item["values"]
+            )
+        }
+
+    def get_range(self, cells):
+        grid = gspread.utils.a1_range_to_grid_range(cells)
+        start = grid.get("startRowIndex", 0)
+        end = grid.get("endRowIndex", len(self.values))
+        col_start = grid.get("startColumnIndex", 0)
+        col_end = grid.get("endColumnIndex")
+        rows = [list(row[col_start:col_end]) for row in self.values[start:end]]
+        # google sheets tidak mengirim kolom dan baris kosong di akhir range
+        for row in rows:
+            while row and row[-1] == "":
+                row.pop()
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    def set_range(self, cells, values):
+        row_index, col = gspread.utils.a1_to_rowcol(cells.split(":")[0])
+        if row_index - 1 + len(values) > self.row_count:
+            raise api_error(
+                400,
+                f"Range ('{self.title}'!{cells}) exceeds grid limits. Max rows: {self.row_count}",
+            )
+        for i, row_values in enumerate(values):
+            index = row_index - 1 + i
+            self.values.extend([] for _ in range(index + 1 - len(self.values)))
+            row = self.values[index]
+            for offset, value in enumerate(row_values):
+                j = col - 1 + offset
+                row.extend([""] * (j + 1 - len(row)))
+                row[j] = str(value)
+
+
+class FakeSpreadsheet:
+    """
+    Spreadsheet google sheets di memori untuk benchmark dan test tanpa jaringan.
+    Mendukung pemanggilan gspread yang dipakai ProcessFile (worksheet, get_all_values, batch_update,
+    append_rows, values_batch_get, values_batch_update). Jumlah request dan byte dicatat per method,
+    latency, error quota 429 dan kegagalan sebagian bisa disimulasikan
+    """
+
+    def __init__(self, sheets=None, latency=0, quota_per_minute=None):
+        # sheets > {name: values}, default worksheet kosong dengan header saja
+        if sheets is None:
+            sheets = {name: [header] for name, header in HEADERS.items()}
+        self.worksheets = {
+            name: FakeWorksheet(self, name, values) for name, values in sheets.items()
+        }
+        # latency > detik per request atau {method: detik}
+        self.latency = latency
+        # jumlah request maksimal per 60 detik, request berikutnya mendapat error 429
+        self.quota_per_minute = quota_per_minute
+        self.request_times = deque()
+        # error yang akan terjadi > [{"method", "status", "times", "partial"}]
+        self.failures = []
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.calls = Counter()
+        self.errors = Counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def stats(self):
+        return {
+            "calls": dict(self.calls),
+            "errors": dict(self.errors),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+        }
+
+    def fail(self, method=None, status=429, times=1, partial=False):
+        """
+        Request berikutnya ke method (None > semua method) gagal dengan error status sebanyak times.
+        partial True > setengah range pertama tetap ditulis sebelum error (hanya untuk batch_update
+        dan values_batch_update)
+        """
+        self.failures.append(
+            {"method": method, "status": status, "times": times, "partial": partial}
+        )
+
+    def pop_failure(self, method):
+        for failure in self.failures:
+            if failure["method"] in (None, method):
+                failure["times"] -= 1
+                if not failure["times"]:
+                    self.failures.remove(failure)
+                return failure
+        return None
+
+    def check_quota(self):
+        if self.quota_per_minute is None:
+            return False
+        now = time.monotonic()
+        while self.request_times and now - self.request_times[0] >= 60:
+            self.request_times.popleft()
+        if len(self.request_times) >= self.quota_per_minute:
+            return True
+        self.request_times.append(now)
+        return False
+
+    def request(self, method, payload, func, partial=None):
+        # func() > response, partial() > tulis sebagian data saat kegagalan sebagian
+        self.calls[method] += 1
+        self.bytes_sent += payload_size(payload)
+
+        latency = self.latency
+        if isinstance(latency, dict):
+            latency = latency.get(method, 0)
+        if latency:
+            time.sleep(latency)
+
+        failure = self.pop_failure(method)
+        if failure is None and self.check_quota():
+            failure = {"status": 429, "partial": False}
+        if failure is not None:
+            self.errors[failure["status"]] += 1
+            if failure["partial"] and partial is not None:
+                partial()
+            raise api_error(failure["status"])
+
+        response = func()
+        self.bytes_received += payload_size(response)
+        return response
+
+    def worksheet(self, name):
+        def get():
+            try:
+                return self.worksheets[name]
+            except KeyError:
+                raise gspread.exceptions.WorksheetNotFound(name)
+
+        return self.request("worksheet", None, get)
+
+    def values_batch_get(self, ranges, params=None):
+        def get():
+            value_ranges = []
+            for label in ranges:
+                name, cells = parse_range(label)
+                rows = self.worksheets[name].get_range(cells)
+                value_ranges.append(
+                    {"range": label, "values": rows} if rows else {"range": label}
+                )
+            return {"valueRanges": value_ranges}
+
+        return self.request("values_batch_get", list(ranges), get)
+
+    def values_batch_update(self, body):
+        data = body["data"]
+
+        def update(limit=None):
+            # limit > hanya sebagian range yang ditulis (simulasi kegagalan sebagian)
+            for item in data[:limit]:
+                name, cells = parse_range(item["range"])
+                self.worksheets[name].set_range(cells, item["values"])
+            return {
+                "totalUpdatedCells": sum(
+                    len(row) for item in data for row in item["values"]
+                )
+            }
+
+        return self.request(
+            "values_batch_update",
+            body,
+            update,
+            partial=lambda: update(len(data) // 2),
+        )
+
+
+class FakeSheetsClient(SheetsClient):
+    # pengganti SheetsClient, ProcessFile(file, client=FakeSheetsClient(...))
+    # cache worksheet dan penghitungan request sama dengan SheetsClient, hanya spreadsheet yang palsu
+
+    def __init__(self, spreadsheet=None):
+        super().__init__()
+        self.sh = spreadsheet or FakeSpreadsheet()
+
+    def build(self):
+        # tidak ada kredensial, spreadsheet yang sama dipakai lagi
+        pass
+
+    def get_spreadsheet(self):
+        return self.sh
+
+
+class FakeGspreadClient:
+    # pengganti hasil gspread.authorize, dipakai dengan patch agar sheets_client memakai spreadsheet palsu
+
+    def __init__(self, spreadsheet=None):
+        self.sh = spreadsheet or FakeSpreadsheet()
+
+    def open_by_key(self, key):
+        return self.sh
@@ -1,51 +1,254 @@
 from django.conf import settings
-import csv
-import hashlib
 from datetime import datetime
 import gspread
 from google.oauth2.service_account import Credentials
-from .utils import send_mail_task
-from .models import FileIntegrity
+from google.auth.exceptions import RefreshError
+from .notifications import notify
+from .models import FileIntegrity, WorksheetMirror
+from .aggregators import (
+    AGGREGATORS,
+    aggregate_file,
+    get_aggregator,
+    ingest_file,
+    ingest_tail,
+)
+from .hashing import file_digest, new_hasher
+from . import planners
+from .run_stats import RunStats
+from .validation import ValidationReport, parse_header
 from pathlib import Path
 from django.utils.timezone import now
+from django.db import transaction
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from contextlib import nullcontext
+from concurrent.futures.process import BrokenProcessPool
 import logging
+import multiprocessing
+import os
+import threading
 
 logger = logging.getLogger("fintrack")
 
+# header tiap worksheet dan jumlah kolom key di awal header
+HEADERS = {
+    "Category Expense": ["month", "category", "total_expense"],
+    "Monthly Expense": ["month", "total_expense", "avg_per_day", "days_count"],
+}
+KEY_COLUMNS = {"Category Expense": 2, "Monthly Expense": 1}
+# jarak minimal mtime file dengan waktu pengecekan agar stat file bisa dipercaya
+STAT_RACY_NS = 2 * 10**9
+
+
+def column_letter(col):
+    # 3 > "C"
+    return gspread.utils.rowcol_to_a1(1, col)[:-1]
+
+
+def header_range(name):
+    # "A1:C1"
+    return f"A1:{column_letter(len(HEADERS[name]))}1"
+
+
+def key_range(name):
+    # kolom key mulai baris ke-2 sampai akhir, "A2:B"
+    return f"A2:{column_letter(KEY_COLUMNS[name])}"
 
-class ProcessFile:
-    def __init__(self, file):
-        self.scopes = ["https://www.googleapis.com/auth/spreadsheets"]
 
+def value_range(name, start, end):
+    # kolom value baris start sampai end, "C5:C7"
+    return f"{column_letter(KEY_COLUMNS[name] + 1)}{start}:{column_letter(len(HEADERS[name]))}{end}"
+
+
+def row_range(name, start, end):
+    # semua kolom baris start sampai end, "A5:C7"
+    return f"A{start}:{column_letter(len(HEADERS[name]))}{end}"
+
+
+def full_range(name):
+    # seluruh isi worksheet termasuk header, "A1:C"
+    return f"A1:{column_letter(len(HEADERS[name]))}"
+
+
+def contiguous_ranges(indexes):
+    # [2, 3, 4, 7] > [(2, 4), (7, 7)]
+    ranges = []
+    for i in sorted(indexes):
+        if ranges and ranges[-1][1] == i - 1:
+            ranges[-1][1] = i
+        else:
+            ranges.append([i, i])
+    return [tuple(item) for item in ranges]
+
+
+class SheetsClient:
+    """
+    Registry client Google Sheets per worker.
+    Kredensial, client gspread, spreadsheet dan worksheet dibuat sekali lalu dipakai ulang di setiap task.
+    Request yang gagal karena token / kredensial tidak berlaku lagi membuat ulang client sekali lalu diulang
+    """
+
+    scopes = ["https://www.googleapis.com/auth/spreadsheets"]
+
+    def __init__(self):
+        # RLock > worksheet() mengisi cache sambil memanggil get_spreadsheet() di lock yang sama
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        self.key = None
+        self.creds = None
+        self.gc = None
+        self.sh = None
+        self.worksheets = {}
+
+    def build(self):
         try:
-            self.creds = Credentials.from_service_account_file(
+            creds = Credentials.from_service_account_file(
                 settings.PATH_CREDENTIALS, scopes=self.scopes
             )
         except FileNotFoundError:
             logger.error(
-                f"File credentials tidak ditemukan di path: {settings.PATH_CREDENTIALS}"
+                "File credentials tidak ditemukan di path: %s",
+                settings.PATH_CREDENTIALS,
             )
             raise
         except Exception as e:
-            logger.exception(f"Kredensial tidak valid: {e}")
+            logger.exception("Kredensial tidak valid: %s", e)
             raise
 
+        # token di refresh otomatis oleh session gspread saat request pertama atau saat token expired
         try:
-            self.gc = gspread.authorize(self.creds)
+            gc = gspread.authorize(creds)
         except Exception as e:
-            logger.exception(f"Gagal menghubungkan ke Google Sheets API: {e}")
+            logger.exception("Gagal menghubungkan ke Google Sheets API: %s", e)
             raise
 
         try:
-            self.sh = self.gc.open_by_key(settings.ID_FILE_GOOGLE_SHEETS)
+            sh = gc.open_by_key(settings.ID_FILE_GOOGLE_SHEETS)
         except gspread.exceptions.SpreadsheetNotFound as e:
             logger.error(
-                f"Tidak dapat menemukan spreadsheet dengan ID: {settings.ID_FILE_GOOGLE_SHEETS}"
+                "Tidak dapat menemukan spreadsheet dengan ID: %s",
+                settings.ID_FILE_GOOGLE_SHEETS,
             )
             raise
 
+        self.clear()
+        self.key = (settings.PATH_CREDENTIALS, settings.ID_FILE_GOOGLE_SHEETS)
+        self.creds, self.gc, self.sh = creds, gc, sh
+
+    def get_spreadsheet(self):
+        with self._lock:
+            # build ulang jika belum ada atau settings credentials / id spreadsheet berubah
+            if self.sh is None or self.key != (
+                settings.PATH_CREDENTIALS,
+                settings.ID_FILE_GOOGLE_SHEETS,
+            ):
+                self.build()
+            return self.sh
+
+    def call(self, method, *args, stats=None, payload=None, **kwargs):
+        # panggil method spreadsheet, jika autentikasi gagal client dibuat ulang sekali lalu coba lagi.
+        # stats > setiap percobaan (termasuk yang gagal dan yang diulang) dihitung di api_calls
+        sh = self.get_spreadsheet()
+        try:
+            return counted_request(
+                stats, getattr(sh, method), *args, payload=payload, **kwargs
+            )
+        except (RefreshError, gspread.exceptions.APIError) as e:
+            if not is_auth_error(e):
+                raise
+            logger.warning(
+                "Autentikasi Google Sheets gagal, membuat ulang client: %s", e
+            )
+            with self._lock:
+                # client mungkin sudah dibuat ulang oleh task lain di thread lain
+                if self.sh is sh:
+                    self.build()
+                sh = self.sh
+            return counted_request(
+                stats, getattr(sh, method), *args, payload=payload, **kwargs
+            )
+
+    def worksheet(self, name, refresh=False, stats=None):
+        # refresh True > metadata worksheet (misal row_count) diambil ulang dari google sheets
+        with self._lock:
+            if refresh or name not in self.worksheets:
+                self.worksheets[name] = self.call("worksheet", name, stats=stats)
+            return self.worksheets[name]
+
+    def values_batch_get(self, ranges, stats=None):
+        return self.call("values_batch_get", ranges, stats=stats, payload=ranges)
+
+    def values_batch_update(self, body, stats=None):
+        return self.call("values_batch_update", body, stats=stats, payload=body)
+
+
+def counted_request(stats, func, *args, payload=None, **kwargs):
+    # 1 request ke google sheets, request yang gagal tetap dihitung di api_calls dan api_errors
+    if stats is None:
+        return func(*args, **kwargs)
+    try:
+        response = func(*args, **kwargs)
+    except (RefreshError, gspread.exceptions.APIError):
+        stats.count("api_errors")
+        stats.count_request(payload)
+        raise
+    stats.count_request(payload, response)
+    return response
+
+
+def is_auth_error(e):
+    if isinstance(e, RefreshError):
+        return True
+    return getattr(e.response, "status_code", None) == 401
+
+
+# client yang dipakai bersama oleh semua task di worker ini
+sheets_client = SheetsClient()
+
+
+def daemon_process():
+    # worker celery prefork (billiard) adalah proses daemon, ProcessPoolExecutor di dalamnya selalu gagal
+    # (daemonic processes are not allowed to have children) > langsung diproses serial tanpa mencoba
+    return multiprocessing.current_process().daemon
+
+
+class ProcessFile:
+    def __init__(self, file, client=None, stats=None):
+        # waktu tiap tahap dan counter pemrosesan, dibuat di task agar kegagalan di __init__ ikut tercatat
+        self.stats = stats or RunStats(file["file_name"])
+        # client bisa diganti (misal client palsu untuk test)
+        self.client = client or sheets_client
+        with self.stats.stage("credential_load"):
+            self.sh = self.client.get_spreadsheet()
+
         self.file = file
         self.path_data = Path("/data/data/com.termux/files/home/dummy-data")
+        # mirror worksheet yang dipakai di task ini > {name: WorksheetMirror}
+        self.mirrors = {}
+        # index baris terakhir yang terisi tiap worksheet, dipakai untuk range append
+        self.last_rows = {}
+        # hasil agregasi file yang dibuat bersamaan dengan hash
+        self.aggregator = None
+        # algoritma hash file baru, file lama memakai algoritma yang tersimpan di FileIntegrity
+        self.hash_algorithm = settings.FILE_HASH_ALGORITHM
+        # True > hanya baris baru setelah processed_offset yang diproses
+        self.tail = False
+        # chunk hasil pemrosesan file sebelumnya (FileChunkState), dibaca hanya saat file di parsing
+        self.previous_chunks = {}
+        # ringkasan baris data yang ditolak, dibuat saat file dibaca
+        self.validation = None
+        # engine agregasi, dikirim sebagai argumen karena settings tidak dibaca di proses worker
+        self.aggregation_backend = settings.AGGREGATION_BACKEND
+        if (
+            get_aggregator(self.aggregation_backend)
+            is not AGGREGATORS[self.aggregation_backend]
+        ):
+            logger.warning(
+                "Engine agregasi %s tidak tersedia (numpy tidak terinstall), agregasi memakai engine python",
+                self.aggregation_backend,
+            )
 
     def check_changes_data_file(self):
         # cek apakah file lama ada perubahan data
@@ -53,28 +256,44 @@ class ProcessFile:
 
         logger.info("Memulai pengecekan data di file")
 
-        # membuat hash data file
-        hasher = hashlib.sha256()
-        with self.file["file"].open("rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hasher.update(chunk)
-
-        self.file_hash = hasher.hexdigest()
-        logger.debug(f"Hash file berhasil dibuat: {self.file_hash}")
+        self.file_stat = self.file["file"].stat()
 
         if self.file["is_new_file"]:
+            self.ingest_data_file()
             logger.info("Menghentikan pengecekan karena file baru")
             return True
 
         # ambil data di db untuk membandingkan hashing sekarang dengan yang lama
         try:
-            self.last_file = FileIntegrity.objects.get(filename=self.file["file_name"])
+            # processed_dates hanya dipakai saat baris baru diproses, dibaca jika diperlukan
+            self.last_file = FileIntegrity.objects.defer("processed_dates").get(
+                filename=self.file["file_name"]
+            )
         except FileIntegrity.DoesNotExist as e:
             logger.error(
-                f"File dengan nama {self.file["file_name"]} tidak ditemukan di database"
+                "File dengan nama %s tidak ditemukan di database",
+                self.file["file_name"],
             )
             raise
 
+        self.hash_algorithm = self.last_file.hash_algorithm
+        unchanged = self.stat_unchanged()
+        # statistik cache stat file > file yang tidak perlu dibaca ulang
+        self.stats.count("stat_hits" if unchanged else "stat_misses")
+        if not unchanged:
+            if not self.ingest_tail_file():
+                self.ingest_data_file()
+        elif settings.FILE_HASH_PARANOID:
+            # stat sama, file kemungkinan besar tidak berubah > hash saja tanpa grouping
+            with self.stats.stage("hash"):
+                self.file_hash = file_digest(self.file["file"], self.hash_algorithm)
+            logger.debug("Hash file berhasil dibuat: %s", self.file_hash)
+        else:
+            logger.info(
+                "Ukuran, mtime dan inode file sama dengan data lama, hash tidak dibuat ulang"
+            )
+            self.file_hash = self.last_file.hash_data
+
         if self.file_hash == self.last_file.hash_data:
             logger.info(
                 "Hash data lama sama dengan hash data baru. Data file tidak berubah"
@@ -85,183 +304,533 @@ class ProcessFile:
                 f"Silakan tambah atau buat perubahan pada data file jika di perlukan.\n\n"
                 f"Sistem Monitoring File"
             )
-            send_mail_task.delay("Data File Tidak Berubah", message)
+            # stat baru disimpan (misal setelah touch / rsync / inode berubah) agar pengecekan berikutnya
+            # tidak membaca dan hash ulang seluruh file
+            self.last_file.set_stat(self.file_stat)
+            self.last_file.last_checked = now()
+            self.last_file.save(
+                update_fields=[
+                    "file_size",
+                    "file_mtime_ns",
+                    "file_inode",
+                    "last_checked",
+                    "updated_at",
+                ]
+            )
+            with self.stats.stage("email_enqueue"):
+                notify("Data File Tidak Berubah", message)
             return False
 
         logger.info("Data file berubah")
         return True
 
-    def group_file_data(self):
-        with self.file["file"].open("r", encoding="utf-8") as f:
-            logger.info("Melakukan pengambilan dan pengelompokkan data file")
-
-            reader = csv.DictReader(f)
-            # buat variabel untuk tempat hasil grouping data
-            self.grouped_data_category = {}
-            self.grouped_monthly_data = {}
-
-            for i, row in enumerate(reader):
-                # mengecek baris data jika ada field yang kosonk maka data akan diskip dan ke baris selanjutnya
-                missing_fields = [key for key, value in row.items() if not value]
-                if missing_fields:
-                    logger.warning(
-                        f"Baris {i + 1}: Data kosong pada field {', '.join(missing_fields)} di file {self.file['file_name']}"
-                    )
-                    continue
+    def ingest_data_file(self):
+        # file dibaca 1 kali, hash dan grouping data dibuat bersamaan
+        # jika hash sama dengan data lama hasil grouping tidak dipakai
+        # chunk file yang tidak berubah sejak pemrosesan sebelumnya tidak di parsing ulang
+        last_file = getattr(self, "last_file", None)
+        hasher = new_hasher(self.hash_algorithm)
+        missing = []
+        with self.stats.stage("parse"), self.parse_executor() as executor:
+            self.previous_chunks = last_file.load_chunks() if last_file else {}
+            self.aggregator = ingest_file(
+                self.file["file"],
+                hasher,
+                previous=self.previous_chunks,
+                on_missing=lambda i, fields, row: missing.append((i, fields, row)),
+                executor=executor,
+                backend=self.aggregation_backend,
+            )
+        self.new_validation(self.aggregator, missing)
+        self.count_ingest(self.aggregator)
+        self.log_parse_fallback()
+        self.file_hash = hasher.hexdigest()
+        logger.debug("Hash file berhasil dibuat: %s", self.file_hash)
+        if self.aggregator.reused:
+            logger.info(
+                "%s chunk file tidak berubah, %s chunk diproses ulang",
+                self.aggregator.reused,
+                self.aggregator.parsed,
+                extra={
+                    "file_name": self.file["file_name"],
+                    "chunks_reused": self.aggregator.reused,
+                    "chunks_parsed": self.aggregator.parsed,
+                },
+            )
 
-                # tambah key baru
-                # "2025-11-08" => "2025-11"
-                row["month"] = "-".join(row["date"].split("-")[:2])
+    def ingest_tail_file(self):
+        # file yang hanya bertambah di akhir > prefix yang sudah diproses cukup di hash,
+        # hanya baris baru yang di grouping lalu ditambahkan ke total sebelumnya
+        offset = self.last_file.processed_offset
+        if (
+            not settings.TAIL_PROCESSING
+            or offset is None
+            or self.file_stat.st_size <= offset
+        ):
+            return False
 
-                date = row.get("date")
-                category = row.get("category")
-                price = int(row.get("price"))
-                month = row.get("month")
+        hasher = new_hasher(self.hash_algorithm)
+        missing = []
+        # hash_data adalah hash file sampai processed_offset saat terakhir diproses
+        with self.stats.stage("parse"), self.parse_executor(
+            self.file_stat.st_size - offset
+        ) as executor:
+            self.previous_chunks = self.last_file.load_chunks()
+            aggregator = ingest_tail(
+                self.file["file"],
+                hasher,
+                offset,
+                self.last_file.hash_data,
+                start=self.last_file.processed_rows,
+                previous=self.previous_chunks.get("chunks"),
+                on_missing=lambda i, fields, row: missing.append((i, fields, row)),
+                executor=executor,
+                backend=self.aggregation_backend,
+            )
+        if aggregator is None:
+            logger.info("Isi file sebelumnya berubah, file diproses ulang dari awal")
+            return False
 
-                self.grouped_data_category.setdefault(month, {}).setdefault(
-                    category, []
-                ).append(price)
+        logger.info(
+            "Isi file sebelumnya tidak berubah, hanya %s byte baru yang diproses",
+            self.file_stat.st_size - offset,
+            extra={
+                "file_name": self.file["file_name"],
+                "bytes": self.file_stat.st_size - offset,
+            },
+        )
+        self.tail = True
+        self.aggregator = aggregator
+        self.new_validation(aggregator, missing)
+        self.count_ingest(aggregator)
+        self.log_parse_fallback()
+        self.file_hash = hasher.hexdigest()
+        logger.debug("Hash file berhasil dibuat: %s", self.file_hash)
+        return True
 
-                self.grouped_monthly_data.setdefault(month, {}).setdefault(
-                    date, []
-                ).append(price)
+    def count_ingest(self, aggregator):
+        # hash dan parsing dijalankan bersamaan, waktu hash dipisah dari waktu parsing
+        self.stats.split(
+            "parse", "hash", aggregator.hash_time, aggregator.hash_cpu_time
+        )
+        self.stats.count("rows_read", aggregator.rows)
+        self.stats.count("chunks_reused", aggregator.reused)
+        self.stats.count("chunks_parsed", aggregator.parsed)
 
-            logger.info(
-                f"Pengelompokan data dari file {self.file['file_name']} telah selesai diproses"
+    def parse_executor(self, size=None):
+        # file besar di parsing paralel, untuk file kecil biaya membuat proses lebih besar dari parsing
+        if size is None:
+            size = self.file["file"].stat().st_size
+        workers = settings.PARALLEL_PARSE_WORKERS or os.cpu_count() or 1
+        if size < settings.PARALLEL_PARSE_MIN_BYTES or workers < 2 or daemon_process():
+            return nullcontext()
+        return ProcessPoolExecutor(max_workers=workers)
+
+    def log_parse_fallback(self):
+        if self.aggregator.executor_error is not None:
+            # worker celery (prefork) tidak boleh membuat proses anak
+            logger.warning(
+                "Parsing paralel tidak bisa dijalankan, chunk file diproses satu per satu: %s",
+                self.aggregator.executor_error,
             )
-            return self.grouped_data_category, self.grouped_monthly_data
 
-    def get_worksheet(self, name):
-        try:
-            worksheet = self.sh.worksheet(name)
-            self.values = worksheet.get_all_values()
-            header = self.values[0]
+    def new_validation(self, aggregator, missing):
+        # baris yang memiliki field kosong akan diskip dan ke baris selanjutnya,
+        # dicatat di ringkasan validasi (1 record log per file) bukan 1 log per baris.
+        # header diambil dari hasil ingest agar file tidak dibuka ulang
+        self.validation = ValidationReport(
+            self.file["file_name"], parse_header(aggregator.header)
+        )
+        self.stats.count("rows_skipped", len(missing))
+        for i, missing_fields, row in missing:
+            self.validation.reject(i, missing_fields, row)
 
-            if (
-                header != ["month", "category", "total_expense"]
-                and name == "Category Expense"
-            ):
-                raise Exception(
-                    "Header tidak sesuai untuk worksheet 'Category Expense'"
-                )
+    def validation_reports(self):
+        return [self.validation] if self.validation is not None else []
 
-            elif (
-                header != ["month", "total_expense", "avg_per_day", "days_count"]
-                and name == "Monthly Expense"
-            ):
-                raise Exception("Header tidak sesuai untuk worksheet 'Monthly Expense'")
+    def validation_message(self):
+        messages = [report.message() for report in self.validation_reports()]
+        messages = [message for message in messages if message]
+        if not messages:
+            return ""
+        return "Ringkasan validasi data:\n" + "\n\n".join(messages) + "\n\n"
+
+    def stat_unchanged(self):
+        # stat sama > isi file dianggap sama, FILE_HASH_PARANOID > tetap di hash ulang
+        if not self.last_file.same_stat(self.file_stat):
+            return False
+        # file yang diubah di tick mtime yang sama setelah dicek terakhir bisa punya stat sama,
+        # stat hanya dipercaya jika mtime file cukup jauh sebelum pengecekan terakhir
+        last_checked_ns = int(self.last_file.last_checked.timestamp() * 10**9)
+        return self.last_file.file_mtime_ns < last_checked_ns - STAT_RACY_NS
+
+    def group_file_data(self):
+        logger.info("Melakukan pengambilan dan pengelompokkan data file")
+
+        # file belum dibaca saat pengecekan data (check_changes_data_file tidak dipanggil)
+        if self.aggregator is None:
+            self.ingest_data_file()
+
+        # hasil grouping berupa total per group
+        # {month: {category: total}} dan {month: {date: total}}
+        self.grouped_data_category = self.aggregator.grouped_data_category
+        self.grouped_monthly_data = self.aggregator.grouped_monthly_data
+        # data file diproses > ringkasan baris yang ditolak ditulis 1 kali
+        self.validation.finish()
+
+        logger.info(
+            "Pengelompokan data dari file %s telah selesai diproses",
+            self.file["file_name"],
+        )
+        return self.grouped_data_category, self.grouped_monthly_data
+
+    def get_worksheet(self, name):
+        try:
+            worksheet = self.client.worksheet(name, stats=self.stats)
+            self.values = counted_request(self.stats, worksheet.get_all_values)
+            self.check_header(name, self.values[0])
 
             data_rows = self.values[1:] if len(self.values) > 1 else []
             lookup = {}
             return worksheet, data_rows, lookup
 
         except gspread.exceptions.WorksheetNotFound:
-            logger.error(f"Worksheet '{name}' tidak ditemukan.")
+            logger.error("Worksheet '%s' tidak ditemukan.", name)
             raise
 
         except Exception as e:
-            logger.exception(f"Gagal mengambil worksheet: {e}")
+            logger.exception("Gagal mengambil worksheet: %s", e)
             raise
 
-    def change_sheets(self, worksheet, rows_for_update, rows_for_append):
+    def check_header(self, name, header):
+        if header != HEADERS[name]:
+            raise Exception(f"Header tidak sesuai untuk worksheet '{name}'")
+
+    def get_worksheet_rows(self, name, months=None):
+        # ambil baris satu worksheet dalam bentuk {row_index: row}
+        # jika months tidak diisi semua baris diambil dengan get_worksheet
+        if months is None:
+            worksheet, data_rows, _ = self.get_worksheet(name)
+            self.last_rows[name] = len(data_rows) + 1
+            return worksheet, dict(enumerate(data_rows, start=2))
+
+        rows = self.get_sheets_rows({name: months})
+        return self.client.worksheet(name, stats=self.stats), rows[name]
+
+    def batch_get(self, ranges):
+        # ranges > {name: [range]}, semua worksheet dibaca dalam 1 request values_batch_get
+        # hasil > {name: [values tiap range]}
+        request = [
+            (name, gspread.utils.absolute_range_name(name, item))
+            for name, items in ranges.items()
+            for item in items
+        ]
+        result = {name: [] for name in ranges}
+        if not request:
+            return result
+
+        request_ranges = [item for _, item in request]
+        response = self.client.values_batch_get(request_ranges, stats=self.stats)
+        for (name, _), value_range in zip(request, response.get("valueRanges", [])):
+            result[name].append(value_range.get("values", []))
+        return result
+
+    def get_sheets_rows(self, months_by_name):
+        # months_by_name > {name: months}, hasil > {name: {row_index: row}}
+        # hanya baris dengan month di months yang dikembalikan
         try:
-            if rows_for_update:
-                worksheet.batch_update(rows_for_update)
-                logger.info("Data bagian yang di update berhasil di upload")
-            if rows_for_append:
-                worksheet.append_rows(rows_for_append)
-                logger.info("Data bagian yang di add berhasil di upload")
-        except gspread.exceptions.APIError as e:
-            logger.exception(f"API error saat mengubah sheet: {e}")
-            raise
+            if settings.SHEETS_MIRROR:
+                return self.get_mirror_rows(months_by_name)
+            return self.get_range_rows(months_by_name)
         except Exception as e:
-            logger.exception(f"Gagal memperbarui sheet: {e}")
+            logger.exception("Gagal mengambil worksheet: %s", e)
             raise
 
-    def process_file_category_expense(self):
-        logger.info("Memulai pemrosesan file sheets bagian Category Expense")
+    def get_range_rows(self, months_by_name):
+        # request pertama > header dan kolom key saja (month / month, category)
+        result = self.batch_get(
+            {name: [header_range(name), key_range(name)] for name in months_by_name}
+        )
 
-        worksheet, data_rows, lookup = self.get_worksheet("Category Expense")
+        keys, ranges = {}, {}
+        for name, (header_values, key_values) in result.items():
+            self.check_header(name, header_values[0] if header_values else [])
+            self.last_rows[name] = len(key_values) + 1
 
-        # mengisi data lookup
-        # lookup untuk dapat nyimpan lokasi baris data dan key-nya dibuat agar mudah di ambil pas lagi looping data group
-        for i, row in enumerate(data_rows, start=2):  # mulai dari baris ke-2
-            month, category = row[0], row[1]
-            total_expense = int(row[2])
-            lookup[(month, category)] = [i, total_expense]
+            # ambil index baris yang month-nya dibutuhkan
+            key_count = KEY_COLUMNS[name]
+            keys[name] = {
+                i: row + [""] * (key_count - len(row))
+                for i, row in enumerate(key_values, start=2)
+                if row and row[0] in months_by_name[name]
+            }
+            ranges[name] = contiguous_ranges(keys[name])
+
+        # request kedua > kolom value hanya untuk baris yang dibutuhkan
+        result = self.batch_get(
+            {
+                name: [value_range(name, start, end) for start, end in items]
+                for name, items in ranges.items()
+                if items
+            }
+        )
+
+        rows = {name: {} for name in months_by_name}
+        for name, values in result.items():
+            for (start, end), value_rows in zip(ranges[name], values):
+                for i in range(start, end + 1):
+                    offset = i - start
+                    rows[name][i] = keys[name][i] + (
+                        value_rows[offset] if offset < len(value_rows) else []
+                    )
+        return rows
+
+    def get_mirror_rows(self, months_by_name):
+        # ambil baris dari mirror lokal, worksheet hanya di download ulang jika mirror tidak sama
+        mirrors = {
+            mirror.name: mirror
+            for mirror in WorksheetMirror.objects.filter(name__in=months_by_name)
+        }
+        stale = [name for name in months_by_name if name not in mirrors]
 
-        # variabel untuk kirim data sesuai format worksheet
-        rows_for_update, rows_for_append = [], []
+        if settings.SHEETS_MIRROR_VERIFY and mirrors:
+            # cek dalam 1 request > header, kolom key semua baris dan semua kolom baris yang akan ditimpa,
+            # sel value yang diubah manual di baris lain tidak ikut ditimpa sehingga tidak perlu dicek
+            ranges = {
+                name: contiguous_ranges(mirror.filter_months(months_by_name[name]))
+                for name, mirror in mirrors.items()
+            }
+            result = self.batch_get(
+                {
+                    name: [
+                        header_range(name),
+                        key_range(name),
+                        *(row_range(name, start, end) for start, end in ranges[name]),
+                    ]
+                    for name in mirrors
+                }
+            )
+            for name, (header_values, key_values, *row_values) in result.items():
+                header = header_values[0] if header_values else []
+                if header != HEADERS[name] or not mirrors[name].matches(
+                    key_values, KEY_COLUMNS[name], ranges[name], row_values
+                ):
+                    logger.warning(
+                        "Mirror worksheet '%s' berbeda dengan google sheets, worksheet diambil ulang",
+                        name,
+                    )
+                    stale.append(name)
 
-        # untuk nyimpan data hasil pemrosesan file csv di db
-        self.latest_category_expense_data = {}
+        # statistik cache mirror > worksheet yang tidak perlu di download ulang
+        self.stats.count("mirror_hits", len(months_by_name) - len(stale))
+        self.stats.count("mirror_misses", len(stale))
+        if stale:
+            result = self.batch_get({name: [full_range(name)] for name in stale})
+            for name, (values,) in result.items():
+                self.check_header(name, values[0] if values else [])
+                mirror = mirrors.get(name) or WorksheetMirror(name=name)
+                mirror.rows = values[1:]
+                mirror.save()
+                mirrors[name] = mirror
+                logger.info(
+                    "Mirror worksheet '%s' dibuat ulang dari google sheets", name
+                )
+
+        self.mirrors.update(mirrors)
 
-        # mengkelola data hasil grouping agar sesuai format worksheet untuk di upload
-        for month, categories_in_month in self.grouped_data_category.items():
-            for category, prices in categories_in_month.items():
-                key = (month, category)
-                total_new = sum(prices)
+        rows = {}
+        for name, months in months_by_name.items():
+            self.last_rows[name] = mirrors[name].last_row_index
+            rows[name] = mirrors[name].filter_months(months)
+        return rows
 
-                self.latest_category_expense_data[f"{month}|{category}"] = total_new
+    def update_mirror(self, name, rows_for_update, rows_for_append):
+        # terapkan perubahan yang sama dengan change_sheets ke mirror
+        mirror = self.mirrors.get(name)
+        if mirror is None:
+            return
+        mirror.apply_updates(rows_for_update)
+        mirror.apply_appends(rows_for_append)
+        mirror.save()
 
-                # ambil data lookup sesuai key (month, category)
-                if key in lookup:
-                    # ambil baris dan total yang ada di worksheet
-                    row_index, total_old = lookup[key]
+    def drop_mirror(self, name):
+        # isi worksheet tidak pasti setelah gagal upload, mirror dihapus agar diambil ulang
+        mirror = self.mirrors.pop(name, None)
+        if mirror is not None and mirror.pk:
+            mirror.delete()
 
-                    # buat total baru
-                    # total_old = total yang ada di get_worksheet
-                    # total_new = total dari process file csv
-                    new_total = total_old + total_new
+    def ensure_rows(self, name, last_row, refresh=False):
+        # values_batch_update tidak menambah baris otomatis seperti append_rows
+        # refresh True > row_count di cache tidak dipakai, metadata worksheet diambil ulang
+        worksheet = self.client.worksheet(name, refresh=refresh, stats=self.stats)
+        if last_row > worksheet.row_count:
+            counted_request(
+                self.stats, worksheet.add_rows, last_row - worksheet.row_count + 100
+            )
 
-                    # simpan lokasi baris yang akan di update dengan data baru
-                    rows_for_update.append(
-                        {"range": f"C{row_index}", "values": [[new_total]]}
+    def change_sheets(self, plans):
+        # plans > {name: (rows_for_update, rows_for_append)}
+        # update dan append semua worksheet dikirim dalam 1 request values_batch_update
+        data = []
+        # baris terakhir append per worksheet > {name: end}
+        appends = {}
+        try:
+            for name, (rows_for_update, rows_for_append) in plans.items():
+                for item in rows_for_update:
+                    data.append(
+                        {
+                            "range": gspread.utils.absolute_range_name(
+                                name, item["range"]
+                            ),
+                            "values": item["values"],
+                        }
                     )
-                else:  # kalo key tak ditemukan berarti data baru
-                    rows_for_append.append([month, category, total_new])
-
-        # mengurangi total yang ada di lookup (google sheets) dengan total total hasil dari process category expense
-        if not self.file["is_new_file"]:
-            for key, total in self.last_file.latest_category_expense_data.items():
-                # month|category > (month, category)
-                key = tuple(key.split("|"))
-                if key in lookup:
-                    row_index, total_expense = lookup[key]
-                    # ambil baris rows_for_update hasil loop.self.grouped_data_category
-                    row = next(
-                        (
-                            item
-                            for item in rows_for_update
-                            if item["range"] == f"C{row_index}"
-                        ),
-                        None,
+
+                # append ditulis ke range tepat setelah baris terakhir worksheet
+                if rows_for_append:
+                    start = self.last_rows[name] + 1
+                    end = start + len(rows_for_append) - 1
+                    self.ensure_rows(name, end)
+                    appends[name] = end
+                    data.append(
+                        {
+                            "range": gspread.utils.absolute_range_name(
+                                name, row_range(name, start, end)
+                            ),
+                            "values": rows_for_append,
+                        }
                     )
-                    if row:
-                        # jika ada kurangi dengan total dari item latest_category_expense_data
-                        row["values"][0][0] -= total
-                    else:
-                        # jika tidak ada tambah le rows_for_update tapi tapi total_expense di kurangi total
-                        # total_expense > nilai dari lookup atau google sheets
-                        # total > nilai dari item latest_category_expense_data
-                        rows_for_update.append(
-                            {
-                                "range": f"C{row_index}",
-                                "values": [[total_expense - total]],
-                            }
-                        )
-
-        self.change_sheets(worksheet, rows_for_update, rows_for_append)
-        return rows_for_update, rows_for_append
 
-    def process_file_monthly_expense(self):
-        logger.info("Memulai pemrosesan file sheets bagian Monthly Expense")
+            if data:
+                body = {"valueInputOption": "RAW", "data": data}
+                self.batch_update(body, appends)
+        except gspread.exceptions.APIError as e:
+            logger.exception("API error saat mengubah sheet: %s", e)
+            raise
+        except Exception as e:
+            logger.exception("Gagal memperbarui sheet: %s", e)
+            raise
+
+        if any(rows_for_update for rows_for_update, _ in plans.values()):
+            logger.info("Data bagian yang di update berhasil di upload")
+        if any(rows_for_append for _, rows_for_append in plans.values()):
+            logger.info("Data bagian yang di add berhasil di upload")
+
+        for name, (_, rows_for_append) in plans.items():
+            self.last_rows[name] += len(rows_for_append)
+
+    def batch_update(self, body, appends):
+        try:
+            return self.client.values_batch_update(body, stats=self.stats)
+        except gspread.exceptions.APIError as e:
+            if not appends or "exceeds grid limits" not in str(e):
+                raise
+            # row_count di cache lebih kecil dari worksheet sebenarnya (baris dihapus manual)
+            # > jumlah baris diambil ulang, baris ditambah lalu request diulang sekali
+            logger.warning(
+                "Jumlah baris worksheet berubah, metadata worksheet diambil ulang: %s",
+                e,
+            )
+        for name, end in appends.items():
+            self.ensure_rows(name, end, refresh=True)
+        return self.client.values_batch_update(body, stats=self.stats)
+
+    def write_sheets(self, plans):
+        try:
+            self.change_sheets(plans)
+        except Exception:
+            for name in plans:
+                self.drop_mirror(name)
+            raise
+
+        for name, (rows_for_update, rows_for_append) in plans.items():
+            self.update_mirror(name, rows_for_update, rows_for_append)
+
+    def previous_data(self, field):
+        # data lama hasil pemrosesan file sebelumnya untuk dikurangi dari worksheet
+        return {} if self.file["is_new_file"] else getattr(self.last_file, field)
+
+    def category_expense_totals(self):
+        # {"month|category": total} hasil pemrosesan file sekarang
+        totals = planners.category_totals(self.grouped_data_category)
+        if not self.tail:
+            return totals
+        # baris baru ditambahkan ke total file sebelumnya
+        return planners.merge_category_totals(
+            [self.last_file.latest_category_expense_data, totals]
+        )
 
-        worksheet, data_rows, lookup = self.get_worksheet("Monthly Expense")
+    def monthly_expense_totals(self):
+        # {month: {"total_new": ..., "days_count_new": ...}} hasil pemrosesan file sekarang
+        totals = planners.monthly_totals(self.grouped_monthly_data)
+        if not self.tail:
+            return totals
+        totals = planners.merge_monthly_totals(
+            [self.last_file.latest_monthly_expense_data, totals]
+        )
+        # tanggal yang sudah ada di bagian file sebelumnya tidak dihitung 2 kali
+        for month, dates in self.file_dates().items():
+            totals[month]["days_count_new"] = len(dates)
+        return totals
+
+    def file_dates(self):
+        # semua tanggal di file > {month: [date]}
+        dates = {
+            month: set(items)
+            for month, items in (
+                self.last_file.processed_dates if self.tail else {}
+            ).items()
+        }
+        for month, items in self.grouped_monthly_data.items():
+            dates.setdefault(month, set()).update(items)
+        return {month: sorted(items) for month, items in dates.items()}
+
+    def processed_state(self, aggregator, file_dates, previous=None):
+        # posisi file yang sudah diproses untuk pemrosesan baris baru
+        # previous > FileIntegrity jika hanya baris baru yang diproses, baris sebelumnya ikut dihitung
+        rows = aggregator.rows
+        if previous is not None:
+            rows += previous.processed_rows
+        return {
+            "processed_offset": aggregator.offset,
+            "processed_rows": rows,
+            "processed_dates": file_dates,
+        }
+
+    def chunk_state(self, aggregator):
+        # chunk untuk pemrosesan berikutnya, chunk prefix file ikut disimpan jika hanya baris baru yang diproses
+        state = aggregator.state()
+        if self.tail:
+            state["chunks"] = self.previous_chunks.get("chunks", []) + state["chunks"]
+        return state
+
+    def category_expense_months(self):
+        # hanya baris dengan month yang ada di file sekarang atau file sebelumnya yang diambil
+        previous_data = self.previous_data("latest_category_expense_data")
+        return {
+            key.split("|", 1)[0]
+            for key in [*self.latest_category_expense_data, *previous_data]
+        }
+
+    def monthly_expense_months(self):
+        previous_data = self.previous_data("latest_monthly_expense_data")
+        return set(self.latest_monthly_expense_data) | set(previous_data)
+
+    def category_lookup(self, rows):
+        # mengisi data lookup
+        # lookup untuk dapat nyimpan lokasi baris data dan key-nya dibuat agar mudah di ambil pas lagi looping data group
+        lookup = {}
+        for i, row in rows.items():
+            month, category = row[0], row[1]
+            total_expense = int(row[2])
+            lookup[(month, category)] = [i, total_expense]
+        return lookup
 
+    def monthly_lookup(self, rows):
         # mengisi data lookup
         # lookup untuk dapat nyimpan lokasi baris data dan key-nya dibuat agar mudah di ambil pas lagi looping data group
-        for i, row in enumerate(data_rows, start=2):  # mulai dari baris ke-2
+        lookup = {}
+        for i, row in rows.items():
             month, total_expense, avg_per_day, days_count = (
                 row[0],
                 int(row[1]),
@@ -269,135 +838,272 @@ class ProcessFile:
                 int(row[3]),
             )
             lookup[month] = [i, total_expense, days_count]
+        return lookup
 
-        rows_for_update, rows_for_append = [], []
+    def plan_category_expense(self, rows):
+        return planners.plan_category_expense(
+            self.category_lookup(rows),
+            self.latest_category_expense_data,
+            self.previous_data("latest_category_expense_data"),
+        )
 
-        # untuk nyimpan data hasil pemrosesan file csv di db
-        self.latest_monthly_expense_data = {}
+    def plan_monthly_expense(self, rows):
+        return planners.plan_monthly_expense(
+            self.monthly_lookup(rows),
+            self.latest_monthly_expense_data,
+            self.previous_data("latest_monthly_expense_data"),
+        )
 
-        for month, dates in self.grouped_monthly_data.items():
-            total_new = sum(sum(prices) for prices in dates.values())
-            days_count_new = len(dates)
-            try:
-                avg_new = int(total_new / len(dates))
-            except ZeroDivisionError:
-                avg_new = 0
+    def process_sheets(self, names=("Category Expense", "Monthly Expense")):
+        # semua worksheet dibaca bersama dan semua perubahan ditulis dalam 1 request
+        # hasil > {name: (rows_for_update, rows_for_append)}
+        sheets = {
+            "Category Expense": (
+                self.category_expense_months,
+                self.plan_category_expense,
+            ),
+            "Monthly Expense": (
+                self.monthly_expense_months,
+                self.plan_monthly_expense,
+            ),
+        }
+        for name in names:
+            logger.info("Memulai pemrosesan file sheets bagian %s", name)
 
-            self.latest_monthly_expense_data[month] = {
-                "total_new": total_new,
-                "days_count_new": days_count_new,
-            }
-            # ambil data lookup sesuai key (month)
-            if month in lookup:
-                row_index, total_old, days_count_old = lookup[month]
-                try:
-                    avg_combined = int(
-                        (int(total_old) + total_new)
-                        / (int(days_count_old) + days_count_new)
-                    )
-                except ZeroDivisionError:
-                    avg_combined = 0
-
-                rows_for_update.append(
-                    {
-                        "range": f"B{row_index}:D{row_index}",
-                        "values": [
-                            [
-                                total_new + total_old,
-                                avg_combined,
-                                days_count_new + days_count_old,
-                            ]
-                        ],
-                    }
-                )
-            else:
-                rows_for_append.append([month, total_new, avg_new, days_count_new])
-
-        # mengurangi total dan days_count yang ada di lookup (google sheets) dengan total total hasil dari process monthly expense
-        if not self.file["is_new_file"]:
-            for month, values in self.last_file.latest_monthly_expense_data.items():
-                if month in lookup:
-                    row_index, total_old, days_count_old = lookup[month]
-                    # ambil baris rows_for_update hasil loop.self.grouped_monthly_data
-                    row = next(
-                        (
-                            item
-                            for item in rows_for_update
-                            if item["range"] == f"B{row_index}:D{row_index}"
-                        ),
-                        None,
-                    )
+        with self.stats.stage("diff_planning"):
+            # latest_*_expense_data untuk nyimpan data hasil pemrosesan file csv di db
+            self.latest_category_expense_data = self.category_expense_totals()
+            self.latest_monthly_expense_data = self.monthly_expense_totals()
+            months = {name: sheets[name][0]() for name in names}
 
-                    if row:
-                        # jika ada kurangi dengan value dari item latest_category_expense_data
-                        row["values"][0][0] -= values["total_new"]
-                        row["values"][0][2] -= values["days_count_new"]
-
-                        try:
-                            row["values"][0][1] = int(
-                                row["values"][0][0] / row["values"][0][2]
-                            )
-                        except ZeroDivisionError:
-                            row["values"][0][1] = 0
-                    else:
-                        # jika tidak ada tambah ke rows_for_update
-                        # tapi total_old di kurangi total_new values
-                        # days_count_old di kurangi days_count dari values
-                        # total_old > nilai dari lookup atau google sheets
-                        # total_new > nilai dari item latest_category_expense_data
-                        total = total_old - values["total_new"]
-                        days_count = days_count_old - values["days_count_new"]
-                        try:
-                            avg = total / days_count
-                        except ZeroDivisionError:
-                            avg = 0
-
-                        rows_for_update.append(
-                            {
-                                "range": f"B{row_index}:D{row_index}",
-                                "values": [[total, avg, days_count]],
-                            }
-                        )
-
-        self.change_sheets(worksheet, rows_for_update, rows_for_append)
-
-        return rows_for_update, rows_for_append
+        with self.stats.stage("worksheet_fetch"):
+            rows = self.get_sheets_rows(months)
 
-    def change_data_model(self):
-        if not self.file["is_new_file"]:
-            logger.info(
-                f"Mengupdate data model dengan nama file {self.last_file.filename}"
-            )
-            self.last_file.hash_data = self.file_hash
-            self.last_file.last_checked = now()
-            self.last_file.latest_category_expense_data = getattr(
-                self, "latest_category_expense_data", {}
-            )
-            self.last_file.latest_monthly_expense_data = getattr(
-                self, "latest_monthly_expense_data", {}
-            )
-            self.last_file.save()
-        else:
-            logger.info(
-                f"Menambah data model baru dengan nama file {self.file['file_name']}"
+        with self.stats.stage("diff_planning"):
+            plans = {name: sheets[name][1](rows[name]) for name in names}
+        self.count_plans(plans)
+
+        with self.stats.stage("sheet_write"):
+            self.write_sheets(plans)
+        return plans
+
+    def count_plans(self, plans):
+        self.stats.count("groups_category", len(self.latest_category_expense_data))
+        self.stats.count("groups_monthly", len(self.latest_monthly_expense_data))
+        for rows_for_update, rows_for_append in plans.values():
+            self.stats.count(
+                "cells_updated",
+                sum(len(row) for item in rows_for_update for row in item["values"]),
             )
-            FileIntegrity.objects.create(
-                filename=self.file["file_name"],
-                hash_data=self.file_hash,
-                last_checked=now(),
-                latest_category_expense_data=getattr(
+            self.stats.count("rows_appended", len(rows_for_append))
+
+    def process_file_category_expense(self):
+        return self.process_sheets(["Category Expense"])["Category Expense"]
+
+    def process_file_monthly_expense(self):
+        return self.process_sheets(["Monthly Expense"])["Monthly Expense"]
+
+    def change_data_model(self):
+        # FileIntegrity dan chunk state disimpan bersamaan
+        with transaction.atomic():
+            if not self.file["is_new_file"]:
+                logger.info(
+                    "Mengupdate data model dengan nama file %s", self.last_file.filename
+                )
+                self.last_file.hash_data = self.file_hash
+                self.last_file.hash_algorithm = self.hash_algorithm
+                self.last_file.last_checked = now()
+                self.last_file.set_stat(self.file_stat)
+                self.last_file.latest_category_expense_data = getattr(
                     self, "latest_category_expense_data", {}
-                ),
-                latest_monthly_expense_data=getattr(
+                )
+                self.last_file.latest_monthly_expense_data = getattr(
                     self, "latest_monthly_expense_data", {}
-                ),
-            )
+                )
+                # baris file sebelumnya ikut dihitung jika hanya baris baru yang diproses
+                for field, value in self.processed_state(
+                    self.aggregator,
+                    self.file_dates(),
+                    self.last_file if self.tail else None,
+                ).items():
+                    setattr(self.last_file, field, value)
+                self.last_file.save()
+                self.last_file.save_chunks(self.chunk_state(self.aggregator))
+            else:
+                logger.info(
+                    "Menambah data model baru dengan nama file %s",
+                    self.file["file_name"],
+                )
+                file_integrity = FileIntegrity(
+                    filename=self.file["file_name"],
+                    hash_data=self.file_hash,
+                    hash_algorithm=self.hash_algorithm,
+                    last_checked=now(),
+                    latest_category_expense_data=getattr(
+                        self, "latest_category_expense_data", {}
+                    ),
+                    latest_monthly_expense_data=getattr(
+                        self, "latest_monthly_expense_data", {}
+                    ),
+                    **self.processed_state(self.aggregator, self.file_dates()),
+                )
+                file_integrity.set_stat(self.file_stat)
+                file_integrity.save()
+                file_integrity.save_chunks(self.chunk_state(self.aggregator))
 
     def send_email_success(self):
         message = (
             f"Sistem berhasil melakukan pemrosesan pada file {self.file['file_name']} di lokasi berikut:\n"
             f"{self.path_data}\n\n"
+            f"{self.validation_message()}"
+            f"Sistem Monitoring File"
+        )
+        notify("Data File Berhasil di Proses", message)
+        logger.info("Mengirim pesan success melalui email")
+
+
+class ProcessBacklog(ProcessFile):
+    """
+    Memproses beberapa file baru sekaligus (data_N.csv, data_N+1.csv, ...) yang tertinggal.
+    Parsing file dijalankan paralel di beberapa proses, hasilnya digabung dan dikirim ke google sheets
+    dalam 1 update. FileIntegrity tetap dibuat per file agar perubahan file berikutnya bisa dihitung
+    """
+
+    def __init__(self, files, client=None, stats=None):
+        self.files = files
+        super().__init__(files[0], client, stats or RunStats(self.file_names()))
+
+    def file_names(self):
+        return ", ".join(file["file_name"] for file in self.files)
+
+    def check_changes_data_file(self):
+        # semua file backlog adalah file baru, hash dan grouping dibuat dalam 1 kali baca per file
+        logger.info("Memulai pengecekan data di file %s", self.file_names())
+
+        self.file_stats = {
+            file["file_name"]: file["file"].stat() for file in self.files
+        }
+        self.file_hashes = {}
+        # hasil agregasi per file > {file_name: CsvAggregator}
+        self.aggregators = {}
+        # ringkasan baris yang ditolak per file > {file_name: ValidationReport}
+        self.validations = {}
+        with self.stats.stage("parse"):
+            results = self.aggregate_files()
+        for file, (file_hash, aggregator, missing) in zip(self.files, results):
+            logger.debug(
+                "Hash file %s berhasil dibuat: %s", file["file_name"], file_hash
+            )
+            # waktu hash di proses worker, dibatasi waktu parsing di proses utama
+            self.count_ingest(aggregator)
+            self.stats.count("rows_skipped", len(missing))
+            validation = ValidationReport(
+                file["file_name"], parse_header(aggregator.header)
+            )
+            for i, missing_fields, row in missing:
+                validation.reject(i, missing_fields, row)
+            self.validations[file["file_name"]] = validation
+            self.file_hashes[file["file_name"]] = file_hash
+            self.aggregators[file["file_name"]] = aggregator
+        return True
+
+    def aggregate_files(self):
+        paths = [file["file"] for file in self.files]
+        # settings tidak dibaca di proses worker, algoritma hash dan engine agregasi dikirim sebagai argumen
+        aggregate = partial(
+            aggregate_file,
+            algorithm=self.hash_algorithm,
+            backend=self.aggregation_backend,
+        )
+        if settings.BACKLOG_WORKERS != 1 and not daemon_process():
+            try:
+                with ProcessPoolExecutor(max_workers=settings.BACKLOG_WORKERS) as pool:
+                    return list(pool.map(aggregate, paths))
+            except (AssertionError, OSError, BrokenProcessPool) as e:
+                # worker celery (prefork) tidak boleh membuat proses anak
+                logger.warning(
+                    "Parsing paralel tidak bisa dijalankan, file diproses satu per satu: %s",
+                    e,
+                )
+        return [aggregate(path) for path in paths]
+
+    def group_file_data(self):
+        logger.info(
+            "Melakukan pengambilan dan pengelompokkan data file %s", self.file_names()
+        )
+
+        # file belum dibaca saat pengecekan data (check_changes_data_file tidak dipanggil)
+        if not hasattr(self, "aggregators"):
+            self.check_changes_data_file()
+
+        # gabungan semua file, total group yang sama dijumlahkan
+        self.grouped_data_category, self.grouped_monthly_data = {}, {}
+        for aggregator in self.aggregators.values():
+            for merged, grouped in (
+                (self.grouped_data_category, aggregator.grouped_data_category),
+                (self.grouped_monthly_data, aggregator.grouped_monthly_data),
+            ):
+                for month, items in grouped.items():
+                    merged_items = merged.setdefault(month, {})
+                    for key, total in items.items():
+                        merged_items[key] = merged_items.get(key, 0) + total
+        for validation in self.validations.values():
+            validation.finish()
+
+        logger.info(
+            "Pengelompokan data dari file %s telah selesai diproses", self.file_names()
+        )
+        return self.grouped_data_category, self.grouped_monthly_data
+
+    def validation_reports(self):
+        return list(getattr(self, "validations", {}).values())
+
+    def category_expense_totals(self):
+        return planners.merge_category_totals(
+            planners.category_totals(aggregator.grouped_data_category)
+            for aggregator in self.aggregators.values()
+        )
+
+    def monthly_expense_totals(self):
+        # days_count dihitung per file seperti jika file diproses satu per satu
+        return planners.merge_monthly_totals(
+            planners.monthly_totals(aggregator.grouped_monthly_data)
+            for aggregator in self.aggregators.values()
+        )
+
+    def change_data_model(self):
+        logger.info("Menambah data model baru dengan nama file %s", self.file_names())
+        with transaction.atomic():
+            for file_name, aggregator in self.aggregators.items():
+                file_integrity = FileIntegrity(
+                    filename=file_name,
+                    hash_data=self.file_hashes[file_name],
+                    hash_algorithm=self.hash_algorithm,
+                    last_checked=now(),
+                    latest_category_expense_data=planners.category_totals(
+                        aggregator.grouped_data_category
+                    ),
+                    latest_monthly_expense_data=planners.monthly_totals(
+                        aggregator.grouped_monthly_data
+                    ),
+                    **self.processed_state(
+                        aggregator,
+                        {
+                            month: sorted(dates)
+                            for month, dates in aggregator.grouped_monthly_data.items()
+                        },
+                    ),
+                )
+                file_integrity.set_stat(self.file_stats[file_name])
+                file_integrity.save()
+                file_integrity.save_chunks(aggregator.state())
+
+    def send_email_success(self):
+        message = (
+            f"Sistem berhasil melakukan pemrosesan pada file {self.file_names()} di lokasi berikut:\n"
+            f"{self.path_data}\n\n"
+            f"{self.validation_message()}"
             f"Sistem Monitoring File"
         )
-        send_mail_task.delay("Data File Berhasil di Proses", message)
+        notify("Data File Berhasil di Proses", message)
         logger.info("Mengirim pesan success melalui email")
@@ -1,27 +1,106 @@
-from .utils import send_mail_task
+from django.conf import settings
+from .notifications import notify
 from .models import FileIntegrity
 from django.utils.timezone import now, localtime
 from pathlib import Path
+import os
+import re
+import threading
+import time
+
+# file data harian > data_12.csv
+DATA_FILE = re.compile(r"data_(\d+)\.csv")
+
+
+class DirectoryIndex:
+    """
+    Index isi direktori data > {filename: (size, mtime_ns)}.
+    Direktori hanya di scan ulang dengan os.scandir jika mtime direktori berubah,
+    sehingga cari file dan file terbaru tidak perlu membaca seluruh riwayat file.
+    Size dan mtime file adalah nilai saat scan, perubahan isi file tidak mengubah mtime direktori
+    """
+
+    # mtime direktori yang terlalu dekat dengan waktu scan belum bisa dipercaya
+    # (file bisa dibuat di tick mtime yang sama setelah scan), scan diulang di pemanggilan berikutnya
+    racy_ns = 2 * 10**9
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        # {path: (mtime_ns direktori, jumlah entry, {filename: (size, mtime_ns)}, nomor data_N terbesar)}
+        self.directories = {}
+
+    def scan(self, path):
+        mtime_ns = os.stat(path).st_mtime_ns
+        scanned_ns = time.time_ns()
+
+        count, files, latest = 0, {}, None
+        with os.scandir(path) as entries:
+            for entry in entries:
+                count += 1
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+
+                match = DATA_FILE.fullmatch(entry.name)
+                if match and (latest is None or int(match[1]) > latest):
+                    latest = int(match[1])
+
+        if scanned_ns - mtime_ns < self.racy_ns:
+            mtime_ns = None
+        return mtime_ns, count, files, latest
+
+    def get(self, path):
+        path = str(path)
+        with self._lock:
+            item = self.directories.get(path)
+            if item is None or item[0] != os.stat(path).st_mtime_ns:
+                item = self.directories[path] = self.scan(path)
+            return item
+
+    def is_empty(self, path):
+        return self.get(path)[1] == 0
+
+    def lookup(self, path, file_name):
+        # (size, mtime_ns) atau None jika file tidak ada
+        return self.get(path)[2].get(file_name)
+
+    def latest_number(self, path):
+        # nomor data_N.csv terbesar di direktori, None jika belum ada
+        return self.get(path)[3]
+
+
+# index yang dipakai bersama oleh semua task di worker ini
+directory_index = DirectoryIndex()
 
 
 def check_directory(path_dummy_data):
     # Jika direktori kosong
-    if not any(path_dummy_data.iterdir()):
+    if directory_index.is_empty(path_dummy_data):
         message = (
             f"Sistem tidak menemukan file di lokasi berikut:\n"
             f"{path_dummy_data}\n\n"
             f"Silakan periksa apakah file sudah diunggah atau dipindahkan dengan benar.\n\n"
             f"Sistem Monitoring File"
         )
-        send_mail_task.delay("Tidak Ada File di Direktori", message)
+        notify("Tidak Ada File di Direktori", message)
         return False
 
     return True
 
 
+def file_number(file_name):
+    # "data_12.csv" > 12
+    return int(file_name.split("_")[1].split(".")[0])
+
+
 def get_file_name():
-    last_file = FileIntegrity.objects.last()
-    
+    # hanya nama file dan waktu dibuat yang dipakai, field json besar tidak dibaca
+    last_file = FileIntegrity.objects.only("filename", "created_at").last()
+
     # logic for get file
     if (
         last_file
@@ -29,8 +108,7 @@ def get_file_name():
         and localtime().hour >= 8
     ):
         # get new file
-        number = int(last_file.filename.split("_")[1].split(".")[0])
-        file_name = f"data_{number + 1}.csv"
+        file_name = f"data_{file_number(last_file.filename) + 1}.csv"
         is_new_file = True
     else:
         # get old file
@@ -42,14 +120,9 @@ def get_file_name():
 
 def find_file(path_dummy_data, file_name):
     # cek apakah file_name ada di direktori
-    return next(
-        (
-            item
-            for item in path_dummy_data.iterdir()
-            if item.is_file() and item.name == file_name
-        ),
-        None,
-    )
+    if directory_index.lookup(path_dummy_data, file_name) is None:
+        return None
+    return path_dummy_data / file_name
 
 
 def get_file_csv():
@@ -69,4 +142,25 @@ def get_file_csv():
         f"Silakan periksa apakah file sudah diunggah atau dipindahkan dengan benar.\n\n"
         f"Sistem Monitoring File"
     )
-    send_mail_task.delay("File Tidak Ditemukan di Direktori", message)
+    notify("File Tidak Ditemukan di Direktori", message)
+
+
+def get_files_csv():
+    # file yang akan diproses dalam 1 task
+    # jika file baru, file data_N+1.csv, data_N+2.csv, ... yang sudah ada ikut diproses (backlog)
+    file = get_file_csv()
+    if not file:
+        return []
+
+    files = [file]
+    if settings.PROCESS_BACKLOG and file["is_new_file"]:
+        path_dummy_data = file["file"].parent
+        latest = directory_index.latest_number(path_dummy_data)
+        for number in range(file_number(file["file_name"]) + 1, latest + 1):
+            file_name = f"data_{number}.csv"
+            match = find_file(path_dummy_data, file_name)
+            if not match:
+                break
+            files.append({"is_new_file": True, "file_name": file_name, "file": match})
+
+    return files
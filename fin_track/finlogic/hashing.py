@@ -0,0 +1,43 @@
+from django.conf import settings
+import hashlib
+import mmap
+
+# hexdigest semua algoritma 64 karakter agar muat di FileIntegrity.hash_data
+ALGORITHMS = {
+    "sha256": lambda: hashlib.sha256(),
+    "blake2b": lambda: hashlib.blake2b(digest_size=32),
+}
+# ukuran potongan file untuk mmap_digest
+CHUNK_SIZE = 1024 * 1024
+
+
+def new_hasher(algorithm=None):
+    # algorithm None > algoritma dari settings.FILE_HASH_ALGORITHM
+    algorithm = algorithm or settings.FILE_HASH_ALGORITHM
+    try:
+        return ALGORITHMS[algorithm]()
+    except KeyError:
+        raise ValueError(f"Algoritma hash tidak didukung: {algorithm}")
+
+
+def file_digest(path, algorithm=None):
+    # hash file dengan hashlib.file_digest (buffer besar, loop baca di C)
+    with open(path, "rb", buffering=0) as f:
+        return hashlib.file_digest(f, lambda: new_hasher(algorithm)).hexdigest()
+
+
+def mmap_digest(path, algorithm=None):
+    # hash file lewat mmap per CHUNK_SIZE tanpa salinan buffer di python
+    hasher = new_hasher(algorithm)
+    with open(path, "rb") as f:
+        # file kosong tidak bisa di mmap
+        if not f.seek(0, 2):
+            return hasher.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for start in range(0, len(mm), CHUNK_SIZE):
+                    hasher.update(view[start : start + CHUNK_SIZE])
+            finally:
+                view.release()
+    return hasher.hexdigest()
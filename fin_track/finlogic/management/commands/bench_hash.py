@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand
+from finlogic.hashing import ALGORITHMS, file_digest, mmap_digest, new_hasher
+from pathlib import Path
+import tempfile
+import time
+
+
+def legacy_digest(path, algorithm):
+    # cara lama, read 4 KB per panggilan python
+    hasher = new_hasher(algorithm)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(4096), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+METHODS = {
+    "read 4KB": legacy_digest,
+    "file_digest": file_digest,
+    "mmap": mmap_digest,
+}
+
+
+def write_dummy_csv(path, size_mb):
+    # baris csv berulang sampai ukuran file size_mb
+    row = b"2025-10-23,Makanan & Minuman,Cemilan,15000\n"
+    block = row * (1024 * 1024 // len(row))
+    with open(path, "wb") as f:
+        f.write(b"date,category,subcategory,price\n")
+        for _ in range(size_mb):
+            f.write(block)
+
+
+class Command(BaseCommand):
+    help = (
+        "Membandingkan throughput hash file (read 4KB, file_digest, mmap) per algoritma"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", help="file yang di hash, default file dummy")
+        parser.add_argument("--size-mb", type=int, default=128)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = options["path"]
+            if not path:
+                path = Path(tmpdir) / "data_1.csv"
+                write_dummy_csv(path, options["size_mb"])
+
+            size_mb = Path(path).stat().st_size / (1024 * 1024)
+            self.stdout.write(f"File {path} ({size_mb:.1f} MB)")
+
+            for algorithm in ALGORITHMS:
+                for name, digest in METHODS.items():
+                    # waktu terbaik dari beberapa kali percobaan
+                    best = min(
+                        self.measure(digest, path, algorithm)
+                        for _ in range(options["repeat"])
+                    )
+                    self.stdout.write(
+                        f"{algorithm:8} {name:12} {size_mb / best:10.1f} MB/s"
+                    )
+
+    def measure(self, digest, path, algorithm):
+        start = time.perf_counter()
+        digest(path, algorithm)
+        return time.perf_counter() - start
@@ -0,0 +1,107 @@
+from django.core.management.base import BaseCommand
+from finlogic.benchmarks import (
+    BENCHMARKS,
+    PipelineBenchmark,
+    backend_speedup,
+    compare_results,
+    generate_csv,
+)
+from pathlib import Path
+import json
+import platform
+import tempfile
+
+
+class Command(BaseCommand):
+    help = "Mengukur throughput dan peak memory tiap tahap pemrosesan file csv dengan data acak"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", help="file csv yang diproses, default file acak")
+        parser.add_argument("--size-mb", type=float, default=16)
+        parser.add_argument("--months", type=int, default=12)
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0,
+            help="latency tiap request google sheets palsu dalam detik",
+        )
+        parser.add_argument(
+            "--benchmark",
+            action="append",
+            choices=BENCHMARKS,
+            help="benchmark yang dijalankan (bisa lebih dari 1), default semua",
+        )
+        parser.add_argument("--output", help="simpan hasil ke file json")
+        parser.add_argument("--compare", help="file json hasil sebelumnya")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = options["path"]
+            generator = None
+            if not path:
+                path = Path(tmpdir) / "data_1.csv"
+                generator = {
+                    "size_mb": options["size_mb"],
+                    "months": options["months"],
+                    "categories": options["categories"],
+                    "seed": options["seed"],
+                }
+                generate_csv(path, **generator)
+
+            benchmark = PipelineBenchmark(path, latency=options["latency"])
+            self.stdout.write(
+                f"File {path} ({benchmark.bytes / (1024 * 1024):.1f} MB, {benchmark.rows} baris)"
+            )
+            results = benchmark.run(
+                options["benchmark"] or BENCHMARKS, options["repeat"]
+            )
+
+        for name, result in results.items():
+            mb_per_sec = result["mb_per_sec"]
+            self.stdout.write(
+                f"{name:16} {result['seconds'] * 1000:10.2f} ms"
+                f" {result['rows_per_sec']:14.0f} baris/s"
+                + (f" {mb_per_sec:8.1f} MB/s" if mb_per_sec else " " * 14)
+                + f" {result['peak_memory_bytes'] / (1024 * 1024):8.1f} MB peak"
+            )
+
+        api = results.get("end_to_end", {}).get("api")
+        if api:
+            self.stdout.write(
+                f"Request google sheets end_to_end: {sum(api['calls'].values())} request,"
+                f" {api['bytes_sent']} byte dikirim, {api['bytes_received']} byte diterima"
+            )
+
+        speedup = backend_speedup(results)
+        if speedup:
+            self.stdout.write(
+                f"Engine numpy {speedup:.2f}x kecepatan engine python (ingest)"
+            )
+
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                baseline = json.load(f)["benchmarks"]
+            for name, change in compare_results(results, baseline).items():
+                self.stdout.write(
+                    f"{name:16} {change:+.1%} dibanding {options['compare']}"
+                )
+
+        if options["output"]:
+            data = {
+                "file": {
+                    "path": None if generator else str(path),
+                    "bytes": benchmark.bytes,
+                    "rows": benchmark.rows,
+                    "generator": generator,
+                },
+                "python": platform.python_version(),
+                "repeat": options["repeat"],
+                "latency": options["latency"],
+                "benchmarks": results,
+            }
+            with open(options["output"], "w") as f:
+                json.dump(data, f, indent=2)
+            self.stdout.write(f"Hasil disimpan di {options['output']}")
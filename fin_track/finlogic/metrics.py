@@ -0,0 +1,292 @@
+from django.conf import settings
+from celery.signals import after_task_publish, task_failure, task_retry, task_success
+import logging
+import threading
+
+logger = logging.getLogger("fintrack")
+
+# batas bucket histogram durasi (detik)
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+# task email yang dihitung untuk panjang antrian email
+MAIL_TASKS = {
+    "finlogic.utils.send_mail_task",
+    "finlogic.tasks.send_notification_digest_task",
+}
+
+# counter RunStats > (metric, help)
+RUN_COUNTERS = {
+    "rows_read": ("fintrack_rows_read_total", "Baris data file yang dibaca"),
+    "rows_skipped": ("fintrack_rows_skipped_total", "Baris data dengan field kosong"),
+    "rows_appended": ("fintrack_rows_appended_total", "Baris baru di google sheets"),
+    "cells_updated": ("fintrack_cells_updated_total", "Sel google sheets yang diubah"),
+    "api_calls": ("fintrack_sheets_api_calls_total", "Request google sheets API"),
+    "api_errors": ("fintrack_sheets_api_errors_total", "Error google sheets API"),
+    "bytes_sent": ("fintrack_sheets_bytes_sent_total", "Byte request google sheets"),
+    "bytes_received": (
+        "fintrack_sheets_bytes_received_total",
+        "Byte response google sheets",
+    ),
+    "mirror_hits": ("fintrack_mirror_hits_total", "Worksheet dibaca dari mirror"),
+    "mirror_misses": ("fintrack_mirror_misses_total", "Worksheet di download ulang"),
+    "chunks_reused": ("fintrack_chunks_reused_total", "Chunk file yang dipakai ulang"),
+    "chunks_parsed": ("fintrack_chunks_parsed_total", "Chunk file yang di parsing"),
+    "stat_hits": ("fintrack_stat_hits_total", "File lama dengan stat tidak berubah"),
+    "stat_misses": ("fintrack_stat_misses_total", "File lama dengan stat berubah"),
+}
+
+# metric > (type, help), urutan sesuai urutan output
+METRICS = {
+    "fintrack_runs_total": ("counter", "Jumlah task pemrosesan file per outcome"),
+    "fintrack_task_duration_seconds": ("histogram", "Durasi task pemrosesan file"),
+    "fintrack_stage_duration_seconds": ("histogram", "Durasi tiap tahap pemrosesan"),
+    **{name: ("counter", help_text) for name, help_text in RUN_COUNTERS.values()},
+    "fintrack_emails_enqueued_total": ("counter", "Task email yang dikirim ke antrian"),
+    "fintrack_emails_sent_total": ("counter", "Email yang berhasil dikirim"),
+    "fintrack_emails_retried_total": ("counter", "Email yang dikirim ulang"),
+    "fintrack_emails_failed_total": ("counter", "Email yang gagal dikirim"),
+}
+
+# rasio cache > (metric, counter hit, counter miss, help)
+RATIOS = (
+    (
+        "fintrack_mirror_hit_ratio",
+        "fintrack_mirror_hits_total",
+        "fintrack_mirror_misses_total",
+        "Rasio worksheet yang dibaca dari mirror",
+    ),
+    (
+        "fintrack_chunk_reuse_ratio",
+        "fintrack_chunks_reused_total",
+        "fintrack_chunks_parsed_total",
+        "Rasio chunk file yang tidak di parsing ulang",
+    ),
+    (
+        "fintrack_stat_hit_ratio",
+        "fintrack_stat_hits_total",
+        "fintrack_stat_misses_total",
+        "Rasio file lama yang tidak dibaca ulang karena stat sama",
+    ),
+)
+
+
+def series(name, **labels):
+    # fintrack_runs_total{outcome="success"}
+    if not labels:
+        return name
+    return (
+        name + "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+    )
+
+
+def observe(updates, name, value, buckets=DURATION_BUCKETS, **labels):
+    # histogram disimpan sebagai counter bucket kumulatif, _sum dan _count
+    for bound in buckets:
+        if value <= bound:
+            key = series(f"{name}_bucket", **labels, le=format_value(bound))
+            updates[key] = updates.get(key, 0) + 1
+    for key, amount in (
+        (series(f"{name}_bucket", **labels, le="+Inf"), 1),
+        (series(f"{name}_sum", **labels), value),
+        (series(f"{name}_count", **labels), 1),
+    ):
+        updates[key] = updates.get(key, 0) + amount
+
+
+def format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class MemoryBackend:
+    # metric di memori proses, hanya berisi data dari proses yang sama
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def incr(self, updates):
+        with self.lock:
+            for key, amount in updates.items():
+                self.values[key] = self.values.get(key, 0) + amount
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.values)
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
+
+
+class RedisBackend:
+    # metric di 1 hash redis, semua worker celery menambah ke key yang sama
+    key = "fintrack:metrics"
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(
+            url, socket_timeout=0.5, socket_connect_timeout=0.5
+        )
+
+    def incr(self, updates):
+        pipe = self.client.pipeline(transaction=False)
+        for key, amount in updates.items():
+            pipe.hincrbyfloat(self.key, key, amount)
+        pipe.execute()
+
+    def snapshot(self):
+        return {
+            key.decode(): float(value)
+            for key, value in self.client.hgetall(self.key).items()
+        }
+
+    def clear(self):
+        self.client.delete(self.key)
+
+
+_backend = None
+_backend_key = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    # backend dibuat ulang jika settings berubah
+    global _backend, _backend_key
+    key = (settings.METRICS_BACKEND, settings.METRICS_REDIS_URL)
+    with _backend_lock:
+        if _backend is None or _backend_key != key:
+            if settings.METRICS_BACKEND == "redis":
+                _backend = RedisBackend(settings.METRICS_REDIS_URL)
+            else:
+                logger.warning(
+                    "Metric disimpan di memori proses, /metrics/ tidak berisi data worker celery. "
+                    "Isi METRICS_REDIS_URL atau pakai broker redis agar metric semua worker dijumlahkan"
+                )
+                _backend = MemoryBackend()
+            _backend_key = key
+        return _backend
+
+
+def incr(name, amount=1, **labels):
+    get_backend().incr({series(name, **labels): amount})
+
+
+def record_run(record):
+    # hook settings.RUN_STATS_HOOKS, record > dict hasil RunStats.as_dict
+    updates = {series("fintrack_runs_total", outcome=record["outcome"]): 1}
+    observe(
+        updates,
+        "fintrack_task_duration_seconds",
+        record["wall_time"],
+        outcome=record["outcome"],
+    )
+    for stage, times in record["stages"].items():
+        observe(updates, "fintrack_stage_duration_seconds", times["wall"], stage=stage)
+    for counter, value in record["counters"].items():
+        if counter in RUN_COUNTERS and value:
+            updates[RUN_COUNTERS[counter][0]] = value
+    get_backend().incr(updates)
+
+
+def metric_name(key):
+    # 'fintrack_task_duration_seconds_bucket{...}' > 'fintrack_task_duration_seconds'
+    name = key.split("{", 1)[0]
+    for suffix in ("_bucket", "_sum", "_count"):
+        base = name.removesuffix(suffix)
+        if base != name and METRICS.get(base, ("",))[0] == "histogram":
+            return base
+    return name
+
+
+def bucket_order(key):
+    # bucket diurutkan per label lalu batas le, +Inf paling akhir
+    labels, _, le = key.rpartition('le="')
+    le = le.rstrip('"}')
+    return labels, float("inf") if le == "+Inf" else float(le)
+
+
+def render():
+    """
+    Metric dalam format teks prometheus.
+    Hanya membaca backend metric (memori / 1 request redis), tidak membaca google sheets atau file csv
+    """
+    lines = []
+    try:
+        values = get_backend().snapshot()
+        up = 1
+    except Exception as e:
+        logger.warning("Backend metric tidak bisa dibaca: %s", e)
+        values, up = {}, 0
+
+    families = {}
+    for key, value in values.items():
+        families.setdefault(metric_name(key), []).append((key, value))
+
+    for name, (kind, help_text) in METRICS.items():
+        items = families.get(name)
+        if not items:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "histogram":
+            buckets = sorted(
+                (item for item in items if item[0].startswith(f"{name}_bucket")),
+                key=lambda item: bucket_order(item[0]),
+            )
+            others = sorted(item for item in items if item not in buckets)
+            items = buckets + others
+        else:
+            items = sorted(items)
+        lines.extend(f"{key} {format_value(value)}" for key, value in items)
+
+    for name, hits, misses, help_text in RATIOS:
+        hit, miss = values.get(hits, 0), values.get(misses, 0)
+        if hit + miss:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {format_value(round(hit / (hit + miss), 6))}")
+
+    # email di antrian > sudah dikirim ke broker tapi belum selesai / dijadwalkan ulang
+    depth = values.get("fintrack_emails_enqueued_total", 0) - sum(
+        values.get(f"fintrack_emails_{name}_total", 0)
+        for name in ("sent", "retried", "failed")
+    )
+    lines.append("# HELP fintrack_email_queue_depth Task email yang belum selesai")
+    lines.append("# TYPE fintrack_email_queue_depth gauge")
+    lines.append(f"fintrack_email_queue_depth {format_value(max(depth, 0))}")
+
+    lines.append("# HELP fintrack_metrics_backend_up Backend metric bisa dibaca")
+    lines.append("# TYPE fintrack_metrics_backend_up gauge")
+    lines.append(f"fintrack_metrics_backend_up {up}")
+    return "\n".join(lines) + "\n"
+
+
+def safe_incr(name):
+    # metric email tidak boleh membuat task gagal
+    try:
+        incr(name)
+    except Exception as e:
+        logger.warning("Metric %s gagal dicatat: %s", name, e)
+
+
+@after_task_publish.connect
+def count_mail_published(sender=None, **kwargs):
+    if sender in MAIL_TASKS:
+        safe_incr("fintrack_emails_enqueued_total")
+
+
+@task_success.connect
+def count_mail_sent(sender=None, **kwargs):
+    if getattr(sender, "name", None) in MAIL_TASKS:
+        safe_incr("fintrack_emails_sent_total")
+
+
+@task_retry.connect
+def count_mail_retried(sender=None, **kwargs):
+    if getattr(sender, "name", None) in MAIL_TASKS:
+        safe_incr("fintrack_emails_retried_total")
+
+
+@task_failure.connect
+def count_mail_failed(sender=None, **kwargs):
+    if getattr(sender, "name", None) in MAIL_TASKS:
+        safe_incr("fintrack_emails_failed_total")
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finlogic", "0004_fileintegrity_latest_monthly_expense_data"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorksheetMirror",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(editable=False)),
+                ("updated_at", models.DateTimeField(editable=False)),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("rows", models.JSONField(default=list)),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
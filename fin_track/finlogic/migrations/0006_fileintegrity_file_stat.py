@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finlogic", "0005_worksheetmirror"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fileintegrity",
+            name="file_inode",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="fileintegrity",
+            name="file_mtime_ns",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="fileintegrity",
+            name="file_size",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
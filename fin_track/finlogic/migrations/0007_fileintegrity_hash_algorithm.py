@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finlogic", "0006_fileintegrity_file_stat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fileintegrity",
+            name="hash_algorithm",
+            field=models.CharField(default="sha256", max_length=16),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finlogic", "0007_fileintegrity_hash_algorithm"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fileintegrity",
+            name="processed_dates",
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name="fileintegrity",
+            name="processed_offset",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="fileintegrity",
+            name="processed_rows",
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finlogic", "0008_fileintegrity_processed_offset"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fileintegrity",
+            name="processed_chunks",
+            field=models.JSONField(default=dict),
+        ),
+    ]
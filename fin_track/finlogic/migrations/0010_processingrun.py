@@ -0,0 +1,108 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finlogic", "0009_fileintegrity_processed_chunks"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProcessingRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(editable=False)),
+                ("updated_at", models.DateTimeField(editable=False)),
+                ("file_name", models.CharField(max_length=255)),
+                (
+                    "outcome",
+                    models.CharField(
+                        choices=[
+                            ("success", "Success"),
+                            ("unchanged", "Unchanged"),
+                            ("failed", "Failed"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("error_class", models.CharField(blank=True, max_length=100)),
+                ("started_at", models.DateTimeField()),
+                ("wall_time", models.FloatField(default=0)),
+                ("cpu_time", models.FloatField(default=0)),
+                ("stages", models.JSONField(default=dict)),
+                ("rows_read", models.IntegerField(default=0)),
+                ("rows_skipped", models.IntegerField(default=0)),
+                ("groups_category", models.IntegerField(default=0)),
+                ("groups_monthly", models.IntegerField(default=0)),
+                ("api_calls", models.IntegerField(default=0)),
+                ("api_errors", models.IntegerField(default=0)),
+                ("counters", models.JSONField(default=dict)),
+            ],
+            options={
+                "ordering": ["-started_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["started_at"], name="finlogic_pr_started_55ca16_idx"
+                    ),
+                    models.Index(
+                        fields=["outcome", "started_at"],
+                        name="finlogic_pr_outcome_7e19a9_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ProcessingRunDaily",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(editable=False)),
+                ("updated_at", models.DateTimeField(editable=False)),
+                ("day", models.DateField()),
+                (
+                    "outcome",
+                    models.CharField(
+                        choices=[
+                            ("success", "Success"),
+                            ("unchanged", "Unchanged"),
+                            ("failed", "Failed"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("runs", models.IntegerField(default=0)),
+                ("wall_time", models.FloatField(default=0)),
+                ("rows_read", models.BigIntegerField(default=0)),
+                ("rows_skipped", models.BigIntegerField(default=0)),
+                ("api_calls", models.BigIntegerField(default=0)),
+                ("api_errors", models.BigIntegerField(default=0)),
+                ("stages", models.JSONField(default=dict)),
+            ],
+            options={
+                "ordering": ["-day"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "outcome"), name="unique_processing_run_daily"
+                    )
+                ],
+            },
+        ),
+    ]
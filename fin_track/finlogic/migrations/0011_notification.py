@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finlogic", "0010_processingrun"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Notification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(editable=False)),
+                ("updated_at", models.DateTimeField(editable=False)),
+                ("recipient", models.EmailField(max_length=254)),
+                ("subject", models.CharField(max_length=255)),
+                ("message", models.TextField()),
+                ("dedupe_key", models.CharField(max_length=64)),
+                ("count", models.PositiveIntegerField(default=1)),
+                ("last_seen", models.DateTimeField()),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["dedupe_key", "created_at"],
+                        name="finlogic_no_dedupe__9a2e6b_idx",
+                    ),
+                    models.Index(
+                        fields=["sent_at", "recipient"],
+                        name="finlogic_no_sent_at_fb203e_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finlogic", "0011_notification"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="fileintegrity",
+            name="processed_chunks",
+        ),
+        migrations.CreateModel(
+            name="FileChunkState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(editable=False)),
+                ("updated_at", models.DateTimeField(editable=False)),
+                ("data", models.BinaryField()),
+                (
+                    "file",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chunk_state",
+                        to="finlogic.fileintegrity",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
@@ -1,17 +1,55 @@
 from django.db import models
 from core.models import BaseModel
 from django.core.exceptions import ValidationError
+import gspread
+import json
+import zlib
 
 
 # Create your models here.
 class FileIntegrity(BaseModel):
     filename = models.CharField(max_length=13, unique=True)  # max file: data_9999.csv
     hash_data = models.CharField(max_length=64)
+    # algoritma yang dipakai membuat hash_data, file lama tetap dibandingkan dengan algoritma yang sama
+    hash_algorithm = models.CharField(max_length=16, default="sha256")
     last_checked = models.DateTimeField()
     # menyimpan nilai terakhir hasil pemrosesan file bagian category expense
     latest_category_expense_data = models.JSONField(default=dict)
     # menyimpan nilai terakhir hasil pemrosesan file bagian monthly expense
     latest_monthly_expense_data = models.JSONField(default=dict)
+    # stat file saat hash dibuat, jika ketiganya sama file dianggap tidak berubah tanpa hash ulang
+    file_size = models.BigIntegerField(null=True, blank=True)
+    file_mtime_ns = models.BigIntegerField(null=True, blank=True)
+    file_inode = models.BigIntegerField(null=True, blank=True)
+    # posisi byte akhir file yang sudah diproses (hash_data adalah hash file sampai posisi ini),
+    # jumlah baris data dan tanggal per month sampai posisi ini. None > file harus diproses dari awal
+    processed_offset = models.BigIntegerField(null=True, blank=True)
+    processed_rows = models.IntegerField(default=0)
+    processed_dates = models.JSONField(default=dict)
+
+    def set_stat(self, stat):
+        self.file_size = stat.st_size
+        self.file_mtime_ns = stat.st_mtime_ns
+        self.file_inode = stat.st_ino
+
+    def same_stat(self, stat):
+        return (self.file_size, self.file_mtime_ns, self.file_inode) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+            stat.st_ino,
+        )
+
+    def load_chunks(self):
+        # chunk hasil pemrosesan sebelumnya, {} jika belum ada
+        try:
+            return self.chunk_state.state()
+        except FileChunkState.DoesNotExist:
+            return {}
+
+    def save_chunks(self, state):
+        FileChunkState.objects.update_or_create(
+            file=self, defaults={"data": FileChunkState.encode(state)}
+        )
 
     def clean(self):
         file = self.filename
@@ -24,3 +62,167 @@ class FileIntegrity(BaseModel):
                     "filename": "Nama file harus dimulai dengan 'data_' dan diakhiri '.csv'."
                 }
             )
+
+
+class FileChunkState(BaseModel):
+    # fingerprint dan total per chunk baris file > {"header": ..., "chunks": [...]}
+    # saat file berubah hanya chunk yang fingerprint-nya berbeda yang di parsing ulang.
+    # Disimpan terpisah dari FileIntegrity (json dikompres zlib) agar pengecekan stat / nama file
+    # tidak membaca data ini, hanya dibaca saat file di parsing
+    file = models.OneToOneField(
+        FileIntegrity, on_delete=models.CASCADE, related_name="chunk_state"
+    )
+    data = models.BinaryField()
+
+    @staticmethod
+    def encode(state):
+        return zlib.compress(json.dumps(state, separators=(",", ":")).encode())
+
+    def state(self):
+        return json.loads(zlib.decompress(self.data))
+
+
+class WorksheetMirror(BaseModel):
+    # salinan lokal isi worksheet google sheets agar tidak perlu download ulang setiap task
+    name = models.CharField(max_length=50, unique=True)
+    # baris data mulai dari baris ke-2 worksheet, index 0 = baris 2
+    rows = models.JSONField(default=list)
+
+    @property
+    def last_row_index(self):
+        # index baris terakhir di worksheet (baris 1 = header)
+        return len(self.rows) + 1
+
+    def filter_months(self, months):
+        # {row_index: row} untuk baris yang month-nya ada di months
+        return {
+            i: row
+            for i, row in enumerate(self.rows, start=2)
+            if row and row[0] in months
+        }
+
+    def apply_updates(self, rows_for_update):
+        # terapkan hasil worksheet.batch_update, contoh range "C5" atau "B5:D5"
+        for item in rows_for_update:
+            start = item["range"].split(":")[0]
+            row_index, col = gspread.utils.a1_to_rowcol(start)
+            row = self.rows[row_index - 2]
+            for offset, value in enumerate(item["values"][0]):
+                index = col - 1 + offset
+                row.extend([""] * (index + 1 - len(row)))
+                row[index] = value
+
+    def apply_appends(self, rows_for_append):
+        # terapkan hasil worksheet.append_rows, baris ditambah setelah baris terakhir
+        self.rows.extend([list(row) for row in rows_for_append])
+
+    def matches(self, key_values, key_count, ranges, values):
+        # bandingkan hasil probe worksheet dengan mirror
+        # key_values > kolom key (key_count kolom pertama) semua baris worksheet mulai baris ke-2
+        # ranges > [(start, end)] baris yang dibaca semua kolomnya, values > isi tiap range
+        keys = [normalize_row(row[:key_count]) for row in self.rows]
+        while keys and not keys[-1]:
+            keys.pop()
+        if [normalize_row(row) for row in key_values] != keys:
+            return False
+        for (start, end), rows in zip(ranges, values):
+            expected = [normalize_row(self.rows[i - 2]) for i in range(start, end + 1)]
+            actual = [normalize_row(row) for row in rows]
+            if actual + [[]] * (len(expected) - len(actual)) != expected:
+                return False
+        return True
+
+
+def normalize_row(row):
+    # nilai dari google sheets berupa string dan kolom kosong di akhir tidak dikirim
+    values = [str(value) for value in row]
+    while values and values[-1] == "":
+        values.pop()
+    return values
+
+
+class ProcessingRun(BaseModel):
+    # riwayat tiap task pemrosesan file (hasil RunStats), dipakai untuk melihat tren waktu saat file membesar
+    OUTCOMES = [
+        ("success", "Success"),
+        ("unchanged", "Unchanged"),
+        ("failed", "Failed"),
+    ]
+
+    # nama file, backlog > "data_2.csv, data_3.csv"
+    file_name = models.CharField(max_length=255)
+    outcome = models.CharField(max_length=16, choices=OUTCOMES)
+    # nama class exception jika task gagal
+    error_class = models.CharField(max_length=100, blank=True)
+    started_at = models.DateTimeField()
+    wall_time = models.FloatField(default=0)
+    cpu_time = models.FloatField(default=0)
+    # waktu per tahap > {stage: {"wall": detik, "cpu": detik}}
+    stages = models.JSONField(default=dict)
+    rows_read = models.IntegerField(default=0)
+    rows_skipped = models.IntegerField(default=0)
+    groups_category = models.IntegerField(default=0)
+    groups_monthly = models.IntegerField(default=0)
+    api_calls = models.IntegerField(default=0)
+    api_errors = models.IntegerField(default=0)
+    # semua counter RunStats termasuk yang tidak punya kolom sendiri
+    counters = models.JSONField(default=dict)
+
+    class Meta:
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["started_at"]),
+            models.Index(fields=["outcome", "started_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.file_name} ({self.outcome}) {self.started_at}"
+
+
+class ProcessingRunDaily(BaseModel):
+    # ringkasan harian ProcessingRun lama yang sudah dihapus oleh retention
+    day = models.DateField()
+    outcome = models.CharField(max_length=16, choices=ProcessingRun.OUTCOMES)
+    runs = models.IntegerField(default=0)
+    wall_time = models.FloatField(default=0)
+    rows_read = models.BigIntegerField(default=0)
+    rows_skipped = models.BigIntegerField(default=0)
+    api_calls = models.BigIntegerField(default=0)
+    api_errors = models.BigIntegerField(default=0)
+    # persentil waktu wall per tahap > {stage: {"p50": detik, "p95": detik}}
+    stages = models.JSONField(default=dict)
+
+    class Meta:
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "outcome"], name="unique_processing_run_daily"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.day} ({self.outcome})"
+
+
+class Notification(BaseModel):
+    # email non-kritis (outbox), dikirim sebagai ringkasan per penerima oleh send_notification_digest_task
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    # sha256 penerima + subject + pesan, pesan yang sama di dalam window digabung
+    dedupe_key = models.CharField(max_length=64)
+    # jumlah pesan sama yang digabung ke notifikasi ini
+    count = models.PositiveIntegerField(default=1)
+    last_seen = models.DateTimeField()
+    # None > belum dikirim
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["dedupe_key", "created_at"]),
+            models.Index(fields=["sent_at", "recipient"]),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient} - {self.subject}"
@@ -0,0 +1,110 @@
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils.timezone import localtime, now
+from datetime import timedelta
+from .models import Notification
+from .utils import send_mail_task
+import hashlib
+import logging
+
+logger = logging.getLogger("fintrack")
+
+
+def dedupe_key(recipient, subject, message):
+    return hashlib.new(
+        "sha256", "\0".join((recipient, subject, message)).encode("utf-8")
+    ).hexdigest()
+
+
+def notify(subject, message, critical=False):
+    """
+    Kirim notifikasi email.
+    critical > langsung dikirim lewat send_mail_task (retry sama seperti sebelumnya),
+    selain itu disimpan di outbox (Notification) dan dikirim sebagai ringkasan oleh send_notification_digest_task.
+    Pesan yang sama untuk penerima yang sama yang belum terkirim dan dibuat di dalam NOTIFICATION_DEDUPE_WINDOW
+    digabung jadi 1 baris (count bertambah), pesan yang sama setelah digest terkirim dikirim lagi di digest berikutnya
+    """
+    if critical or not settings.NOTIFICATION_DIGEST:
+        send_mail_task.delay(subject, message)
+        return
+
+    current = now()
+    window_start = current - timedelta(seconds=settings.NOTIFICATION_DEDUPE_WINDOW)
+    with transaction.atomic():
+        for recipient in settings.TARGETS_EMAIL:
+            key = dedupe_key(recipient, subject, message)
+            # notifikasi yang sudah terkirim tidak digabung, pesan baru dikirim di digest berikutnya
+            merged = Notification.objects.filter(
+                dedupe_key=key, created_at__gte=window_start, sent_at__isnull=True
+            ).update(count=F("count") + 1, last_seen=current, updated_at=current)
+            if merged:
+                logger.debug(
+                    "Notifikasi '%s' sama dengan notifikasi sebelumnya", subject
+                )
+                continue
+            Notification.objects.create(
+                recipient=recipient,
+                subject=subject,
+                message=message,
+                dedupe_key=key,
+                last_seen=current,
+            )
+
+
+def digest_email(recipient, notifications):
+    # 1 notifikasi > subject dan pesan asli, lebih dari 1 > digabung dalam 1 email
+    if len(notifications) == 1 and notifications[0].count == 1:
+        (notification,) = notifications
+        return EmailMessage(
+            notification.subject,
+            notification.message,
+            settings.SENDER_EMAIL,
+            [recipient],
+        )
+
+    sections = []
+    for notification in notifications:
+        title = notification.subject
+        if notification.count > 1:
+            title += f" ({notification.count}x, terakhir {localtime(notification.last_seen):%Y-%m-%d %H:%M})"
+        sections.append(f"== {title} ==\n{notification.message}")
+    return EmailMessage(
+        f"Ringkasan Notifikasi Sistem Monitoring File ({len(notifications)} pesan)",
+        "\n\n".join(sections),
+        settings.SENDER_EMAIL,
+        [recipient],
+    )
+
+
+def send_digest():
+    """
+    Kirim semua notifikasi yang belum dikirim, 1 email per penerima melalui 1 koneksi SMTP.
+    Notifikasi ditandai terkirim per penerima, jika koneksi gagal di tengah hanya penerima
+    yang belum terkirim yang dikirim ulang saat retry
+    """
+    by_recipient = {}
+    for notification in Notification.objects.filter(sent_at__isnull=True):
+        by_recipient.setdefault(notification.recipient, []).append(notification)
+    if not by_recipient:
+        return 0
+
+    with get_connection() as connection:
+        for recipient, notifications in by_recipient.items():
+            connection.send_messages([digest_email(recipient, notifications)])
+            Notification.objects.filter(
+                pk__in=[notification.pk for notification in notifications]
+            ).update(sent_at=now())
+
+    logger.info("Ringkasan notifikasi dikirim ke %s penerima", len(by_recipient))
+    return len(by_recipient)
+
+
+def cleanup_notifications():
+    # notifikasi terkirim yang lebih lama dari NOTIFICATION_RETENTION_DAYS dihapus
+    before = now() - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+    deleted, _ = Notification.objects.filter(
+        sent_at__isnull=False, created_at__lt=before
+    ).delete()
+    return deleted
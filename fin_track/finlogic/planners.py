@@ -0,0 +1,122 @@
+def average(total, days_count):
+    try:
+        return int(total / days_count)
+    except ZeroDivisionError:
+        return 0
+
+
+def category_totals(grouped_data_category):
+    # {month: {category: total}} > {"month|category": total}
+    return {
+        f"{month}|{category}": total
+        for month, categories_in_month in grouped_data_category.items()
+        for category, total in categories_in_month.items()
+    }
+
+
+def monthly_totals(grouped_monthly_data):
+    # {month: {date: total}} > {month: {"total_new": ..., "days_count_new": ...}}
+    return {
+        month: {"total_new": sum(dates.values()), "days_count_new": len(dates)}
+        for month, dates in grouped_monthly_data.items()
+    }
+
+
+def merge_category_totals(items):
+    # gabungkan total category beberapa file, total key yang sama dijumlahkan
+    merged = {}
+    for totals in items:
+        for key, total in totals.items():
+            merged[key] = merged.get(key, 0) + total
+    return merged
+
+
+def merge_monthly_totals(items):
+    # gabungkan total monthly beberapa file, total dan days_count dijumlahkan per file
+    # sama seperti jika file diproses satu per satu
+    merged = {}
+    for totals in items:
+        for month, values in totals.items():
+            item = merged.setdefault(month, {"total_new": 0, "days_count_new": 0})
+            item["total_new"] += values["total_new"]
+            item["days_count_new"] += values["days_count_new"]
+    return merged
+
+
+def plan_category_expense(lookup, latest_data, previous_data=None):
+    """
+    Membuat rencana perubahan worksheet Category Expense dari selisih (delta) per key.
+    lookup > {(month, category): [row_index, total_expense]} dari worksheet
+    latest_data > {"month|category": total} hasil pemrosesan file sekarang
+    previous_data > {"month|category": total} hasil pemrosesan file sebelumnya (latest_category_expense_data)
+    Hanya key yang nilainya berubah yang masuk ke rows_for_update / rows_for_append
+    """
+    previous_data = previous_data or {}
+    rows_for_update, rows_for_append = [], []
+
+    def plan(name, total_new, delta):
+        if not delta:
+            return
+        # month|category > (month, category)
+        key = tuple(name.split("|", 1))
+        if key in lookup:
+            row_index, total_old = lookup[key]
+            rows_for_update.append(
+                {"range": f"C{row_index}", "values": [[total_old + delta]]}
+            )
+        elif total_new:  # kalo key tak ditemukan berarti data baru
+            rows_for_append.append([*key, total_new])
+
+    for name, total_new in latest_data.items():
+        plan(name, total_new, total_new - previous_data.get(name, 0))
+
+    # key yang ada di file sebelumnya tapi tidak ada lagi di file sekarang
+    for name, total_old in previous_data.items():
+        if name not in latest_data:
+            plan(name, 0, -total_old)
+
+    return rows_for_update, rows_for_append
+
+
+def plan_monthly_expense(lookup, latest_data, previous_data=None):
+    """
+    Membuat rencana perubahan worksheet Monthly Expense dari selisih (delta) per month.
+    lookup > {month: [row_index, total_expense, days_count]} dari worksheet
+    latest_data > {month: {"total_new": ..., "days_count_new": ...}} hasil pemrosesan file sekarang
+    previous_data > format sama dengan latest_data, hasil pemrosesan file sebelumnya (latest_monthly_expense_data)
+    Hanya month yang total atau days_count-nya berubah yang masuk ke rows_for_update / rows_for_append
+    """
+    previous_data = previous_data or {}
+    rows_for_update, rows_for_append = [], []
+
+    def plan(month, total_new, days_count_new):
+        previous = previous_data.get(month, {})
+        delta_total = total_new - previous.get("total_new", 0)
+        delta_days_count = days_count_new - previous.get("days_count_new", 0)
+        if not delta_total and not delta_days_count:
+            return
+
+        if month in lookup:
+            row_index, total_old, days_count_old = lookup[month]
+            total = total_old + delta_total
+            days_count = days_count_old + delta_days_count
+            rows_for_update.append(
+                {
+                    "range": f"B{row_index}:D{row_index}",
+                    "values": [[total, average(total, days_count), days_count]],
+                }
+            )
+        elif days_count_new:
+            rows_for_append.append(
+                [month, total_new, average(total_new, days_count_new), days_count_new]
+            )
+
+    for month, values in latest_data.items():
+        plan(month, values["total_new"], values["days_count_new"])
+
+    # month yang ada di file sebelumnya tapi tidak ada lagi di file sekarang
+    for month in previous_data:
+        if month not in latest_data:
+            plan(month, 0, 0)
+
+    return rows_for_update, rows_for_append
@@ -0,0 +1,182 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import ProcessingRun, ProcessingRunDaily
+from datetime import timedelta
+import logging
+import math
+
+logger = logging.getLogger("fintrack")
+
+# counter RunStats yang disimpan sebagai kolom ProcessingRun
+COUNTER_FIELDS = (
+    "rows_read",
+    "rows_skipped",
+    "groups_category",
+    "groups_monthly",
+    "api_calls",
+    "api_errors",
+)
+# counter yang ikut dijumlahkan di ProcessingRunDaily
+DAILY_FIELDS = ("rows_read", "rows_skipped", "api_calls", "api_errors")
+
+
+def save_run(record):
+    # hook settings.RUN_STATS_HOOKS, record > dict hasil RunStats.as_dict
+    counters = record["counters"]
+    return ProcessingRun.objects.create(
+        file_name=record["file_name"][:255],
+        outcome=record["outcome"],
+        error_class=record["error"] or "",
+        started_at=parse_datetime(record["started_at"]),
+        wall_time=record["wall_time"],
+        cpu_time=record["cpu_time"],
+        stages=record["stages"],
+        counters=counters,
+        **{field: counters.get(field, 0) for field in COUNTER_FIELDS},
+    )
+
+
+def percentile(values, q):
+    # persentil nearest-rank, values sudah diurutkan
+    if not values:
+        return None
+    return values[max(math.ceil(q / 100 * len(values)) - 1, 0)]
+
+
+def stage_percentiles(stages_list):
+    # [{stage: {"wall": ...}}] > {stage: {"p50": ..., "p95": ...}}
+    walls = {}
+    for stages in stages_list:
+        for name, stage in stages.items():
+            walls.setdefault(name, []).append(stage["wall"])
+    result = {}
+    for name, values in walls.items():
+        values.sort()
+        result[name] = {"p50": percentile(values, 50), "p95": percentile(values, 95)}
+    return result
+
+
+def weighted_percentiles(items):
+    # gabungan persentil beberapa ringkasan [(runs, {stage: {"p50", "p95"}})],
+    # didekati dengan rata-rata berbobot jumlah run
+    totals = {}
+    for runs, stages in items:
+        for name, stage in stages.items():
+            total = totals.setdefault(name, {"runs": 0, "p50": 0.0, "p95": 0.0})
+            total["runs"] += runs
+            total["p50"] += stage["p50"] * runs
+            total["p95"] += stage["p95"] * runs
+    return {
+        name: {
+            "p50": total["p50"] / total["runs"],
+            "p95": total["p95"] / total["runs"],
+        }
+        for name, total in totals.items()
+        if total["runs"]
+    }
+
+
+def daily_stage_stats(since):
+    """
+    Persentil waktu tiap tahap per hari sejak since > [{"day", "runs", "stages": {stage: {"p50", "p95"}}}]
+    Hari yang run-nya sudah diringkas memakai ProcessingRunDaily
+    """
+    days = {}
+    runs = (
+        ProcessingRun.objects.filter(started_at__gte=since)
+        .order_by("started_at")
+        .values_list("started_at", "stages")
+    )
+    for started_at, stages in runs.iterator(chunk_size=2000):
+        days.setdefault(timezone.localdate(started_at), []).append(stages)
+    result = {
+        day: {"day": day, "runs": len(items), "stages": stage_percentiles(items)}
+        for day, items in days.items()
+    }
+
+    rolled_up = {}
+    for daily in ProcessingRunDaily.objects.filter(day__gte=timezone.localdate(since)):
+        if daily.day not in result:
+            rolled_up.setdefault(daily.day, []).append((daily.runs, daily.stages))
+    for day, items in rolled_up.items():
+        result[day] = {
+            "day": day,
+            "runs": sum(runs for runs, _ in items),
+            "stages": weighted_percentiles(items),
+        }
+    return [result[day] for day in sorted(result)]
+
+
+def rollup_runs(before):
+    """
+    Ringkas ProcessingRun sebelum before menjadi ProcessingRunDaily per (hari, outcome) lalu hapus sekaligus.
+    Ringkasan hari yang sudah ada digabung dengan run yang baru diringkas
+    """
+    runs = ProcessingRun.objects.filter(started_at__lt=before)
+    groups = {}
+    fields = ("started_at", "outcome", "wall_time", "stages", *COUNTER_FIELDS)
+    for row in runs.order_by("started_at").values(*fields).iterator(chunk_size=2000):
+        key = (timezone.localdate(row["started_at"]), row["outcome"])
+        group = groups.setdefault(
+            key,
+            {
+                "runs": 0,
+                "wall_time": 0.0,
+                "stages": [],
+                **dict.fromkeys(COUNTER_FIELDS, 0),
+            },
+        )
+        group["runs"] += 1
+        group["wall_time"] += row["wall_time"]
+        group["stages"].append(row["stages"])
+        for field in COUNTER_FIELDS:
+            group[field] += row[field]
+
+    with transaction.atomic():
+        existing = {
+            (daily.day, daily.outcome): daily
+            for daily in ProcessingRunDaily.objects.filter(
+                day__in={day for day, _ in groups}
+            )
+        }
+        created, updated = [], []
+        timestamp = timezone.now()
+        for (day, outcome), group in groups.items():
+            stages = stage_percentiles(group["stages"])
+            daily = existing.get((day, outcome))
+            if daily is None:
+                # bulk_create tidak memanggil BaseModel.save
+                daily = ProcessingRunDaily(
+                    day=day, outcome=outcome, created_at=timestamp, stages=stages
+                )
+                created.append(daily)
+            else:
+                daily.stages = weighted_percentiles(
+                    [(daily.runs, daily.stages), (group["runs"], stages)]
+                )
+                updated.append(daily)
+            daily.updated_at = timestamp
+            daily.runs += group["runs"]
+            daily.wall_time += group["wall_time"]
+            for field in DAILY_FIELDS:
+                setattr(daily, field, getattr(daily, field) + group[field])
+
+        ProcessingRunDaily.objects.bulk_create(created)
+        ProcessingRunDaily.objects.bulk_update(
+            updated, ["runs", "wall_time", "stages", "updated_at", *DAILY_FIELDS]
+        )
+        deleted, _ = runs.delete()
+    return deleted
+
+
+def cleanup_runs():
+    # hapus (atau ringkas dulu) ProcessingRun yang lebih lama dari PROCESSING_RUN_RETENTION_DAYS
+    before = timezone.now() - timedelta(days=settings.PROCESSING_RUN_RETENTION_DAYS)
+    if settings.PROCESSING_RUN_ROLLUP:
+        deleted = rollup_runs(before)
+    else:
+        deleted, _ = ProcessingRun.objects.filter(started_at__lt=before).delete()
+    logger.info("%s riwayat pemrosesan sebelum %s dihapus", deleted, before.date())
+    return deleted
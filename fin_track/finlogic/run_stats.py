@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+from collections import Counter
+from contextlib import contextmanager
+import json
+import logging
+import time
+
+logger = logging.getLogger("fintrack")
+
+# tahap pemrosesan file, urutan sesuai urutan di task
+STAGES = (
+    "credential_load",
+    "hash",
+    "parse",
+    "worksheet_fetch",
+    "diff_planning",
+    "sheet_write",
+    "db_save",
+    "email_enqueue",
+)
+
+
+def payload_size(payload):
+    # perkiraan byte request / response json yang dikirim lewat jaringan
+    if payload is None:
+        return 0
+    return len(json.dumps(payload, separators=(",", ":"), default=str))
+
+
+class RunStats:
+    """
+    Waktu (wall dan cpu) tiap tahap dan counter 1 kali pemrosesan file.
+    Hasilnya ditulis ke logger fintrack sebagai 1 record per task lalu dikirim ke semua hook
+    di settings.RUN_STATS_HOOKS
+    """
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        # {stage: {"wall": detik, "cpu": detik}}
+        self.stages = {}
+        # rows_read, rows_skipped, groups_category, cells_updated, api_calls, bytes_sent, ...
+        self.counters = Counter()
+        self.outcome = None
+        self.error = None
+        self.started_at = now()
+        self.started = time.perf_counter()
+        self.started_cpu = time.process_time()
+
+    @contextmanager
+    def stage(self, name):
+        # waktu tahap yang sama dijumlahkan jika dipanggil lebih dari 1 kali
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    def add(self, name, wall, cpu=0.0):
+        stage = self.stages.setdefault(name, {"wall": 0.0, "cpu": 0.0})
+        stage["wall"] += wall
+        stage["cpu"] += cpu
+
+    def split(self, source, name, wall, cpu=0.0):
+        # pindahkan sebagian waktu source ke tahap name (misal hash yang dihitung di dalam parsing)
+        stage = self.stages.get(source, {"wall": 0.0, "cpu": 0.0})
+        wall, cpu = min(wall, stage["wall"]), min(cpu, stage["cpu"])
+        self.add(source, -wall, -cpu)
+        self.add(name, wall, cpu)
+
+    def count(self, name, value=1):
+        self.counters[name] += value
+
+    def count_request(self, request=None, response=None):
+        self.counters["api_calls"] += 1
+        self.counters["bytes_sent"] += payload_size(request)
+        self.counters["bytes_received"] += payload_size(response)
+
+    def as_dict(self):
+        return {
+            "type": "run_stats",
+            "file_name": self.file_name,
+            "outcome": self.outcome,
+            "error": type(self.error).__name__ if self.error is not None else None,
+            "started_at": self.started_at.isoformat(),
+            "wall_time": round(time.perf_counter() - self.started, 6),
+            "cpu_time": round(time.process_time() - self.started_cpu, 6),
+            "stages": {
+                name: {key: round(value, 6) for key, value in self.stages[name].items()}
+                for name in sorted(self.stages, key=stage_order)
+            },
+            "counters": dict(self.counters),
+        }
+
+    def finish(self, outcome, error=None):
+        # outcome > "success", "unchanged" atau "failed"
+        self.outcome, self.error = outcome, error
+        record = self.as_dict()
+        logger.info(record)
+        for hook in run_stats_hooks():
+            try:
+                hook(record)
+            except Exception as e:
+                logger.exception("Hook statistik pemrosesan gagal dijalankan: %s", e)
+        return record
+
+
+def stage_order(name):
+    return STAGES.index(name) if name in STAGES else len(STAGES)
+
+
+def run_stats_hooks():
+    # settings.RUN_STATS_HOOKS > ["module.fungsi"], fungsi menerima dict hasil RunStats.as_dict
+    return [
+        hook if callable(hook) else import_string(hook)
+        for hook in getattr(settings, "RUN_STATS_HOOKS", [])
+    ]
@@ -1,25 +1,63 @@
 from celery import shared_task
 from django.core.mail import send_mail
 from django.utils.timezone import now
-from .file_readers import get_file_csv
-from .file_processors import ProcessFile
-from .utils import send_mail_task
+from smtplib import SMTPException
+from .file_readers import get_files_csv
+from .file_processors import ProcessFile, ProcessBacklog
+from .notifications import cleanup_notifications, notify, send_digest
+from .run_stats import RunStats
+from .run_history import cleanup_runs
 
 
 @shared_task
 def check_and_process_file_task():
-    file = get_file_csv()
+    files = get_files_csv()
+    if not files:
+        return
+    file_name = ", ".join(file["file_name"] for file in files)
+    # waktu tiap tahap dan counter, ditulis ke log sebagai 1 record di akhir task
+    stats = RunStats(file_name)
 
     try:
-        obj = ProcessFile(file)
+        # lebih dari 1 file baru > backlog diproses sekaligus
+        obj = (
+            ProcessBacklog(files, stats=stats)
+            if len(files) > 1
+            else ProcessFile(files[0], stats=stats)
+        )
         if obj.check_changes_data_file():
             obj.group_file_data()
-            obj.process_file_category_expense()
-            obj.process_file_monthly_expense()
-            obj.change_data_model()
-            obj.send_email_success()
+            obj.process_sheets()
+            with stats.stage("db_save"):
+                obj.change_data_model()
+            with stats.stage("email_enqueue"):
+                obj.send_email_success()
+            stats.finish("success")
+        else:
+            stats.finish("unchanged")
     except Exception as e:
-        send_mail_task(
-            "Gagal Memproses File CSV",
-            f"Terjadi kesalahan saat menjalankan task pengecekan dan pemrosesan file {file['file_name']}. Silakan periksa log untuk detail error.",
-        )
+        # kegagalan tidak masuk ringkasan, langsung dikirim
+        with stats.stage("email_enqueue"):
+            notify(
+                "Gagal Memproses File CSV",
+                f"Terjadi kesalahan saat menjalankan task pengecekan dan pemrosesan file {file_name}. Silakan periksa log untuk detail error.",
+                critical=True,
+            )
+        stats.finish("failed", e)
+
+
+@shared_task
+def cleanup_processing_runs_task():
+    # retention riwayat pemrosesan (ProcessingRun), dijalankan 1 kali sehari
+    return cleanup_runs()
+
+
+@shared_task(bind=True, max_retries=5)
+def send_notification_digest_task(self):
+    # ringkasan notifikasi di outbox, retry sama seperti send_mail_task
+    try:
+        sent = send_digest()
+    except SMTPException as exc:
+        raise self.retry(exc=exc, countdown=60)
+    cleanup_notifications()
+    return sent
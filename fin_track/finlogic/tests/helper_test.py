@@ -1,5 +1,5 @@
 import csv
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from pathlib import Path
 
 
@@ -37,3 +37,110 @@ def generate_fake_hash(mock_sha256):
     mock_hash = MagicMock()
     mock_hash.hexdigest.return_value = "fakehash123"
     mock_sha256.return_value = mock_hash
+
+
+def fake_batch_get(values):
+    """
+    Tiruan worksheet.batch_get yang membaca dari list values (seperti hasil get_all_values)
+    values bisa diubah di test dan hasil batch_get ikut berubah
+    """
+
+    def batch_get(ranges, **kwargs):
+        result = []
+        for name in ranges:
+            start, _, end = name.partition(":")
+            (row_start, col_start), (row_end, col_end) = (
+                split_a1(start),
+                split_a1(end or start),
+            )
+            rows = [
+                list(row[col_start - 1 : col_end])
+                for row in values[row_start - 1 : row_end or len(values)]
+            ]
+            # sama seperti google sheets, baris kosong di akhir tidak dikirim
+            while rows and not rows[-1]:
+                rows.pop()
+            result.append(rows)
+        return result
+
+    return batch_get
+
+
+def split_a1(label):
+    # "C5" > (5, 3), "B" > (None, 2)
+    letters = label.rstrip("0123456789")
+    digits = label[len(letters) :]
+    col = 0
+    for char in letters:
+        col = col * 26 + ord(char) - 64
+    return (int(digits) if digits else None), col
+
+
+def set_fake_values(fake_sh, fake_ws, values):
+    """
+    Spreadsheet dan worksheet palsu membaca dari list values (seperti hasil get_all_values)
+    setiap baca mengembalikan salinan baru seperti google sheets, tulis tidak mengubah values
+    """
+    fake_ws.row_count = 1000
+    fake_ws.get_all_values.side_effect = lambda *args, **kwargs: [
+        list(row) for row in values
+    ]
+
+    def values_batch_get(ranges, params=None):
+        # "'Category Expense'!A1:C1" > "A1:C1"
+        names = [item.rpartition("!") for item in ranges]
+        result = fake_batch_get(values)([item for _, _, item in names])
+        return {
+            "valueRanges": [
+                {"range": item, "values": rows} if rows else {"range": item}
+                for item, rows in zip(ranges, result)
+            ]
+        }
+
+    fake_sh.values_batch_get.side_effect = values_batch_get
+
+
+def sheets_batch_get(sheets):
+    """
+    Tiruan spreadsheet.values_batch_get yang membaca dari sheets > {name: values}
+    sheets bisa diubah di test dan hasil values_batch_get ikut berubah
+    """
+
+    def values_batch_get(ranges, params=None):
+        # "'Category Expense'!A1:C1" > baca dari sheets["Category Expense"]
+        value_ranges = []
+        for item in ranges:
+            name, _, a1 = item.rpartition("!")
+            (values,) = fake_batch_get(sheets[name.strip("'")])([a1])
+            value_ranges.append({"range": item, "values": values})
+        return {"valueRanges": value_ranges}
+
+    return values_batch_get
+
+
+def patch_sheets(testcase, sheets):
+    """
+    Patch gspread.authorize selama test, spreadsheet palsu membaca dari sheets lewat sheets_batch_get.
+    Hasil > (fake_sh, fake_ws), semua worksheet memakai fake_ws yang sama
+    """
+    fake_gc = MagicMock()
+    fake_sh = MagicMock()
+    fake_ws = MagicMock()
+    fake_ws.row_count = 1000
+    fake_gc.open_by_key.return_value = fake_sh
+    fake_sh.worksheet.return_value = fake_ws
+    fake_sh.values_batch_get.side_effect = sheets_batch_get(sheets)
+    testcase.enterContext(
+        patch("finlogic.file_processors.gspread.authorize", return_value=fake_gc)
+    )
+    return fake_sh, fake_ws
+
+
+def logged_messages(mock_method):
+    """
+    Pesan log yang sudah diformat (msg % args) dari mock method logger, misal mock_logger.info
+    """
+    return [
+        call.args[0] % call.args[1:] if len(call.args) > 1 else call.args[0]
+        for call in mock_method.call_args_list
+    ]
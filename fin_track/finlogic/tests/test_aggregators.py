@@ -0,0 +1,517 @@
+from django.test import SimpleTestCase
+from unittest import skipUnless
+import io
+import hashlib
+import tempfile
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+from concurrent.futures import Future, ProcessPoolExecutor
+from finlogic.aggregators import (
+    ChunkedAggregator,
+    CsvAggregator,
+    NumpyAggregator,
+    get_aggregator,
+    ingest_file,
+    ingest_tail,
+    np,
+)
+
+
+class TestCsvAggregator(SimpleTestCase):
+    def feed(self, text):
+        self.missing = []
+        aggregator = CsvAggregator(
+            on_missing=lambda i, fields, row: self.missing.append((i, fields, row))
+        )
+        return aggregator.feed(io.StringIO(text))
+
+    def test_group_total_and_count(self):
+        aggregator = self.feed(
+            "date,category,subcategory,price\n"
+            "2025-10-23,Makanan & Minuman,Cemilan,5000\n"
+            "2025-10-23,Transportasi,Tiket Umum,10000\n"
+            "2025-10-24,Makanan & Minuman,Minuman,3000\n"
+            "2025-11-01,Transportasi,Bensin,20000\n"
+        )
+
+        self.assertEqual(
+            aggregator.grouped_data_category,
+            {
+                "2025-10": {"Makanan & Minuman": 8000, "Transportasi": 10000},
+                "2025-11": {"Transportasi": 20000},
+            },
+        )
+        self.assertEqual(
+            aggregator.grouped_monthly_data,
+            {
+                "2025-10": {"2025-10-23": 15000, "2025-10-24": 3000},
+                "2025-11": {"2025-11-01": 20000},
+            },
+        )
+        self.assertEqual(
+            aggregator.category_counts[("2025-10", "Makanan & Minuman")], 2
+        )
+        self.assertEqual(aggregator.monthly_counts[("2025-10", "2025-10-23")], 2)
+        self.assertEqual(aggregator.rows, 4)
+        self.assertEqual(aggregator.skipped, 0)
+
+    def test_column_order_from_header(self):
+        aggregator = self.feed(
+            "price,subcategory,category,date\n" "5000,Cemilan,Makanan,2025-10-23\n"
+        )
+
+        self.assertEqual(
+            aggregator.grouped_data_category, {"2025-10": {"Makanan": 5000}}
+        )
+
+    def test_skip_missing_fields(self):
+        aggregator = self.feed(
+            "date,category,subcategory,price\n"
+            "2025-10-23,Makanan & Minuman,Cemilan,5000\n"
+            ",Makanan & Minuman,,10000\n"
+            "2025-10-23,Transportasi\n"
+            "\n"
+            "2025-10-23,Transportasi,Tiket Umum,10000,\n"
+        )
+
+        # baris kosong tidak dihitung, kolom tambahan di luar header diabaikan
+        self.assertEqual(
+            self.missing,
+            [
+                (2, ["date", "subcategory"], ["", "Makanan & Minuman", "", "10000"]),
+                (3, ["subcategory", "price"], ["2025-10-23", "Transportasi"]),
+            ],
+        )
+        self.assertEqual(
+            aggregator.grouped_data_category,
+            {"2025-10": {"Makanan & Minuman": 5000, "Transportasi": 10000}},
+        )
+        self.assertEqual(aggregator.rows, 4)
+        self.assertEqual(aggregator.skipped, 2)
+
+    def test_empty_file(self):
+        aggregator = self.feed("")
+
+        self.assertEqual(aggregator.grouped_data_category, {})
+        self.assertEqual(aggregator.grouped_monthly_data, {})
+
+
+class TestIngestFile(SimpleTestCase):
+    def ingest(self, data):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "data_1.csv"
+            path.write_bytes(data)
+            hasher = hashlib.sha256()
+            aggregator = ingest_file(path, hasher)
+        return hasher.hexdigest(), aggregator
+
+    def test_hash_and_group_in_one_read(self):
+        data = (
+            "date,category,subcategory,price\r\n"
+            '2025-10-23,"Makanan\r\nMinuman",Cemilan,5000\r\n'
+            "2025-10-23,Transportasi,Tiket Umum,10000\r\n"
+        ).encode()
+
+        # buffer kecil agar baris dan karakter multi-byte terpotong di antara buffer
+        with patch("finlogic.aggregators.BUFFER_SIZE", 7):
+            file_hash, aggregator = self.ingest(data)
+
+        self.assertEqual(file_hash, hashlib.sha256(data).hexdigest())
+        self.assertEqual(
+            aggregator.grouped_data_category,
+            {"2025-10": {"Makanan\r\nMinuman": 5000, "Transportasi": 10000}},
+        )
+
+    def test_unparsed_bytes_still_hashed(self):
+        # file tanpa header > csv berhenti, sisa file tetap di hash
+        data = b"\n" * 10 + "é".encode() * 5000
+
+        file_hash, aggregator = self.ingest(data)
+
+        self.assertEqual(file_hash, hashlib.sha256(data).hexdigest())
+
+    def test_offset_only_when_file_ends_with_newline(self):
+        _, aggregator = self.ingest(b"date,category,subcategory,price\n")
+        self.assertEqual(aggregator.offset, 32)
+
+        _, aggregator = self.ingest(b"date,category,subcategory,price")
+        self.assertIsNone(aggregator.offset)
+
+
+class TestIngestTail(SimpleTestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = Path(tmpdir.name) / "data_1.csv"
+        self.prefix = (
+            b"date,category,subcategory,price\r\n"
+            b"2025-10-23,Transportasi,Tiket Umum,10000\r\n"
+        )
+        self.tail = b"2025-10-24,Hiburan,Bioskop,50000\r\n"
+        self.path.write_bytes(self.prefix + self.tail)
+
+    def test_parse_tail_only(self):
+        hasher = hashlib.sha256()
+        # buffer kecil agar prefix dibaca dalam beberapa potongan
+        with patch("finlogic.aggregators.BUFFER_SIZE", 10):
+            aggregator = ingest_tail(
+                self.path,
+                hasher,
+                len(self.prefix),
+                hashlib.sha256(self.prefix).hexdigest(),
+                start=1,
+            )
+
+        self.assertEqual(
+            aggregator.grouped_data_category, {"2025-10": {"Hiburan": 50000}}
+        )
+        self.assertEqual(aggregator.rows, 1)
+        self.assertEqual(aggregator.offset, len(self.prefix + self.tail))
+        self.assertEqual(
+            hasher.hexdigest(), hashlib.sha256(self.prefix + self.tail).hexdigest()
+        )
+
+    def test_prefix_missing_replayed(self):
+        # baris ditolak di prefix tidak di parsing ulang, diambil dari chunk sebelumnya
+        missing = []
+        previous = [
+            {"rows": 2, "missing": [[2, ["price"], ["2025-10-23", "A", "B", ""]]]}
+        ]
+
+        ingest_tail(
+            self.path,
+            hashlib.sha256(),
+            len(self.prefix),
+            hashlib.sha256(self.prefix).hexdigest(),
+            start=2,
+            previous=previous,
+            on_missing=lambda i, fields, row: missing.append((i, fields, row)),
+        )
+
+        self.assertEqual(missing, [(2, ["price"], ["2025-10-23", "A", "B", ""])])
+
+    def test_prefix_changed(self):
+        aggregator = ingest_tail(
+            self.path, hashlib.sha256(), len(self.prefix), "oldhash123"
+        )
+
+        self.assertIsNone(aggregator)
+
+    def test_file_shorter_than_offset(self):
+        aggregator = ingest_tail(
+            self.path, hashlib.sha256(), len(self.prefix) + 1000, "oldhash123"
+        )
+
+        self.assertIsNone(aggregator)
+
+
+# setiap baris menjadi 1 chunk
+@patch("finlogic.aggregators.CHUNK_MIN_ROWS", 1)
+@patch("finlogic.aggregators.CHUNK_MASK", 0)
+class TestChunkedIngest(SimpleTestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = Path(tmpdir.name) / "data_1.csv"
+        self.rows = [
+            "2025-10-23,Transportasi,Tiket Umum,10000",
+            "2025-10-23,Makanan & Minuman,Cemilan,5000",
+            "2025-10-24,Transportasi,Bensin,20000",
+        ]
+
+    def ingest(
+        self,
+        rows,
+        previous=None,
+        header="date,category,subcategory,price",
+        on_missing=None,
+    ):
+        self.path.write_text("\n".join([header, *rows]) + "\n")
+        return ingest_file(
+            self.path, hashlib.sha256(), previous=previous, on_missing=on_missing
+        )
+
+    def test_only_changed_chunk_parsed(self):
+        first = self.ingest(self.rows)
+        self.assertEqual((first.parsed, first.reused), (3, 0))
+
+        self.rows[1] = "2025-10-23,Makanan & Minuman,Cemilan,7000"
+        with patch.object(
+            CsvAggregator, "feed", autospec=True, side_effect=CsvAggregator.feed
+        ) as mock_feed:
+            second = self.ingest(self.rows, previous=first.state())
+
+        self.assertEqual((second.parsed, second.reused), (1, 2))
+        self.assertEqual(mock_feed.call_count, 1)
+        self.assertEqual(
+            second.grouped_data_category,
+            {"2025-10": {"Transportasi": 30000, "Makanan & Minuman": 7000}},
+        )
+        self.assertEqual(
+            second.grouped_monthly_data,
+            {"2025-10": {"2025-10-23": 17000, "2025-10-24": 20000}},
+        )
+        self.assertEqual(second.rows, 3)
+
+    def test_reused_chunk_missing_replayed(self):
+        self.rows[1] = "2025-10-23,,Cemilan,5000"
+        first = self.ingest(self.rows)
+        self.rows.insert(0, "2025-10-22,Transportasi,Bensin,1000")
+        missing = []
+
+        second = self.ingest(
+            self.rows,
+            previous=first.state(),
+            on_missing=lambda i, fields, row: missing.append((i, fields)),
+        )
+
+        self.assertEqual((second.parsed, second.reused), (1, 3))
+        # nomor baris mengikuti posisi chunk di file baru
+        self.assertEqual(missing, [(3, ["category"])])
+        self.assertEqual(second.state()["chunks"][2]["missing"][0][0], 1)
+
+    def test_header_changed_all_chunks_parsed(self):
+        first = self.ingest(self.rows)
+        second = self.ingest(
+            self.rows, previous=first.state(), header="date,category,subcategory,price,"
+        )
+
+        self.assertEqual((second.parsed, second.reused), (3, 0))
+
+    def test_chunk_not_split_inside_quoted_field(self):
+        aggregator = self.ingest(['2025-10-23,"Makanan\nMinuman",Cemilan,5000'])
+
+        self.assertEqual(len(aggregator.chunks), 1)
+        self.assertEqual(
+            aggregator.grouped_data_category, {"2025-10": {"Makanan\nMinuman": 5000}}
+        )
+
+
+class TestChunkBoundaries(SimpleTestCase):
+    def chunks(self, lines, quoted):
+        aggregator = ChunkedAggregator(header="date,category,subcategory,price\n")
+        # dipecah ke beberapa blok seperti scan_lines
+        for i in range(0, len(lines), 700):
+            aggregator.feed(lines[i : i + 700], 0, quoted=quoted)
+        aggregator.finish()
+        return [chunk["hash"] for chunk in aggregator.chunks]
+
+    @patch("finlogic.aggregators.CHUNK_MASK", 63)
+    @patch("finlogic.aggregators.CHUNK_MIN_ROWS", 16)
+    @patch("finlogic.aggregators.CHUNK_MAX_ROWS", 100)
+    def test_unquoted_same_as_per_line(self):
+        lines = [
+            f"2025-10-{i % 28 + 1:02d},C{i % 7},S,{i * 37 % 1000}".encode()
+            for i in range(5000)
+        ]
+
+        chunks = self.chunks(lines, quoted=False)
+
+        self.assertGreater(len(chunks), 50)
+        self.assertEqual(chunks, self.chunks(lines, quoted=True))
+
+
+class LazyFuture(Future):
+    # future yang baru dijalankan saat hasilnya diminta
+    def __init__(self, fn, args):
+        super().__init__()
+        self.fn, self.args = fn, args
+
+    def result(self, timeout=None):
+        if not self.done():
+            self.set_result(self.fn(*self.args))
+        return super().result(timeout)
+
+
+class LazyExecutor:
+    _max_workers = 1
+
+    def __init__(self):
+        self.futures = []
+        # jumlah future yang belum selesai saat batch baru dikirim
+        self.pending = []
+
+    def submit(self, fn, *args):
+        self.pending.append(sum(not future.done() for future in self.futures))
+        future = LazyFuture(fn, args)
+        self.futures.append(future)
+        return future
+
+
+# chunk kecil dan batch kecil agar file dibagi ke beberapa proses
+@patch("finlogic.aggregators.CHUNK_MIN_ROWS", 2)
+@patch("finlogic.aggregators.CHUNK_MASK", 1)
+@patch("finlogic.aggregators.PARSE_BATCH_BYTES", 100)
+class TestParallelIngest(SimpleTestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = Path(tmpdir.name) / "data_1.csv"
+        lines = ["date,category,subcategory,price"]
+        for i in range(200):
+            if i % 17 == 0:
+                lines.append(f"2025-10-{i % 28 + 1:02d},,Cemilan,{i}")
+            elif i % 23 == 0:
+                lines.append("")
+            else:
+                lines.append(f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d},C{i % 5},S,{i}")
+        self.path.write_text("\n".join(lines) + "\n")
+
+    def ingest(self, executor=None):
+        missing = []
+        aggregator = ingest_file(
+            self.path,
+            hashlib.sha256(),
+            on_missing=lambda i, fields, row: missing.append((i, fields)),
+            executor=executor,
+        )
+        return aggregator, missing
+
+    def assertSameResult(self, result, expected):
+        aggregator, missing = result
+        self.assertEqual(
+            aggregator.grouped_data_category, expected[0].grouped_data_category
+        )
+        self.assertEqual(
+            aggregator.grouped_monthly_data, expected[0].grouped_monthly_data
+        )
+        self.assertEqual(aggregator.rows, expected[0].rows)
+        self.assertEqual(aggregator.chunks, expected[0].chunks)
+        # nomor baris warning sama dengan parsing serial
+        self.assertEqual(missing, expected[1])
+
+    def test_parallel_same_as_serial(self):
+        serial = self.ingest()
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            parallel = self.ingest(executor)
+
+        self.assertGreater(len(serial[0].chunks), 10)
+        self.assertEqual(serial[1][0], (1, ["category"]))
+        self.assertSameResult(parallel, serial)
+        self.assertIsNone(parallel[0].executor_error)
+
+    def test_submit_failed_fallback_serial(self):
+        executor = MagicMock()
+        executor.submit.side_effect = AssertionError(
+            "daemonic processes are not allowed to have children"
+        )
+
+        result = self.ingest(executor)
+
+        self.assertSameResult(result, self.ingest())
+        self.assertIsInstance(result[0].executor_error, AssertionError)
+        executor.submit.assert_called_once()
+
+    def test_broken_worker_fallback_serial(self):
+        future = Future()
+        future.set_exception(RuntimeError("worker mati"))
+        executor = MagicMock()
+        executor.submit.return_value = future
+
+        result = self.ingest(executor)
+
+        self.assertSameResult(result, self.ingest())
+        self.assertIsInstance(result[0].executor_error, RuntimeError)
+
+    def test_in_flight_limited(self):
+        executor = LazyExecutor()
+
+        result = self.ingest(executor)
+
+        self.assertSameResult(result, self.ingest())
+        self.assertGreater(len(executor.futures), 10)
+        # paling banyak 2 x jumlah worker batch yang belum selesai
+        self.assertEqual(max(executor.pending), 2)
+
+
+@skipUnless(np, "numpy tidak terinstall")
+class TestNumpyAggregator(SimpleTestCase):
+    data = (
+        "date,category,subcategory,price\n"
+        "2025-11-02,Transportasi,Bensin,20000\n"
+        "2025-10-23,Makanan & Minuman,Cemilan,5000\n"
+        ",Makanan & Minuman,,10000\n"
+        "2025-10-23,Transportasi,Tiket Umum,10000\n"
+        "\n"
+        "2025-11-01,Makanan & Minuman,Minuman,3000\n"
+        "2025-10-24,Makanan & Minuman,Minuman,9007199254740993\n"
+        "2025-11-02,Transportasi,Bensin,15000\n"
+    )
+
+    def feed(self, aggregator_class, text, start=0):
+        missing = []
+        aggregator = aggregator_class(
+            on_missing=lambda i, fields, row: missing.append((i, fields))
+        )
+        return aggregator.feed(io.StringIO(text), start), missing
+
+    def assertSameAggregator(self, result, expected):
+        for name in (
+            "grouped_data_category",
+            "grouped_monthly_data",
+            "category_counts",
+            "monthly_counts",
+        ):
+            # urutan key ikut dibandingkan, urutan baris di sheet mengikuti urutan dict
+            self.assertEqual(
+                [
+                    (key, list(value.items()) if isinstance(value, dict) else value)
+                    for key, value in getattr(result, name).items()
+                ],
+                [
+                    (key, list(value.items()) if isinstance(value, dict) else value)
+                    for key, value in getattr(expected, name).items()
+                ],
+            )
+        self.assertEqual(result.rows, expected.rows)
+        self.assertEqual(result.skipped, expected.skipped)
+
+    def test_same_result_as_python(self):
+        result, missing = self.feed(NumpyAggregator, self.data, start=10)
+        expected, expected_missing = self.feed(CsvAggregator, self.data, start=10)
+
+        self.assertSameAggregator(result, expected)
+        self.assertEqual(missing, expected_missing)
+        self.assertEqual(missing, [(13, ["date", "subcategory"])])
+        # total int64 tidak dibulatkan seperti float
+        self.assertEqual(
+            result.grouped_monthly_data["2025-10"]["2025-10-24"], 9007199254740993
+        )
+
+    def test_feed_accumulates(self):
+        result = NumpyAggregator()
+        expected = CsvAggregator()
+        for aggregator in (result, expected):
+            aggregator.feed(io.StringIO(self.data))
+            aggregator.feed(io.StringIO(self.data))
+
+        self.assertSameAggregator(result, expected)
+
+    def test_ingest_file_backend(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "data_1.csv"
+            header, body = self.data.split("\n", 1)
+            path.write_text(header + "\n" + body * 50)
+            result = ingest_file(path, hashlib.sha256(), backend="numpy")
+            expected = ingest_file(path, hashlib.sha256())
+
+        self.assertEqual(result.grouped_data_category, expected.grouped_data_category)
+        self.assertEqual(result.grouped_monthly_data, expected.grouped_monthly_data)
+        self.assertEqual(result.chunks, expected.chunks)
+
+
+class TestGetAggregator(SimpleTestCase):
+    def test_backend(self):
+        self.assertIs(get_aggregator("python"), CsvAggregator)
+        with patch("finlogic.aggregators.np", object()):
+            self.assertIs(get_aggregator("numpy"), NumpyAggregator)
+
+    def test_numpy_missing_fallback_python(self):
+        with patch("finlogic.aggregators.np", None):
+            self.assertIs(get_aggregator("numpy"), CsvAggregator)
+
+    def test_unknown_backend(self):
+        with self.assertRaisesMessage(
+            ValueError, "Engine agregasi tidak didukung: polars"
+        ):
+            get_aggregator("polars")
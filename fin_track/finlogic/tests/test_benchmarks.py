@@ -0,0 +1,136 @@
+from django.test import TestCase
+from django.core.management import call_command
+from django.utils.timezone import now
+from io import StringIO
+from unittest.mock import patch
+from pathlib import Path
+import tempfile
+import csv
+import json
+from finlogic.benchmarks import (
+    BENCHMARKS,
+    PipelineBenchmark,
+    backend_speedup,
+    compare_results,
+    generate_csv,
+)
+from finlogic.aggregators import CsvAggregator
+from finlogic.models import FileIntegrity, WorksheetMirror
+
+
+class TestGenerateCsv(TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = Path(tmpdir.name)
+
+    def test_same_seed_same_file(self):
+        paths = [self.tmpdir / f"data_{i}.csv" for i in range(3)]
+        for path, seed in zip(paths, [1, 1, 2]):
+            generate_csv(path, size_mb=0.05, seed=seed)
+
+        self.assertEqual(paths[0].read_bytes(), paths[1].read_bytes())
+        self.assertNotEqual(paths[0].read_bytes(), paths[2].read_bytes())
+
+    def test_size_months_and_categories(self):
+        path = self.tmpdir / "data_1.csv"
+
+        info = generate_csv(
+            path, size_mb=0.1, months=3, categories=4, start_month="2025-11"
+        )
+
+        with path.open(newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(info["rows"], len(rows))
+        self.assertEqual(info["bytes"], path.stat().st_size)
+        self.assertGreaterEqual(info["bytes"], 0.1 * 1024 * 1024)
+        self.assertEqual(
+            {row["date"][:7] for row in rows}, {"2025-11", "2025-12", "2026-01"}
+        )
+        self.assertEqual(len({row["category"] for row in rows}), 4)
+
+
+@patch("finlogic.file_processors.logger")
+class TestBenchPipelineCommand(TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = Path(tmpdir.name)
+
+    def test_results_saved_and_compared(self, mock_logger):
+        output = self.tmpdir / "result.json"
+        out = StringIO()
+        options = ["--size-mb", "0.05", "--repeat", "1", "--output", str(output)]
+
+        call_command("bench_pipeline", *options, stdout=out)
+        call_command("bench_pipeline", *options, "--compare", str(output), stdout=out)
+
+        data = json.loads(output.read_text())
+        self.assertEqual(list(data["benchmarks"]), list(BENCHMARKS))
+        self.assertEqual(data["file"]["generator"]["seed"], 0)
+        result = data["benchmarks"]["end_to_end"]
+        self.assertEqual(result["rows"], data["file"]["rows"])
+        self.assertGreater(result["peak_memory_bytes"], 0)
+        self.assertIsNone(data["benchmarks"]["category_plan"]["mb_per_sec"])
+        self.assertIn("dibanding", out.getvalue())
+        self.assertIn("Engine numpy", out.getvalue())
+        # end_to_end di rollback, database tidak berubah
+        self.assertFalse(FileIntegrity.objects.exists())
+        self.assertFalse(WorksheetMirror.objects.exists())
+
+    def test_existing_data_untouched(self, mock_logger):
+        # database yang sudah berisi data_1.csv dan mirror worksheet asli
+        FileIntegrity.objects.create(
+            filename="data_1.csv", hash_data="oldhash123", last_checked=now()
+        )
+        WorksheetMirror.objects.create(
+            name="Category Expense", rows=[["2025-10", "Transportasi", "15000"]]
+        )
+
+        call_command(
+            "bench_pipeline",
+            "--size-mb",
+            "0.02",
+            "--repeat",
+            "1",
+            "--benchmark",
+            "end_to_end",
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(
+            list(FileIntegrity.objects.values_list("filename", "hash_data")),
+            [("data_1.csv", "oldhash123")],
+        )
+        self.assertEqual(
+            WorksheetMirror.objects.get().rows,
+            [["2025-10", "Transportasi", "15000"]],
+        )
+
+    def test_compare_results(self, mock_logger):
+        changes = compare_results(
+            {"hash": {"seconds": 1.5}, "end_to_end": {"seconds": 2}},
+            {"hash": {"seconds": 1}},
+        )
+
+        self.assertEqual(changes, {"hash": 0.5})
+
+    def test_numpy_skipped_when_unavailable(self, mock_logger):
+        path = self.tmpdir / "data_1.csv"
+        generate_csv(path, size_mb=0.02)
+        benchmark = PipelineBenchmark(path)
+
+        # numpy tidak terinstall > semua engine jatuh ke CsvAggregator
+        with patch("finlogic.benchmarks.get_aggregator", return_value=CsvAggregator):
+            results = benchmark.run(["ingest_python", "ingest_numpy"], repeat=1)
+
+        self.assertEqual(list(results), ["ingest_python"])
+        self.assertIsNone(backend_speedup(results))
+
+    def test_backend_speedup(self, mock_logger):
+        self.assertEqual(
+            backend_speedup(
+                {"ingest_python": {"seconds": 3}, "ingest_numpy": {"seconds": 2}}
+            ),
+            1.5,
+        )
@@ -7,10 +7,16 @@ from django.core import mail
 from django.utils.timezone import now
 from freezegun import freeze_time
 import csv
-from finlogic.file_processors import ProcessFile
+import os
+from finlogic.tasks import send_notification_digest_task
+from finlogic.file_processors import ProcessFile, sheets_client
 
 # import hashlib
-from finlogic.tests.helper_test import generate_dummy_file, generate_fake_hash
+from finlogic.tests.helper_test import (
+    generate_dummy_file,
+    generate_fake_hash,
+    logged_messages,
+)
 
 
 # Create your tests here.
@@ -22,8 +28,12 @@ from finlogic.tests.helper_test import generate_dummy_file, generate_fake_hash
     CELERY_TASK_EAGER_PROPAGATES=True,
 )
 @patch("finlogic.file_processors.logger")
-@patch("finlogic.file_processors.hashlib.sha256")
+@patch("finlogic.hashing.hashlib.sha256")
 class TestCheckChangesDataFile(TestCase):
+    def setUp(self):
+        # client di-cache per worker, reset agar mock tiap test dipakai
+        sheets_client.clear()
+
     def test_new_file(self, mock_sha256, mock_logger):
         """
         test ketika melakukan check perubahan data tapi file nya baru
@@ -46,8 +56,9 @@ class TestCheckChangesDataFile(TestCase):
                 self.assertTrue(is_changes)
 
                 mock_logger.info.assert_any_call("Memulai pengecekan data di file")
-                mock_logger.debug.assert_any_call(
-                    f"Hash file berhasil dibuat: fakehash123"
+                self.assertIn(
+                    "Hash file berhasil dibuat: fakehash123",
+                    logged_messages(mock_logger.debug),
                 )
                 mock_logger.info.assert_any_call(
                     "Menghentikan pengecekan karena file baru"
@@ -82,13 +93,15 @@ class TestCheckChangesDataFile(TestCase):
                 self.assertFalse(is_changes)
 
                 mock_logger.info.assert_any_call("Memulai pengecekan data di file")
-                mock_logger.debug.assert_any_call(
-                    f"Hash file berhasil dibuat: fakehash123"
+                self.assertIn(
+                    "Hash file berhasil dibuat: fakehash123",
+                    logged_messages(mock_logger.debug),
                 )
                 mock_logger.info.assert_any_call(
                     "Hash data lama sama dengan hash data baru. Data file tidak berubah"
                 )
 
+                send_notification_digest_task()
                 self.assertEqual(len(mail.outbox), 1)
 
                 email = mail.outbox[0]
@@ -132,7 +145,118 @@ class TestCheckChangesDataFile(TestCase):
                 self.assertTrue(is_changes)
 
                 mock_logger.info.assert_any_call("Memulai pengecekan data di file")
-                mock_logger.debug.assert_any_call(
-                    f"Hash file berhasil dibuat: fakehash123"
+                self.assertIn(
+                    "Hash file berhasil dibuat: fakehash123",
+                    logged_messages(mock_logger.debug),
                 )
                 mock_logger.info.assert_any_call("Data file berubah")
+
+    def create_checked_file(self, dummy_file, mtime="2025-11-01 00:00:00"):
+        # file terakhir diubah jauh sebelum pengecekan terakhir
+        with freeze_time(mtime):
+            mtime_ns = int(now().timestamp()) * 10**9
+        os.utime(dummy_file, ns=(mtime_ns, mtime_ns))
+
+        with freeze_time("2025-11-06 00:00:00"):
+            file_integrity = FileIntegrity(
+                filename=dummy_file.name,
+                hash_data="oldhash123",
+                last_checked=now(),
+            )
+            file_integrity.set_stat(dummy_file.stat())
+            file_integrity.save()
+
+    def check_changes(self, dummy_file):
+        file = {"is_new_file": False, "file_name": "data_1.csv", "file": dummy_file}
+        return ProcessFile(file).check_changes_data_file()
+
+    def test_old_file_same_stat_skip_hash(self, mock_sha256, mock_logger):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path, dummy_file = generate_dummy_file(tmpdir)
+            self.create_checked_file(dummy_file)
+
+            with patch.object(FileIntegrity, "load_chunks") as mock_load_chunks:
+                self.assertFalse(self.check_changes(dummy_file))
+
+        mock_sha256.assert_not_called()
+        # chunk state hanya dibaca saat file di parsing
+        mock_load_chunks.assert_not_called()
+        mock_logger.info.assert_any_call(
+            "Ukuran, mtime dan inode file sama dengan data lama, hash tidak dibuat ulang"
+        )
+        send_notification_digest_task()
+        self.assertEqual(mail.outbox[0].subject, "Data File Tidak Berubah")
+
+    @override_settings(FILE_HASH_PARANOID=True)
+    def test_old_file_same_stat_paranoid(self, mock_sha256, mock_logger):
+        generate_fake_hash(mock_sha256)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path, dummy_file = generate_dummy_file(tmpdir)
+            self.create_checked_file(dummy_file)
+
+            self.assertTrue(self.check_changes(dummy_file))
+
+        mock_sha256.assert_called_once()
+
+    def test_old_file_stat_changed(self, mock_sha256, mock_logger):
+        generate_fake_hash(mock_sha256)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path, dummy_file = generate_dummy_file(tmpdir)
+            self.create_checked_file(dummy_file)
+            with dummy_file.open("a", newline="") as f:
+                csv.writer(f).writerow(["2025-10-23", "Transportasi", "Bensin", 1000])
+
+            self.assertTrue(self.check_changes(dummy_file))
+
+        mock_sha256.assert_called_once()
+        mock_logger.info.assert_any_call("Data file berubah")
+
+    def test_old_file_touched_stat_saved(self, mock_sha256, mock_logger):
+        # isi file sama tapi mtime berubah (touch), stat baru disimpan
+        mock_sha256.return_value.hexdigest.return_value = "oldhash123"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path, dummy_file = generate_dummy_file(tmpdir)
+            self.create_checked_file(dummy_file)
+            with freeze_time("2025-11-03 00:00:00"):
+                mtime_ns = int(now().timestamp()) * 10**9
+            os.utime(dummy_file, ns=(mtime_ns, mtime_ns))
+
+            with freeze_time("2025-11-07 00:00:00"):
+                self.assertFalse(self.check_changes(dummy_file))
+            file_integrity = FileIntegrity.objects.get(filename=dummy_file.name)
+            self.assertTrue(file_integrity.same_stat(dummy_file.stat()))
+
+            # pengecekan berikutnya tidak membuat hash ulang
+            with freeze_time("2025-11-08 00:00:00"):
+                self.assertFalse(self.check_changes(dummy_file))
+
+        mock_sha256.assert_called_once()
+
+    def test_old_file_racy_mtime(self, mock_sha256, mock_logger):
+        # mtime file sama dengan waktu pengecekan terakhir, stat tidak bisa dipercaya
+        generate_fake_hash(mock_sha256)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path, dummy_file = generate_dummy_file(tmpdir)
+            self.create_checked_file(dummy_file, mtime="2025-11-06 00:00:00")
+
+            self.check_changes(dummy_file)
+
+        mock_sha256.assert_called_once()
+
+    @override_settings(FILE_HASH_ALGORITHM="blake2b")
+    def test_old_file_compared_with_stored_algorithm(self, mock_sha256, mock_logger):
+        # setting berubah ke blake2b, file lama tetap di hash dengan sha256
+        generate_fake_hash(mock_sha256)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path, dummy_file = generate_dummy_file(tmpdir)
+            with freeze_time("2025-11-06 00:00:00"):
+                FileIntegrity.objects.create(
+                    filename=dummy_file.name,
+                    hash_data="fakehash123",
+                    hash_algorithm="sha256",
+                    last_checked=now(),
+                )
+
+            self.assertFalse(self.check_changes(dummy_file))
+
+        mock_sha256.assert_called_once()
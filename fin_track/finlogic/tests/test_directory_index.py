@@ -0,0 +1,62 @@
+from django.test import SimpleTestCase
+from unittest.mock import patch
+from pathlib import Path
+import tempfile
+import os
+from finlogic.file_readers import DirectoryIndex
+
+
+class TestDirectoryIndex(SimpleTestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = Path(tmpdir.name)
+        self.index = DirectoryIndex()
+        # mtime direktori selalu dipercaya agar scan ulang hanya karena mtime berubah
+        self.index.racy_ns = 0
+
+    def set_dir_mtime(self, seconds):
+        os.utime(self.path, ns=(seconds * 10**9, seconds * 10**9))
+
+    def test_lookup_and_latest_number(self):
+        (self.path / "data_2.csv").write_text("abc")
+        (self.path / "data_10.csv").write_text("a")
+        (self.path / "notes.txt").write_text("a")
+        (self.path / "data_99.csv").mkdir()
+
+        self.assertFalse(self.index.is_empty(self.path))
+        self.assertEqual(self.index.lookup(self.path, "data_2.csv")[0], 3)
+        self.assertIsNone(self.index.lookup(self.path, "data_3.csv"))
+        # direktori tidak dihitung sebagai file
+        self.assertIsNone(self.index.lookup(self.path, "data_99.csv"))
+        self.assertEqual(self.index.latest_number(self.path), 10)
+
+    def test_empty_directory(self):
+        self.assertTrue(self.index.is_empty(self.path))
+        self.assertIsNone(self.index.latest_number(self.path))
+
+    def test_scan_only_when_directory_mtime_changes(self):
+        (self.path / "data_1.csv").write_text("a")
+        self.set_dir_mtime(1000)
+
+        with patch("finlogic.file_readers.os.scandir", wraps=os.scandir) as scandir:
+            self.index.lookup(self.path, "data_1.csv")
+            self.index.lookup(self.path, "data_2.csv")
+            self.index.latest_number(self.path)
+            self.assertEqual(scandir.call_count, 1)
+
+            (self.path / "data_2.csv").write_text("a")
+            self.set_dir_mtime(2000)
+
+            self.assertIsNotNone(self.index.lookup(self.path, "data_2.csv"))
+            self.assertEqual(scandir.call_count, 2)
+
+    def test_racy_mtime_scanned_again(self):
+        self.index.racy_ns = DirectoryIndex.racy_ns
+        (self.path / "data_1.csv").write_text("a")
+
+        with patch("finlogic.file_readers.os.scandir", wraps=os.scandir) as scandir:
+            # mtime direktori baru saja berubah, belum bisa dipercaya
+            self.index.lookup(self.path, "data_1.csv")
+            self.index.lookup(self.path, "data_1.csv")
+            self.assertEqual(scandir.call_count, 2)
@@ -2,8 +2,8 @@ from django.test import TestCase, override_settings
 from unittest.mock import patch
 from pathlib import Path
 import tempfile
-from finlogic.file_processors import ProcessFile
-from finlogic.tests.helper_test import generate_dummy_file
+from finlogic.file_processors import ProcessFile, sheets_client
+from finlogic.tests.helper_test import generate_dummy_file, logged_messages
 import tempfile
 from django.conf import settings
 import json
@@ -12,6 +12,10 @@ import gspread
 
 @patch("finlogic.file_processors.logger")
 class TestExceptInItClass(TestCase):
+    def setUp(self):
+        # client di-cache per worker, reset agar mock tiap test dipakai
+        sheets_client.clear()
+
     @override_settings(PATH_CREDENTIALS="/fake/file.json")
     def test_creds_not_found(self, mock_logger):
 
@@ -23,8 +27,9 @@ class TestExceptInItClass(TestCase):
         with self.assertRaises(FileNotFoundError):
             ProcessFile(file)
 
-        mock_logger.error.assert_any_call(
-            "File credentials tidak ditemukan di path: /fake/file.json"
+        self.assertIn(
+            "File credentials tidak ditemukan di path: /fake/file.json",
+            logged_messages(mock_logger.error),
         )
 
     def test_creds_invalid(self, mock_logger):
@@ -41,8 +46,9 @@ class TestExceptInItClass(TestCase):
 
             with self.assertRaises(Exception):
                 ProcessFile(file)
-            mock_logger.exception.assert_any_call(
-                "Kredensial tidak valid: Error Credentials"
+            self.assertIn(
+                "Kredensial tidak valid: Error Credentials",
+                logged_messages(mock_logger.exception),
             )
 
     def test_gspread_invalid(self, mock_logger):
@@ -58,8 +64,9 @@ class TestExceptInItClass(TestCase):
             with self.assertRaises(Exception):
                 ProcessFile(file)
 
-            mock_logger.exception.assert_any_call(
-                "Gagal menghubungkan ke Google Sheets API: Autorisasi gagal"
+            self.assertIn(
+                "Gagal menghubungkan ke Google Sheets API: Autorisasi gagal",
+                logged_messages(mock_logger.exception),
             )
 
     @override_settings(ID_FILE_GOOGLE_SHEETS="fakeid123")
@@ -73,6 +80,7 @@ class TestExceptInItClass(TestCase):
         with self.assertRaises(gspread.exceptions.SpreadsheetNotFound):
             ProcessFile(file)
 
-        mock_logger.error.assert_any_call(
-            "Tidak dapat menemukan spreadsheet dengan ID: fakeid123"
+        self.assertIn(
+            "Tidak dapat menemukan spreadsheet dengan ID: fakeid123",
+            logged_messages(mock_logger.error),
         )
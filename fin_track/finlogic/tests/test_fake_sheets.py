@@ -0,0 +1,220 @@
+from django.test import TestCase, override_settings
+from unittest.mock import patch
+import tempfile
+import gspread
+from finlogic.fake_sheets import (
+    FakeGspreadClient,
+    FakeSheetsClient,
+    FakeSpreadsheet,
+    FakeWorksheet,
+)
+from finlogic.file_processors import ProcessFile, sheets_client
+from finlogic.models import WorksheetMirror
+from finlogic.tests.helper_test import generate_dummy_file
+
+
+class TestFakeSpreadsheet(TestCase):
+    def setUp(self):
+        self.sh = FakeSpreadsheet(
+            {"Category Expense": [["month", "category", "total_expense"]]}
+        )
+        self.ws = self.sh.worksheet("Category Expense")
+
+    def test_cell_state(self):
+        self.ws.append_rows([["2025-10", "Transportasi", 20000]])
+        self.ws.append_rows([["2025-10", "Makanan", 5000]])
+        self.ws.batch_update([{"range": "C2", "values": [[25000]]}])
+
+        self.assertEqual(
+            self.ws.get_all_values(),
+            [
+                ["month", "category", "total_expense"],
+                ["2025-10", "Transportasi", "25000"],
+                ["2025-10", "Makanan", "5000"],
+            ],
+        )
+        response = self.sh.values_batch_get(
+            ["'Category Expense'!A2:B", "'Category Expense'!C9:C10"]
+        )
+        self.assertEqual(
+            response["valueRanges"],
+            [
+                {
+                    "range": "'Category Expense'!A2:B",
+                    "values": [["2025-10", "Transportasi"], ["2025-10", "Makanan"]],
+                },
+                {"range": "'Category Expense'!C9:C10"},
+            ],
+        )
+
+    def test_calls_and_bytes_counted(self):
+        self.ws.get_all_values()
+        self.sh.values_batch_update(
+            {
+                "valueInputOption": "RAW",
+                "data": [{"range": "'Category Expense'!C2", "values": [[1]]}],
+            }
+        )
+
+        stats = self.sh.stats()
+        self.assertEqual(
+            stats["calls"],
+            {"worksheet": 1, "get_all_values": 1, "values_batch_update": 1},
+        )
+        self.assertGreater(stats["bytes_sent"], 0)
+        self.assertGreater(stats["bytes_received"], 0)
+
+    def test_write_outside_grid(self):
+        with self.assertRaises(gspread.exceptions.APIError) as cm:
+            self.ws.batch_update([{"range": "A1001", "values": [["x"]]}])
+
+        self.assertEqual(cm.exception.code, 400)
+        self.ws.add_rows(1)
+        self.ws.batch_update([{"range": "A1001", "values": [["x"]]}])
+
+    def test_worksheet_not_found(self):
+        with self.assertRaises(gspread.exceptions.WorksheetNotFound):
+            self.sh.worksheet("Tidak Ada")
+
+    def test_injected_error(self):
+        self.sh.fail("get_all_values", status=429, times=2)
+
+        for _ in range(2):
+            with self.assertRaises(gspread.exceptions.APIError) as cm:
+                self.ws.get_all_values()
+            self.assertEqual(cm.exception.code, 429)
+        self.ws.get_all_values()
+        self.assertEqual(self.sh.errors, {429: 2})
+
+    def test_quota_per_minute(self):
+        self.sh.quota_per_minute = 2
+
+        self.ws.get_all_values()
+        self.ws.get_all_values()
+        with self.assertRaises(gspread.exceptions.APIError) as cm:
+            self.ws.get_all_values()
+
+        self.assertEqual(cm.exception.code, 429)
+        with patch("finlogic.fake_sheets.time.monotonic", return_value=10**9):
+            self.ws.get_all_values()
+
+    @patch("finlogic.fake_sheets.time.sleep")
+    def test_latency_per_method(self, mock_sleep):
+        self.sh.latency = {"get_all_values": 0.2}
+
+        self.ws.get_all_values()
+        self.ws.append_rows([["2025-10", "Transportasi", 20000]])
+
+        mock_sleep.assert_called_once_with(0.2)
+
+
+@override_settings(
+    CELERY_TASK_ALWAYS_EAGER=True,
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+)
+@patch("finlogic.file_processors.logger")
+class TestProcessFileWithFakeSheets(TestCase):
+    def setUp(self):
+        self.sh = FakeSpreadsheet(
+            {
+                "Category Expense": [
+                    ["month", "category", "total_expense"],
+                    ["2025-10", "Transportasi", "20000"],
+                ],
+                "Monthly Expense": [
+                    ["month", "total_expense", "avg_per_day", "days_count"],
+                    ["2025-09", "7000", "7000", "1"],
+                ],
+            }
+        )
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        _, dummy_file = generate_dummy_file(tmpdir.name)
+        self.file = {"is_new_file": True, "file_name": "data_1.csv", "file": dummy_file}
+
+    def process(self):
+        obj = ProcessFile(self.file, client=FakeSheetsClient(self.sh))
+        obj.group_file_data()
+        return obj.process_sheets()
+
+    def values(self, name):
+        return self.sh.worksheets[name].values
+
+    def test_process_sheets(self, mock_logger):
+        self.process()
+
+        self.assertEqual(
+            self.values("Category Expense"),
+            [
+                ["month", "category", "total_expense"],
+                ["2025-10", "Transportasi", "30000"],
+                ["2025-10", "Makanan & Minuman", "5000"],
+            ],
+        )
+        self.assertEqual(
+            self.values("Monthly Expense")[2], ["2025-10", "15000", "15000", "1"]
+        )
+        # 1 request baca dan 1 request tulis untuk kedua worksheet,
+        # metadata worksheet diambil untuk cek jumlah baris sebelum append
+        self.assertEqual(
+            self.sh.calls,
+            {"values_batch_get": 1, "values_batch_update": 1, "worksheet": 2},
+        )
+
+    def test_quota_error(self, mock_logger):
+        self.sh.fail("values_batch_update", status=429)
+
+        with self.assertRaises(gspread.exceptions.APIError) as cm:
+            self.process()
+
+        self.assertEqual(cm.exception.code, 429)
+        self.assertEqual(self.values("Category Expense")[1][2], "20000")
+        # mirror dihapus karena isi worksheet tidak pasti
+        self.assertFalse(WorksheetMirror.objects.exists())
+
+    def test_partial_failure_mirror_rebuilt(self, mock_logger):
+        self.sh.fail("values_batch_update", status=500, partial=True)
+
+        with self.assertRaises(gspread.exceptions.APIError):
+            self.process()
+
+        # sebagian range sudah tertulis di worksheet
+        self.assertEqual(self.values("Category Expense")[1][2], "30000")
+        self.assertEqual(len(self.values("Category Expense")), 2)
+        self.assertFalse(WorksheetMirror.objects.exists())
+
+    def test_stale_row_count_refreshed(self, mock_logger):
+        client = FakeSheetsClient(self.sh)
+        # metadata worksheet di cache masih 1000 baris, baris worksheet sudah dihapus manual
+        client.worksheets["Category Expense"] = FakeWorksheet(
+            self.sh, "Category Expense"
+        )
+        self.sh.worksheets["Category Expense"].row_count = 2
+
+        obj = ProcessFile(self.file, client=client)
+        obj.group_file_data()
+        obj.process_sheets()
+
+        self.assertEqual(
+            self.values("Category Expense")[2],
+            ["2025-10", "Makanan & Minuman", "5000"],
+        )
+        # request pertama gagal karena melebihi jumlah baris, diulang setelah baris ditambah
+        self.assertEqual(self.sh.calls["values_batch_update"], 2)
+        self.assertEqual(self.sh.calls["add_rows"], 1)
+        self.assertEqual(obj.stats.counters["api_errors"], 1)
+
+    @patch("finlogic.file_processors.Credentials.from_service_account_file")
+    def test_sheets_client_with_fake_gspread(self, mock_credentials, mock_logger):
+        sheets_client.clear()
+        self.addCleanup(sheets_client.clear)
+
+        with patch(
+            "finlogic.file_processors.gspread.authorize",
+            return_value=FakeGspreadClient(self.sh),
+        ):
+            obj = ProcessFile(self.file)
+            obj.group_file_data()
+            obj.process_sheets()
+
+        self.assertEqual(self.values("Category Expense")[1][2], "30000")
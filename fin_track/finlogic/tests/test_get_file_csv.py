@@ -3,7 +3,8 @@ from finlogic.models import FileIntegrity
 from unittest.mock import patch
 from pathlib import Path
 import tempfile
-from finlogic.file_readers import get_file_csv
+from finlogic.file_readers import get_file_csv, get_files_csv
+from finlogic.tasks import send_notification_digest_task
 from django.core import mail
 from django.utils.timezone import now
 from freezegun import freeze_time
@@ -35,6 +36,7 @@ class TestUtilsGetFileCsv(TestCase):
             # patch Path di modul kamu, misal 'app.tasks.Path'
             with patch("finlogic.file_readers.Path", return_value=fake_path):
                 result = get_file_csv()
+                send_notification_digest_task()
 
                 self.assertIsNone(result)
                 self.assertEqual(len(mail.outbox), 1)
@@ -124,6 +126,7 @@ class TestUtilsGetFileCsv(TestCase):
             # patch Path di modul kamu, misal 'app.tasks.Path'
             with patch("finlogic.file_readers.Path", return_value=fake_path):
                 result = get_file_csv()
+                send_notification_digest_task()
 
                 self.assertIsNone(result)
                 self.assertEqual(len(mail.outbox), 1)
@@ -138,3 +141,80 @@ class TestUtilsGetFileCsv(TestCase):
                 )
                 self.assertEqual(email.from_email, "system@example.com")
                 self.assertEqual(email.to, ["target@example.com"])
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    SENDER_EMAIL="system@example.com",
+    TARGETS_EMAIL=["target@example.com"],
+    CELERY_TASK_ALWAYS_EAGER=True,
+    CELERY_TASK_EAGER_PROPAGATES=True,
+    PROCESS_BACKLOG=True,
+)
+@freeze_time("2025-11-04 08:00:00")
+class TestUtilsGetFilesCsv(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        FileIntegrity.objects.create(
+            filename="data_1.csv",
+            hash_data="qwertyuioplkjhgfdsazxcvbnm",
+            last_checked=now(),
+            created_at=now().replace(day=1),
+        )
+
+    def create_files(self, fake_path, names):
+        for name in names:
+            (fake_path / name).write_text("date,category,subcategory,price\n")
+
+    def test_backlog_new_files_in_order(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path = Path(tmpdir)
+            # data_5.csv tidak ikut karena data_4.csv tidak ada
+            self.create_files(
+                fake_path, ["data_1.csv", "data_3.csv", "data_2.csv", "data_5.csv"]
+            )
+
+            with patch("finlogic.file_readers.Path", return_value=fake_path):
+                result = get_files_csv()
+
+        self.assertEqual(
+            [file["file_name"] for file in result], ["data_2.csv", "data_3.csv"]
+        )
+        self.assertTrue(all(file["is_new_file"] for file in result))
+        self.assertEqual(result[1]["file"], fake_path / "data_3.csv")
+
+    @override_settings(PROCESS_BACKLOG=False)
+    def test_backlog_disabled(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path = Path(tmpdir)
+            self.create_files(fake_path, ["data_2.csv", "data_3.csv"])
+
+            with patch("finlogic.file_readers.Path", return_value=fake_path):
+                result = get_files_csv()
+
+        self.assertEqual([file["file_name"] for file in result], ["data_2.csv"])
+
+    @freeze_time("2025-11-01 10:00:00")
+    def test_old_file_without_backlog(self):
+        FileIntegrity.objects.update(created_at=now())
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path = Path(tmpdir)
+            self.create_files(fake_path, ["data_1.csv", "data_2.csv"])
+
+            with patch("finlogic.file_readers.Path", return_value=fake_path):
+                result = get_files_csv()
+
+        self.assertEqual([file["file_name"] for file in result], ["data_1.csv"])
+        self.assertFalse(result[0]["is_new_file"])
+
+    def test_file_missing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path = Path(tmpdir)
+            self.create_files(fake_path, ["data_3.csv"])
+
+            with patch("finlogic.file_readers.Path", return_value=fake_path):
+                result = get_files_csv()
+
+        self.assertEqual(result, [])
+        send_notification_digest_task()
+        self.assertEqual(mail.outbox[0].subject, "File Tidak Ditemukan di Direktori")
@@ -1,9 +1,13 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 import tempfile
-from finlogic.file_processors import ProcessFile
-from finlogic.tests.helper_test import generate_dummy_file
+from finlogic.file_processors import ProcessFile, sheets_client
+from finlogic.tests.helper_test import (
+    generate_dummy_file,
+    logged_messages,
+    set_fake_values,
+)
 import tempfile
 from django.conf import settings
 import json
@@ -12,6 +16,10 @@ import gspread
 
 @patch("finlogic.file_processors.logger")
 class TestWorksheet(TestCase):
+    def setUp(self):
+        # client di-cache per worker, reset agar mock tiap test dipakai
+        sheets_client.clear()
+
     def test_success_not_data(self, mock_logger):
         with patch("finlogic.file_processors.gspread.authorize") as mock_authorize:
             fake_gc = MagicMock()
@@ -89,8 +97,9 @@ class TestWorksheet(TestCase):
                 obj = ProcessFile(file)
                 obj.get_worksheet("Category Expense")
 
-            mock_logger.error.assert_any_call(
-                "Worksheet 'Category Expense' tidak ditemukan."
+            self.assertIn(
+                "Worksheet 'Category Expense' tidak ditemukan.",
+                logged_messages(mock_logger.error),
             )
 
     def test_exception(self, mock_logger):
@@ -113,8 +122,9 @@ class TestWorksheet(TestCase):
                 obj = ProcessFile(file)
                 obj.get_worksheet("Category Expense")
 
-            mock_logger.exception.assert_any_call(
-                "Gagal mengambil worksheet: Error Worksheet"
+            self.assertIn(
+                "Gagal mengambil worksheet: Error Worksheet",
+                logged_messages(mock_logger.exception),
             )
 
     def test_header_category_invalid(self, mock_logger):
@@ -143,8 +153,9 @@ class TestWorksheet(TestCase):
                 obj = ProcessFile(file)
                 obj.get_worksheet("Category Expense")
 
-            mock_logger.exception.assert_any_call(
-                "Gagal mengambil worksheet: Header tidak sesuai untuk worksheet 'Category Expense'"
+            self.assertIn(
+                "Gagal mengambil worksheet: Header tidak sesuai untuk worksheet 'Category Expense'",
+                logged_messages(mock_logger.exception),
             )
 
     def test_header_monthly_invalid(self, mock_logger):
@@ -173,6 +184,117 @@ class TestWorksheet(TestCase):
                 obj = ProcessFile(file)
                 obj.get_worksheet("Monthly Expense")
 
-            mock_logger.exception.assert_any_call(
-                "Gagal mengambil worksheet: Header tidak sesuai untuk worksheet 'Monthly Expense'"
+            self.assertIn(
+                "Gagal mengambil worksheet: Header tidak sesuai untuk worksheet 'Monthly Expense'",
+                logged_messages(mock_logger.exception),
             )
+
+
+@override_settings(SHEETS_MIRROR=False)
+@patch("finlogic.file_processors.logger")
+class TestWorksheetRows(TestCase):
+    def setUp(self):
+        sheets_client.clear()
+
+    def get_rows(self, values, name, months):
+        with patch("finlogic.file_processors.gspread.authorize") as mock_authorize:
+            fake_gc = MagicMock()
+            self.fake_sh = MagicMock()
+            self.fake_ws = MagicMock()
+
+            mock_authorize.return_value = fake_gc
+            fake_gc.open_by_key.return_value = self.fake_sh
+            self.fake_sh.worksheet.return_value = self.fake_ws
+            set_fake_values(self.fake_sh, self.fake_ws, values)
+
+            file = {
+                "is_new_file": True,
+                "file_name": "data_1.csv",
+                "file": None,
+            }
+
+            obj = ProcessFile(file)
+            return obj.get_worksheet_rows(name, months)
+
+    def test_only_rows_with_months(self, mock_logger):
+        worksheet, rows = self.get_rows(
+            [
+                ["month", "category", "total_expense"],
+                ["2025-09", "Transportasi", 10000],
+                ["2025-10", "Makanan & Minuman", 15000],
+                ["2025-10", "Transportasi", 5000],
+                ["2025-11", "Transportasi", 20000],
+                ["2025-10", "Hiburan", 7000],
+            ],
+            "Category Expense",
+            {"2025-10"},
+        )
+
+        self.assertEqual(worksheet, self.fake_ws)
+        self.assertEqual(
+            rows,
+            {
+                3: ["2025-10", "Makanan & Minuman", 15000],
+                4: ["2025-10", "Transportasi", 5000],
+                6: ["2025-10", "Hiburan", 7000],
+            },
+        )
+        # request pertama header + kolom key, request kedua hanya kolom value baris 3-4 dan 6
+        self.fake_ws.get_all_values.assert_not_called()
+        self.fake_sh.values_batch_get.assert_any_call(
+            ["'Category Expense'!A1:C1", "'Category Expense'!A2:B"]
+        )
+        self.fake_sh.values_batch_get.assert_any_call(
+            ["'Category Expense'!C3:C4", "'Category Expense'!C6:C6"]
+        )
+
+    def test_months_not_found(self, mock_logger):
+        worksheet, rows = self.get_rows(
+            [
+                ["month", "total_expense", "avg_per_day", "days_count"],
+                ["2025-09", 120000, 6000, 20],
+            ],
+            "Monthly Expense",
+            {"2025-10"},
+        )
+
+        self.assertEqual(rows, {})
+        self.assertEqual(self.fake_sh.values_batch_get.call_count, 1)
+
+    def test_without_months(self, mock_logger):
+        with patch("finlogic.file_processors.gspread.authorize") as mock_authorize:
+            fake_gc = MagicMock()
+            fake_sh = MagicMock()
+            fake_ws = MagicMock()
+
+            mock_authorize.return_value = fake_gc
+            fake_gc.open_by_key.return_value = fake_sh
+            fake_sh.worksheet.return_value = fake_ws
+            fake_ws.get_all_values.return_value = [
+                ["month", "total_expense", "avg_per_day", "days_count"],
+                ["2025-09", 120000, 6000, 20],
+            ]
+
+            file = {
+                "is_new_file": True,
+                "file_name": "data_1.csv",
+                "file": None,
+            }
+
+            obj = ProcessFile(file)
+            worksheet, rows = obj.get_worksheet_rows("Monthly Expense")
+
+            self.assertEqual(rows, {2: ["2025-09", 120000, 6000, 20]})
+
+    def test_header_invalid(self, mock_logger):
+        with self.assertRaises(Exception):
+            self.get_rows(
+                [["category", "month", "total_expense"]],
+                "Category Expense",
+                {"2025-10"},
+            )
+
+        self.assertIn(
+            "Gagal mengambil worksheet: Header tidak sesuai untuk worksheet 'Category Expense'",
+            logged_messages(mock_logger.exception),
+        )
@@ -9,16 +9,25 @@ import tempfile
 # from django.utils.timezone import now
 # from freezegun import freeze_time
 import csv
-from finlogic.file_processors import ProcessFile
+from finlogic.file_processors import ProcessFile, sheets_client
+from finlogic.aggregators import ingest_file
 
 # import hashlib
-from finlogic.tests.helper_test import generate_dummy_file, generate_fake_hash
+from finlogic.tests.helper_test import (
+    generate_dummy_file,
+    generate_fake_hash,
+    logged_messages,
+)
 
 
 # Create your tests here.
 @patch("finlogic.file_processors.logger")
-@patch("finlogic.file_processors.hashlib.sha256")
+@patch("finlogic.hashing.hashlib.sha256")
 class TestCheckChangesDataFile(TestCase):
+    def setUp(self):
+        # client di-cache per worker, reset agar mock tiap test dipakai
+        sheets_client.clear()
+
     def test_complete_data_fields(self, mock_sha256, mock_logger):
         generate_fake_hash(mock_sha256)
 
@@ -36,27 +45,33 @@ class TestCheckChangesDataFile(TestCase):
 
                 self.assertEqual(
                     data_category,
-                    {"2025-10": {"Makanan & Minuman": [5000], "Transportasi": [10000]}},
+                    {"2025-10": {"Makanan & Minuman": 5000, "Transportasi": 10000}},
                 )
 
                 self.assertEqual(
                     data_monthly,
                     {
-                        "2025-10": {"2025-10-23": [5000, 10000]},
+                        "2025-10": {"2025-10-23": 15000},  # 5000 + 10000
                     },
                 )
 
                 mock_logger.info.assert_any_call(
                     "Melakukan pengambilan dan pengelompokkan data file"
                 )
-                mock_logger.info.assert_any_call(
-                    "Pengelompokan data dari file data_1.csv telah selesai diproses"
+                self.assertIn(
+                    "Pengelompokan data dari file data_1.csv telah selesai diproses",
+                    logged_messages(mock_logger.info),
                 )
 
-    def test_missing_data_fields(self, mock_sha256, mock_logger):
+    @patch("finlogic.validation.logger")
+    def test_missing_data_fields(
+        self, mock_validation_logger, mock_sha256, mock_logger
+    ):
         generate_fake_hash(mock_sha256)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
+        with tempfile.TemporaryDirectory() as tmpdir, override_settings(
+            QUARANTINE_DIR=Path(tmpdir) / "quarantine"
+        ):
             fake_path, dummy_file = generate_dummy_file(tmpdir)
 
             with dummy_file.open("a", newline="") as f:
@@ -74,22 +89,151 @@ class TestCheckChangesDataFile(TestCase):
 
                 self.assertEqual(
                     data_category,
-                    {"2025-10": {"Makanan & Minuman": [5000], "Transportasi": [10000]}},
+                    {"2025-10": {"Makanan & Minuman": 5000, "Transportasi": 10000}},
                 )
 
                 self.assertEqual(
                     data_monthly,
                     {
-                        "2025-10": {"2025-10-23": [5000, 10000]},
+                        "2025-10": {"2025-10-23": 15000},  # 5000 + 10000
                     },
                 )
 
                 mock_logger.info.assert_any_call(
                     "Melakukan pengambilan dan pengelompokkan data file"
                 )
-                mock_logger.warning.assert_any_call(
-                    "Baris 3: Data kosong pada field date, subcategory di file data_1.csv"
+                self.assertIn(
+                    "Pengelompokan data dari file data_1.csv telah selesai diproses",
+                    logged_messages(mock_logger.info),
                 )
-                mock_logger.info.assert_any_call(
-                    "Pengelompokan data dari file data_1.csv telah selesai diproses"
+                # 1 record ringkasan per file, bukan 1 warning per baris
+                mock_logger.warning.assert_not_called()
+                (summary,) = mock_validation_logger.warning.call_args.args
+                self.assertEqual(summary["rows_rejected"], 1)
+                self.assertEqual(summary["reasons"], {"empty_field": 1})
+                self.assertEqual(summary["fields"], {"date": 1, "subcategory": 1})
+                self.assertEqual(summary["sample_rows"], [3])
+
+                with open(summary["quarantine_file"], newline="") as f:
+                    self.assertEqual(
+                        list(csv.reader(f)),
+                        [
+                            [
+                                "row",
+                                "reason",
+                                "fields",
+                                "date",
+                                "category",
+                                "subcategory",
+                                "price",
+                            ],
+                            [
+                                "3",
+                                "empty_field",
+                                "date, subcategory",
+                                "",
+                                "Makanan & Minuman",
+                                "",
+                                "10000",
+                            ],
+                        ],
+                    )
+
+    def test_file_read_once_with_check_changes(self, mock_sha256, mock_logger):
+        generate_fake_hash(mock_sha256)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path, dummy_file = generate_dummy_file(tmpdir)
+            file = {"is_new_file": True, "file_name": "data_1.csv", "file": dummy_file}
+
+            with patch(
+                "finlogic.file_processors.ingest_file", wraps=ingest_file
+            ) as mock_ingest:
+                obj = ProcessFile(file)
+                obj.check_changes_data_file()
+                data_category, _ = obj.group_file_data()
+
+            mock_ingest.assert_called_once()
+            self.assertEqual(
+                data_category,
+                {"2025-10": {"Makanan & Minuman": 5000, "Transportasi": 10000}},
+            )
+
+    @override_settings(PARALLEL_PARSE_MIN_BYTES=0, PARALLEL_PARSE_WORKERS=2)
+    @patch("finlogic.validation.logger")
+    def test_parallel_parse_fallback(
+        self, mock_validation_logger, mock_sha256, mock_logger
+    ):
+        generate_fake_hash(mock_sha256)
+
+        with tempfile.TemporaryDirectory() as tmpdir, override_settings(
+            QUARANTINE_DIR=Path(tmpdir) / "quarantine"
+        ):
+            fake_path, dummy_file = generate_dummy_file(tmpdir)
+            with dummy_file.open("a", newline="") as f:
+                csv.writer(f).writerow(["", "Makanan & Minuman", "", 10000])
+            file = {"is_new_file": True, "file_name": "data_1.csv", "file": dummy_file}
+
+            with patch("finlogic.file_processors.ProcessPoolExecutor") as mock_pool:
+                mock_pool.return_value.__enter__.return_value.submit.side_effect = (
+                    OSError("Too many open files")
                 )
+                obj = ProcessFile(file)
+                data_category, _ = obj.group_file_data()
+
+            mock_pool.assert_called_once_with(max_workers=2)
+            self.assertEqual(
+                data_category,
+                {"2025-10": {"Makanan & Minuman": 5000, "Transportasi": 10000}},
+            )
+            self.assertEqual(obj.validation.sample_rows, [3])
+            self.assertIn(
+                "Parsing paralel tidak bisa dijalankan, chunk file diproses satu per satu: Too many open files",
+                logged_messages(mock_logger.warning),
+            )
+
+    @override_settings(PARALLEL_PARSE_MIN_BYTES=0, PARALLEL_PARSE_WORKERS=2)
+    def test_daemon_process_serial(self, mock_sha256, mock_logger):
+        # worker celery prefork > pool tidak dibuat, tidak ada warning
+        generate_fake_hash(mock_sha256)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path, dummy_file = generate_dummy_file(tmpdir)
+            file = {"is_new_file": True, "file_name": "data_1.csv", "file": dummy_file}
+
+            with patch(
+                "finlogic.file_processors.ProcessPoolExecutor"
+            ) as mock_pool, patch(
+                "finlogic.file_processors.multiprocessing.current_process"
+            ) as mock_current_process:
+                mock_current_process.return_value.daemon = True
+                obj = ProcessFile(file)
+                data_category, _ = obj.group_file_data()
+
+            mock_pool.assert_not_called()
+            mock_logger.warning.assert_not_called()
+            self.assertEqual(
+                data_category,
+                {"2025-10": {"Makanan & Minuman": 5000, "Transportasi": 10000}},
+            )
+
+    @override_settings(AGGREGATION_BACKEND="numpy")
+    def test_numpy_missing_fallback_python(self, mock_sha256, mock_logger):
+        generate_fake_hash(mock_sha256)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path, dummy_file = generate_dummy_file(tmpdir)
+            file = {"is_new_file": True, "file_name": "data_1.csv", "file": dummy_file}
+
+            with patch("finlogic.aggregators.np", None):
+                obj = ProcessFile(file)
+                data_category, _ = obj.group_file_data()
+
+            self.assertIn(
+                "Engine agregasi numpy tidak tersedia (numpy tidak terinstall), agregasi memakai engine python",
+                logged_messages(mock_logger.warning),
+            )
+            self.assertEqual(
+                data_category,
+                {"2025-10": {"Makanan & Minuman": 5000, "Transportasi": 10000}},
+            )
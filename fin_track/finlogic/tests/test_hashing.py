@@ -0,0 +1,55 @@
+from django.test import SimpleTestCase, override_settings
+from django.core.management import call_command
+from io import StringIO
+from unittest.mock import patch
+from pathlib import Path
+import tempfile
+import hashlib
+from finlogic.hashing import file_digest, mmap_digest, new_hasher
+
+
+class TestHashing(SimpleTestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = Path(tmpdir.name) / "data_1.csv"
+        self.data = b"date,category,subcategory,price\n" * 1000
+        self.path.write_bytes(self.data)
+
+    def test_file_digest_and_mmap_digest(self):
+        expected = {
+            "sha256": hashlib.sha256(self.data).hexdigest(),
+            "blake2b": hashlib.blake2b(self.data, digest_size=32).hexdigest(),
+        }
+        for algorithm, digest in expected.items():
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(file_digest(self.path, algorithm), digest)
+                # potongan kecil agar file di hash dalam beberapa chunk
+                with patch("finlogic.hashing.CHUNK_SIZE", 1000):
+                    self.assertEqual(mmap_digest(self.path, algorithm), digest)
+                self.assertEqual(len(digest), 64)
+
+    def test_empty_file(self):
+        self.path.write_bytes(b"")
+
+        self.assertEqual(mmap_digest(self.path), hashlib.sha256(b"").hexdigest())
+        self.assertEqual(file_digest(self.path), hashlib.sha256(b"").hexdigest())
+
+    @override_settings(FILE_HASH_ALGORITHM="blake2b")
+    def test_algorithm_from_settings(self):
+        self.assertEqual(new_hasher().name, "blake2b")
+        self.assertEqual(new_hasher("sha256").name, "sha256")
+
+    def test_unknown_algorithm(self):
+        with self.assertRaisesMessage(ValueError, "Algoritma hash tidak didukung: md5"):
+            new_hasher("md5")
+
+    def test_bench_hash_command(self):
+        out = StringIO()
+        call_command(
+            "bench_hash", "--path", str(self.path), "--repeat", "1", stdout=out
+        )
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 7)
+        self.assertTrue(lines[1].startswith("sha256   read 4KB"))
@@ -0,0 +1,88 @@
+from django.test import SimpleTestCase
+import json
+import logging
+import sys
+from fin_track.jsonlog import JSONFormatter
+
+
+def make_record(msg, *args, level=logging.INFO, exc_info=None, **extra):
+    record = logging.getLogger("fintrack").makeRecord(
+        "fintrack", level, __file__, 1, msg, args, exc_info, "process", extra
+    )
+    record.created = 1760000000.5
+    return record
+
+
+class TestJSONFormatter(SimpleTestCase):
+    def setUp(self):
+        self.formatter = JSONFormatter(datefmt="%Y-%m-%d %H:%M:%S")
+
+    def format(self, record):
+        return json.loads(self.formatter.format(record))
+
+    def test_message_args(self):
+        data = self.format(make_record("Hash file berhasil dibuat: %s", "abc"))
+
+        self.assertEqual(list(data), ["timestamp", "name", "level", "func", "event"])
+        self.assertEqual(data["event"], "Hash file berhasil dibuat: abc")
+        self.assertEqual(data["name"], "fintrack")
+        self.assertEqual(data["level"], "INFO")
+        self.assertEqual(data["func"], "process")
+
+    def test_dict_message(self):
+        data = self.format(make_record({"type": "run_stats", "rows": 3}))
+
+        self.assertEqual(data["event"], {"type": "run_stats", "rows": 3})
+
+    def test_exception_and_stack(self):
+        try:
+            raise ValueError("rusak")
+        except ValueError:
+            record = make_record("gagal", level=logging.ERROR, exc_info=sys.exc_info())
+        record.stack_info = "Stack (most recent call last):\n  baris"
+
+        data = self.format(record)
+
+        self.assertIn("ValueError: rusak", data["exc_info"])
+        self.assertEqual(data["stack_info"], record.stack_info)
+
+    def test_extra_fields(self):
+        data = self.format(
+            make_record(
+                "%s chunk file tidak berubah",
+                2,
+                file_name="data_1.csv",
+                stage="parse",
+                path=object,
+            )
+        )
+
+        self.assertEqual(data["event"], "2 chunk file tidak berubah")
+        self.assertEqual(data["file_name"], "data_1.csv")
+        self.assertEqual(data["stage"], "parse")
+        # nilai yang tidak bisa di json-kan ditulis sebagai string
+        self.assertEqual(data["path"], "<class 'object'>")
+
+    def test_same_output_as_json_dumps(self):
+        record = make_record("Data file berubah")
+
+        self.assertEqual(
+            self.formatter.format(record),
+            json.dumps(
+                {
+                    "timestamp": self.formatter.formatTime(
+                        record, self.formatter.datefmt
+                    ),
+                    "name": "fintrack",
+                    "level": "INFO",
+                    "func": "process",
+                    "event": "Data file berubah",
+                }
+            ),
+        )
+        # timestamp di cache per detik
+        record.created += 0.2
+        self.assertEqual(
+            self.format(record)["timestamp"],
+            self.formatter.formatTime(record, self.formatter.datefmt),
+        )
@@ -0,0 +1,78 @@
+from django.test import SimpleTestCase
+from logging.handlers import QueueListener
+from pathlib import Path
+import gzip
+import json
+import logging
+import tempfile
+from fin_track.jsonlog import JSONFormatter
+from fin_track.logqueue import (
+    BackgroundQueueHandler,
+    GzipRotatingFileHandler,
+    stop_listeners,
+)
+
+
+class TestGzipRotatingFileHandler(SimpleTestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = Path(tmpdir.name) / "debug.log"
+
+    def test_rotated_files_compressed(self):
+        handler = GzipRotatingFileHandler(self.path, maxBytes=100, backupCount=2)
+        for i in range(10):
+            handler.emit(logging.makeLogRecord({"msg": f"baris {i} " + "x" * 40}))
+        handler.close()
+
+        rotated = sorted(p.name for p in self.path.parent.iterdir())
+        self.assertEqual(rotated, ["debug.log", "debug.log.1.gz", "debug.log.2.gz"])
+        with gzip.open(self.path.parent / "debug.log.1.gz", "rt") as f:
+            self.assertIn("baris 7", f.read())
+
+
+class TestBackgroundQueueHandler(SimpleTestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = Path(tmpdir.name) / "debug.log"
+
+        self.file_handler = GzipRotatingFileHandler(self.path)
+        self.file_handler.setFormatter(JSONFormatter())
+        self.handler = BackgroundQueueHandler()
+        self.handler.listener = QueueListener(
+            self.handler.queue, self.file_handler, respect_handler_level=True
+        )
+        self.addCleanup(self.handler.close)
+        self.addCleanup(self.file_handler.close)
+
+        self.logger = logging.getLogger("fintrack.test_logqueue")
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def read(self):
+        return [json.loads(line) for line in self.path.read_text().splitlines()]
+
+    def test_records_written_by_listener(self):
+        self.logger.warning({"file_name": "data_1.csv", "rows": 3})
+        try:
+            raise ValueError("x")
+        except ValueError:
+            self.logger.exception("gagal")
+
+        stop_listeners()
+
+        records = self.read()
+        # msg dict tidak diubah menjadi string oleh QueueHandler
+        self.assertEqual(records[0]["event"], {"file_name": "data_1.csv", "rows": 3})
+        self.assertEqual(records[1]["event"], "gagal")
+        self.assertEqual(len(records), 2)
+
+    def test_restart_after_stop(self):
+        self.logger.info("pertama")
+        stop_listeners()
+        self.logger.info("kedua")
+        self.handler.close()
+
+        self.assertEqual([r["event"] for r in self.read()], ["pertama", "kedua"])
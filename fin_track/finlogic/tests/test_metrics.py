@@ -0,0 +1,162 @@
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from unittest.mock import MagicMock, patch
+from finlogic import metrics
+from finlogic.metrics import (
+    MemoryBackend,
+    RedisBackend,
+    get_backend,
+    observe,
+    record_run,
+    render,
+)
+from finlogic.tests.helper_test import logged_messages
+from finlogic.utils import send_mail_task
+
+
+def run_record(outcome="success", wall_time=0.3, **counters):
+    return {
+        "outcome": outcome,
+        "wall_time": wall_time,
+        "stages": {"parse": {"wall": 0.2, "cpu": 0.1}},
+        "counters": counters,
+    }
+
+
+@override_settings(METRICS_BACKEND="memory", METRICS_REDIS_URL=None)
+class TestMetrics(SimpleTestCase):
+    def setUp(self):
+        get_backend().clear()
+
+    def test_histogram_buckets_cumulative(self):
+        updates = {}
+
+        observe(updates, "durasi", 0.3, buckets=(0.1, 0.5, 1), outcome="success")
+
+        self.assertEqual(
+            updates,
+            {
+                'durasi_bucket{outcome="success",le="0.5"}': 1,
+                'durasi_bucket{outcome="success",le="1"}': 1,
+                'durasi_bucket{outcome="success",le="+Inf"}': 1,
+                'durasi_sum{outcome="success"}': 0.3,
+                'durasi_count{outcome="success"}': 1,
+            },
+        )
+
+    def test_record_run_rendered(self):
+        record_run(run_record(rows_read=100, mirror_hits=3, mirror_misses=1))
+        record_run(run_record(outcome="failed", wall_time=40, api_errors=1))
+
+        text = render()
+
+        self.assertIn('fintrack_runs_total{outcome="success"} 1\n', text)
+        self.assertIn('fintrack_runs_total{outcome="failed"} 1\n', text)
+        self.assertIn("# TYPE fintrack_task_duration_seconds histogram\n", text)
+        self.assertIn(
+            'fintrack_task_duration_seconds_bucket{outcome="failed",le="60"} 1\n', text
+        )
+        self.assertNotIn(
+            'fintrack_task_duration_seconds_bucket{outcome="failed",le="30"}', text
+        )
+        self.assertIn('fintrack_stage_duration_seconds_count{stage="parse"} 2\n', text)
+        self.assertIn("fintrack_rows_read_total 100\n", text)
+        self.assertIn("fintrack_sheets_api_errors_total 1\n", text)
+        self.assertIn("fintrack_mirror_hit_ratio 0.75\n", text)
+        self.assertIn("fintrack_metrics_backend_up 1\n", text)
+
+    def test_bucket_order(self):
+        record_run(run_record(wall_time=0.3))
+
+        lines = [
+            line
+            for line in render().splitlines()
+            if line.startswith(
+                'fintrack_task_duration_seconds_bucket{outcome="success"'
+            )
+        ]
+
+        self.assertTrue(
+            lines[0].startswith(
+                'fintrack_task_duration_seconds_bucket{outcome="success",le="0.5"}'
+            )
+        )
+        self.assertTrue(lines[-1].endswith('le="+Inf"} 1'))
+
+    def test_email_queue_depth(self):
+        for _ in range(3):
+            metrics.count_mail_published(sender=send_mail_task.name)
+        metrics.count_mail_sent(sender=send_mail_task)
+        metrics.count_mail_failed(sender=send_mail_task)
+        # task lain tidak dihitung
+        metrics.count_mail_published(sender="finlogic.tasks.other_task")
+
+        text = render()
+
+        self.assertIn("fintrack_emails_enqueued_total 3\n", text)
+        self.assertIn("fintrack_email_queue_depth 1\n", text)
+
+    @patch("finlogic.metrics.logger")
+    def test_backend_down(self, mock_logger):
+        with patch.object(MemoryBackend, "snapshot", side_effect=OSError("down")):
+            text = render()
+
+        self.assertIn("fintrack_metrics_backend_up 0\n", text)
+        self.assertEqual(
+            logged_messages(mock_logger.warning),
+            ["Backend metric tidak bisa dibaca: down"],
+        )
+
+    def test_view(self):
+        record_run(run_record(rows_read=5))
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4")
+        self.assertContains(response, "fintrack_rows_read_total 5")
+
+    @override_settings(METRICS_TOKEN="rahasia")
+    def test_view_token(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        response = self.client.get(
+            reverse("metrics"), headers={"Authorization": "Bearer rahasia"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @patch.object(metrics, "_backend", None)
+    @patch("finlogic.metrics.logger")
+    def test_memory_backend_warning(self, mock_logger):
+        # backend memori hanya berisi metric proses ini, warning dicatat 1 kali
+        get_backend()
+        get_backend()
+
+        mock_logger.warning.assert_called_once()
+        self.assertIn("memori proses", mock_logger.warning.call_args.args[0])
+
+
+class TestRedisBackend(SimpleTestCase):
+    @patch("redis.Redis.from_url")
+    def test_incr_and_snapshot(self, mock_from_url):
+        client = mock_from_url.return_value
+        client.hgetall.return_value = {b"fintrack_rows_read_total": b"12"}
+        backend = RedisBackend("redis://localhost:6379/1")
+
+        backend.incr({"fintrack_rows_read_total": 12})
+
+        pipe = client.pipeline.return_value
+        pipe.hincrbyfloat.assert_called_once_with(
+            "fintrack:metrics", "fintrack_rows_read_total", 12
+        )
+        pipe.execute.assert_called_once()
+        self.assertEqual(backend.snapshot(), {"fintrack_rows_read_total": 12.0})
+
+    @override_settings(
+        METRICS_BACKEND="redis", METRICS_REDIS_URL="redis://localhost:6379/1"
+    )
+    @patch("redis.Redis.from_url", return_value=MagicMock())
+    def test_get_backend(self, mock_from_url):
+        self.assertIsInstance(get_backend(), RedisBackend)
+        mock_from_url.assert_called_once_with(
+            "redis://localhost:6379/1", socket_timeout=0.5, socket_connect_timeout=0.5
+        )
@@ -0,0 +1,145 @@
+from django.test import TestCase, override_settings
+from django.core import mail
+from unittest.mock import patch
+from smtplib import SMTPException
+from celery.exceptions import Retry
+from freezegun import freeze_time
+from finlogic.models import Notification
+from finlogic.notifications import notify
+from finlogic.tasks import send_notification_digest_task
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    SENDER_EMAIL="system@example.com",
+    TARGETS_EMAIL=["a@example.com", "b@example.com"],
+    CELERY_TASK_ALWAYS_EAGER=True,
+    NOTIFICATION_DIGEST=True,
+    NOTIFICATION_DEDUPE_WINDOW=3600,
+)
+@patch("finlogic.notifications.logger")
+class TestNotifications(TestCase):
+    def test_queued_per_recipient(self, mock_logger):
+        notify("Data File Tidak Berubah", "pesan")
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            sorted(Notification.objects.values_list("recipient", flat=True)),
+            ["a@example.com", "b@example.com"],
+        )
+
+    def test_critical_sent_immediately(self, mock_logger):
+        notify("Gagal Memproses File CSV", "error", critical=True)
+
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["a@example.com", "b@example.com"])
+
+    def test_dedupe_within_window(self, mock_logger):
+        with freeze_time("2025-11-01 08:00:00"):
+            notify("Data File Tidak Berubah", "pesan")
+        with freeze_time("2025-11-01 08:30:00"):
+            notify("Data File Tidak Berubah", "pesan")
+            notify("Data File Tidak Berubah", "pesan lain")
+        with freeze_time("2025-11-01 09:30:00"):
+            # di luar window 1 jam dari notifikasi pertama
+            notify("Data File Tidak Berubah", "pesan")
+
+        counts = list(
+            Notification.objects.filter(recipient="a@example.com").values_list(
+                "message", "count"
+            )
+        )
+        self.assertEqual(counts, [("pesan", 2), ("pesan lain", 1), ("pesan", 1)])
+
+    def test_sent_notification_not_merged(self, mock_logger):
+        # notifikasi yang sudah terkirim di window yang sama tidak menelan pesan baru
+        with freeze_time("2025-11-01 08:00:00"):
+            notify("Data File Tidak Berubah", "pesan")
+            send_notification_digest_task()
+        with freeze_time("2025-11-01 08:30:00"):
+            notify("Data File Tidak Berubah", "pesan")
+            self.assertEqual(send_notification_digest_task(), 2)
+
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertEqual(
+            list(Notification.objects.values_list("count", flat=True)), [1, 1, 1, 1]
+        )
+
+    def test_digest_one_connection(self, mock_logger):
+        notify("Data File Tidak Berubah", "pesan")
+        notify("Data File Tidak Berubah", "pesan")
+        notify("Data File Berhasil di Proses", "berhasil")
+
+        with patch(
+            "finlogic.notifications.get_connection",
+            wraps=mail.get_connection,
+        ) as mock_connection:
+            self.assertEqual(send_notification_digest_task(), 2)
+
+        mock_connection.assert_called_once_with()
+        self.assertEqual(
+            [email.to for email in mail.outbox], [["a@example.com"], ["b@example.com"]]
+        )
+        email = mail.outbox[0]
+        self.assertEqual(
+            email.subject, "Ringkasan Notifikasi Sistem Monitoring File (2 pesan)"
+        )
+        self.assertIn("== Data File Tidak Berubah (2x, terakhir", email.body)
+        self.assertIn("== Data File Berhasil di Proses ==\nberhasil", email.body)
+        self.assertFalse(Notification.objects.filter(sent_at__isnull=True).exists())
+
+        # notifikasi yang sudah terkirim tidak dikirim ulang
+        self.assertEqual(send_notification_digest_task(), 0)
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_single_notification_keeps_subject(self, mock_logger):
+        notify("Data File Tidak Berubah", "pesan")
+
+        send_notification_digest_task()
+
+        self.assertEqual(mail.outbox[0].subject, "Data File Tidak Berubah")
+        self.assertEqual(mail.outbox[0].body, "pesan")
+
+    def test_digest_retry_on_smtp_error(self, mock_logger):
+        notify("Data File Tidak Berubah", "pesan")
+
+        with patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=[1, SMTPException("putus")],
+        ), patch.object(
+            send_notification_digest_task, "retry", side_effect=Retry
+        ) as mock_retry:
+            with self.assertRaises(Retry):
+                send_notification_digest_task.run()
+
+        self.assertEqual(mock_retry.call_args.kwargs["countdown"], 60)
+        # penerima pertama sudah terkirim, retry hanya mengirim penerima yang belum
+        self.assertEqual(
+            list(
+                Notification.objects.filter(sent_at__isnull=True).values_list(
+                    "recipient", flat=True
+                )
+            ),
+            ["b@example.com"],
+        )
+
+    @override_settings(NOTIFICATION_RETENTION_DAYS=30)
+    def test_sent_notifications_cleaned_up(self, mock_logger):
+        with freeze_time("2025-10-01 08:00:00"):
+            notify("Data File Tidak Berubah", "lama")
+            send_notification_digest_task()
+        with freeze_time("2025-11-05 08:00:00"):
+            notify("Data File Tidak Berubah", "baru")
+            send_notification_digest_task()
+
+        self.assertEqual(
+            set(Notification.objects.values_list("message", flat=True)), {"baru"}
+        )
+
+    @override_settings(NOTIFICATION_DIGEST=False)
+    def test_digest_disabled(self, mock_logger):
+        notify("Data File Tidak Berubah", "pesan")
+
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(len(mail.outbox), 1)
@@ -0,0 +1,133 @@
+from django.test import SimpleTestCase
+from finlogic.planners import (
+    category_totals,
+    monthly_totals,
+    merge_category_totals,
+    merge_monthly_totals,
+    plan_category_expense,
+    plan_monthly_expense,
+)
+
+
+class TestPlanCategoryExpense(SimpleTestCase):
+    def test_merge_new_total_and_previous_total(self):
+        lookup = {
+            ("2025-10", "Makanan & Minuman"): [2, 20000],
+            ("2025-10", "Transportasi"): [3, 10000],
+        }
+        grouped = {"2025-10": {"Transportasi": 15000, "Hiburan": 75000}}
+        previous = {"2025-10|Makanan & Minuman": 5000, "2025-10|Transportasi": 10000}
+
+        latest_data = category_totals(grouped)
+        rows_for_update, rows_for_append = plan_category_expense(
+            lookup, latest_data, previous
+        )
+
+        # update hasil grouping dulu, lalu baris yang hanya dikurangi
+        self.assertEqual(
+            rows_for_update,
+            [
+                {"range": "C3", "values": [[15000]]},  # 10000 + (15000 - 10000)
+                {"range": "C2", "values": [[15000]]},  # 20000 - 5000
+            ],
+        )
+        self.assertEqual(rows_for_append, [["2025-10", "Hiburan", 75000]])
+        self.assertEqual(
+            latest_data, {"2025-10|Transportasi": 15000, "2025-10|Hiburan": 75000}
+        )
+
+    def test_unchanged_total_not_updated(self):
+        lookup = {("2025-10", "Transportasi"): [2, 30000]}
+        grouped = {"2025-10": {"Transportasi": 10000}}
+        previous = {"2025-10|Transportasi": 10000}
+
+        rows_for_update, rows_for_append = plan_category_expense(
+            lookup, category_totals(grouped), previous
+        )
+
+        self.assertEqual(rows_for_update, [])
+        self.assertEqual(rows_for_append, [])
+
+    def test_category_with_separator(self):
+        lookup = {("2025-10", "Makan|Minum"): [2, 20000]}
+
+        rows_for_update, _ = plan_category_expense(
+            lookup, {}, {"2025-10|Makan|Minum": 5000}
+        )
+
+        self.assertEqual(rows_for_update, [{"range": "C2", "values": [[15000]]}])
+
+
+class TestPlanMonthlyExpense(SimpleTestCase):
+    def test_merge_new_total_and_previous_total(self):
+        lookup = {"2025-09": [2, 125000, 21], "2025-10": [3, 10000, 1]}
+        grouped = {"2025-09": {"2025-09-21": 5000, "2025-09-24": 10000}}
+        previous = {
+            "2025-09": {"total_new": 5000, "days_count_new": 1},
+            "2025-10": {"total_new": 10000, "days_count_new": 1},
+        }
+
+        latest_data = monthly_totals(grouped)
+        rows_for_update, rows_for_append = plan_monthly_expense(
+            lookup, latest_data, previous
+        )
+
+        self.assertEqual(
+            rows_for_update,
+            [
+                {"range": "B2:D2", "values": [[135000, 6136, 22]]},
+                {"range": "B3:D3", "values": [[0, 0, 0]]},
+            ],
+        )
+        self.assertEqual(rows_for_append, [])
+        self.assertEqual(
+            latest_data, {"2025-09": {"total_new": 15000, "days_count_new": 2}}
+        )
+
+    def test_unchanged_month_not_updated(self):
+        lookup = {"2025-10": [2, 30000, 3]}
+        grouped = {"2025-10": {"2025-10-01": 4000, "2025-10-02": 6000}}
+        previous = {"2025-10": {"total_new": 10000, "days_count_new": 2}}
+
+        rows_for_update, rows_for_append = plan_monthly_expense(
+            lookup, monthly_totals(grouped), previous
+        )
+
+        self.assertEqual(rows_for_update, [])
+        self.assertEqual(rows_for_append, [])
+
+    def test_previous_only_average_is_int(self):
+        lookup = {"2025-10": [2, 30000, 3]}
+
+        rows_for_update, _ = plan_monthly_expense(
+            lookup, {}, {"2025-10": {"total_new": 10000, "days_count_new": 1}}
+        )
+
+        self.assertEqual(
+            rows_for_update, [{"range": "B2:D2", "values": [[20000, 10000, 2]]}]
+        )
+
+
+class TestMergeTotals(SimpleTestCase):
+    def test_merge_category_totals(self):
+        self.assertEqual(
+            merge_category_totals(
+                [
+                    {"2025-10|Transportasi": 10000},
+                    {"2025-10|Transportasi": 5000, "2025-10|Hiburan": 7000},
+                ]
+            ),
+            {"2025-10|Transportasi": 15000, "2025-10|Hiburan": 7000},
+        )
+
+    def test_merge_monthly_totals_count_days_per_file(self):
+        # tanggal yang sama di 2 file dihitung 2 hari seperti diproses satu per satu
+        totals = [
+            monthly_totals({"2025-10": {"2025-10-23": 5000}}),
+            monthly_totals({"2025-10": {"2025-10-23": 3000, "2025-10-24": 2000}}),
+        ]
+
+        self.assertEqual(
+            merge_monthly_totals(totals),
+            {"2025-10": {"total_new": 10000, "days_count_new": 3}},
+        )
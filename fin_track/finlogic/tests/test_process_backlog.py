@@ -0,0 +1,185 @@
+from django.test import TestCase, override_settings
+from django.core import mail
+from unittest.mock import patch
+from pathlib import Path
+import tempfile
+import csv
+from finlogic.models import FileIntegrity
+from finlogic.tasks import send_notification_digest_task
+from finlogic.file_processors import ProcessBacklog, ProcessFile, sheets_client
+from finlogic.tests.helper_test import logged_messages, patch_sheets
+
+
+def write_file(path, rows):
+    with path.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "category", "subcategory", "price"])
+        writer.writerows(rows)
+
+
+@override_settings(
+    CELERY_TASK_ALWAYS_EAGER=True,
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    SHEETS_MIRROR=False,
+    BACKLOG_WORKERS=1,
+)
+@patch("finlogic.file_processors.logger")
+class TestProcessBacklog(TestCase):
+    def setUp(self):
+        sheets_client.clear()
+        self.sheets = {
+            "Category Expense": [
+                ["month", "category", "total_expense"],
+                ["2025-10", "Transportasi", "20000"],
+            ],
+            "Monthly Expense": [
+                ["month", "total_expense", "avg_per_day", "days_count"],
+                ["2025-10", "20000", "10000", "2"],
+            ],
+        }
+
+        self.fake_sh, self.fake_ws = patch_sheets(self, self.sheets)
+
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        fake_path = Path(tmpdir.name)
+        self.enterContext(override_settings(QUARANTINE_DIR=fake_path / "quarantine"))
+        self.enterContext(patch("finlogic.validation.logger"))
+        self.files = []
+        for name, rows in [
+            (
+                "data_2.csv",
+                [
+                    ["2025-10-23", "Transportasi", "Tiket Umum", 5000],
+                    ["2025-10-23", "Hiburan", "Bioskop", 50000],
+                ],
+            ),
+            (
+                "data_3.csv",
+                [
+                    ["2025-10-23", "Transportasi", "Tiket Umum", 3000],
+                    ["2025-10-24", "", "Bensin", 7000],
+                ],
+            ),
+        ]:
+            write_file(fake_path / name, rows)
+            self.files.append(
+                {"is_new_file": True, "file_name": name, "file": fake_path / name}
+            )
+
+    def process(self):
+        obj = ProcessBacklog(self.files)
+        self.assertTrue(obj.check_changes_data_file())
+        obj.group_file_data()
+        plans = obj.process_sheets()
+        obj.change_data_model()
+        obj.send_email_success()
+        return obj, plans
+
+    def test_one_combined_update(self, mock_logger):
+        obj, plans = self.process()
+
+        self.assertEqual(
+            plans["Category Expense"],
+            (
+                [{"range": "C2", "values": [[28000]]}],
+                [["2025-10", "Hiburan", 50000]],
+            ),
+        )
+        # 2025-10-23 ada di 2 file, dihitung 2 hari seperti diproses satu per satu
+        self.assertEqual(
+            plans["Monthly Expense"],
+            ([{"range": "B2:D2", "values": [[78000, 19500, 4]]}], []),
+        )
+        self.fake_sh.values_batch_update.assert_called_once()
+        send_notification_digest_task()
+        self.assertEqual(obj.validations["data_2.csv"].rejected, 0)
+        self.assertEqual(obj.validations["data_3.csv"].sample_rows, [2])
+        self.assertEqual(obj.validations["data_3.csv"].fields, {"category": 1})
+        # ringkasan baris yang dilewati ikut dikirim di email
+        self.assertIn(
+            "File data_3.csv: 1 baris data dilewati\n- Field kosong: 1 baris\n"
+            "Field kosong: category (1)\nContoh nomor baris: 2",
+            mail.outbox[0].body,
+        )
+
+    def test_file_integrity_per_file(self, mock_logger):
+        self.process()
+
+        self.assertEqual(
+            list(FileIntegrity.objects.values_list("filename", flat=True)),
+            ["data_2.csv", "data_3.csv"],
+        )
+        data_2 = FileIntegrity.objects.get(filename="data_2.csv")
+        self.assertEqual(
+            data_2.latest_category_expense_data,
+            {"2025-10|Transportasi": 5000, "2025-10|Hiburan": 50000},
+        )
+        self.assertEqual(
+            data_2.latest_monthly_expense_data,
+            {"2025-10": {"total_new": 55000, "days_count_new": 1}},
+        )
+        data_3 = FileIntegrity.objects.get(filename="data_3.csv")
+        self.assertEqual(
+            data_3.latest_category_expense_data, {"2025-10|Transportasi": 3000}
+        )
+
+    def test_last_file_reprocessed_after_backlog(self, mock_logger):
+        self.process()
+        self.sheets["Category Expense"][1][2] = "28000"
+
+        # data_3.csv berubah > hanya selisih data_3.csv yang dikirim
+        write_file(
+            self.files[1]["file"], [["2025-10-23", "Transportasi", "Tiket Umum", 4000]]
+        )
+        obj = ProcessFile({**self.files[1], "is_new_file": False})
+        obj.check_changes_data_file()
+        obj.group_file_data()
+        plans = obj.process_sheets(["Category Expense"])
+
+        self.assertEqual(
+            plans["Category Expense"], ([{"range": "C2", "values": [[29000]]}], [])
+        )
+
+    @override_settings(BACKLOG_WORKERS=2)
+    def test_parallel_parsing(self, mock_logger):
+        obj = ProcessBacklog(self.files)
+        grouped_data_category, grouped_monthly_data = obj.group_file_data()
+
+        self.assertEqual(
+            grouped_data_category,
+            {"2025-10": {"Transportasi": 8000, "Hiburan": 50000}},
+        )
+        self.assertEqual(grouped_monthly_data, {"2025-10": {"2025-10-23": 58000}})
+
+    @override_settings(BACKLOG_WORKERS=2)
+    @patch("finlogic.file_processors.ProcessPoolExecutor")
+    def test_parallel_fallback(self, mock_pool, mock_logger):
+        mock_pool.side_effect = OSError("Too many open files")
+        obj = ProcessBacklog(self.files)
+        grouped_data_category, _ = obj.group_file_data()
+
+        self.assertEqual(
+            grouped_data_category,
+            {"2025-10": {"Transportasi": 8000, "Hiburan": 50000}},
+        )
+        self.assertIn(
+            "Parsing paralel tidak bisa dijalankan, file diproses satu per satu: Too many open files",
+            logged_messages(mock_logger.warning),
+        )
+
+    @override_settings(BACKLOG_WORKERS=None)
+    @patch("finlogic.file_processors.multiprocessing.current_process")
+    @patch("finlogic.file_processors.ProcessPoolExecutor")
+    def test_daemon_process_serial(self, mock_pool, mock_current_process, mock_logger):
+        # worker celery prefork > pool tidak dibuat, tidak ada warning
+        mock_current_process.return_value.daemon = True
+        obj = ProcessBacklog(self.files)
+        grouped_data_category, _ = obj.group_file_data()
+
+        mock_pool.assert_not_called()
+        mock_logger.warning.assert_not_called()
+        self.assertEqual(
+            grouped_data_category,
+            {"2025-10": {"Transportasi": 8000, "Hiburan": 50000}},
+        )
@@ -2,8 +2,13 @@ from django.test import TestCase, override_settings
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 import tempfile
-from finlogic.file_processors import ProcessFile
-from finlogic.tests.helper_test import generate_dummy_file, generate_fake_hash
+from finlogic.file_processors import ProcessFile, sheets_client
+from finlogic.tests.helper_test import (
+    generate_dummy_file,
+    generate_fake_hash,
+    logged_messages,
+    set_fake_values,
+)
 import tempfile
 from django.conf import settings
 import json
@@ -21,7 +26,11 @@ from finlogic.models import FileIntegrity
 )
 @patch("finlogic.file_processors.logger")
 class TestWorksheet(TestCase):
-    @patch("finlogic.file_processors.hashlib.sha256")
+    def setUp(self):
+        # client di-cache per worker, reset agar mock tiap test dipakai
+        sheets_client.clear()
+
+    @patch("finlogic.hashing.hashlib.sha256")
     def test_success(self, mock_sha256, mock_logger):
         generate_fake_hash(mock_sha256)
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -37,10 +46,11 @@ class TestWorksheet(TestCase):
                 fake_sh.worksheet.return_value = fake_ws
 
                 # value palsu google sheets
-                fake_ws.get_all_values.return_value = [
+                get_all_values_default = [
                     ["month", "category", "total_expense"],
                     ["2025-10", "Makanan & Minuman", 15000],
                 ]
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 file = {
                     "is_new_file": True,
@@ -64,8 +74,9 @@ class TestWorksheet(TestCase):
 
                 self.assertEqual(rows_for_append, [["2025-10", "Transportasi", 10000]])
 
-                mock_logger.info.assert_any_call(
-                    "Memulai pemrosesan file sheets bagian Category Expense"
+                self.assertIn(
+                    "Memulai pemrosesan file sheets bagian Category Expense",
+                    logged_messages(mock_logger.info),
                 )
                 mock_logger.info.assert_any_call(
                     "Data bagian yang di update berhasil di upload"
@@ -97,7 +108,7 @@ class TestWorksheet(TestCase):
                     ["2025-10", "Makanan & Minuman", 15000],
                 ]
 
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 file = {
                     "is_new_file": True,
@@ -137,7 +148,7 @@ class TestWorksheet(TestCase):
                 for item in rows_for_append:
                     get_all_values_default.append(item)
 
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 # tambah data file csv agar ada perubahan data
                 with dummy_file.open("a", newline="") as f:
@@ -160,19 +171,8 @@ class TestWorksheet(TestCase):
                     )
                     obj.change_data_model()
 
-                # 15000 dari value fake_ws
-                # 5000 dari generate_dummy_file
-                # 10000 data baru Transportasi hasil rows_for_append
-                self.assertEqual(
-                    rows_for_update,
-                    [
-                        {"range": "C2", "values": [[20000]]},  # 15000 + 5000
-                        {
-                            "range": "C3",
-                            "values": [[10000]],  # Transportasi
-                        },
-                    ],
-                )
+                # Makanan & Minuman dan Transportasi tidak berubah jadi tidak di update
+                self.assertEqual(rows_for_update, [])
 
                 self.assertEqual(
                     rows_for_append, [["2025-10", "Hiburan & Gaya Hidup", 75000]]
@@ -212,7 +212,7 @@ class TestWorksheet(TestCase):
                     ["2025-10", "Makanan & Minuman", 15000],
                 ]
 
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 file = {
                     "is_new_file": True,
@@ -252,7 +252,7 @@ class TestWorksheet(TestCase):
                 for item in rows_for_append:
                     get_all_values_default.append(item)
 
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 # ubah data file csv
                 with dummy_file.open("w", newline="") as f:
@@ -280,15 +280,10 @@ class TestWorksheet(TestCase):
                 # 15000 dari value fake_ws
                 # 5000 dari generate_dummy_file
                 # ubah 5000 jadi 10000
+                # Transportasi tidak berubah jadi tidak di update
                 self.assertEqual(
                     rows_for_update,
-                    [
-                        {"range": "C2", "values": [[25000]]},  # 15000 + 10000
-                        {
-                            "range": "C3",
-                            "values": [[10000]],  # Transportasi
-                        },
-                    ],
+                    [{"range": "C2", "values": [[25000]]}],  # 15000 + 10000
                 )
 
                 self.assertEqual(rows_for_append, [])
@@ -322,7 +317,7 @@ class TestWorksheet(TestCase):
                     ["2025-10", "Makanan & Minuman", 15000],
                 ]
 
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 file = {
                     "is_new_file": True,
@@ -362,7 +357,7 @@ class TestWorksheet(TestCase):
                 for item in rows_for_append:
                     get_all_values_default.append(item)
 
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 # ubah data file csv
                 with dummy_file.open("w", newline="") as f:
@@ -432,7 +427,7 @@ class TestWorksheet(TestCase):
                     ["2025-10", "Makanan & Minuman", 15000],
                 ]
 
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 file = {
                     "is_new_file": True,
@@ -472,7 +467,7 @@ class TestWorksheet(TestCase):
                 for item in rows_for_append:
                     get_all_values_default.append(item)
 
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 # ubah data file csv > ubah month
                 with dummy_file.open("w", newline="") as f:
@@ -500,13 +495,10 @@ class TestWorksheet(TestCase):
                 # 15000 dari value fake_ws kategori makanan
                 # 5000 dari generate_dummy_file di ubah month nya dari bulan 10 > 11
                 # tadinya 20000 karena month berubah -5000
+                # Transportasi tidak berubah jadi tidak di update
                 self.assertEqual(
                     rows_for_update,
                     [
-                        {
-                            "range": "C3",
-                            "values": [[10000]],  # Transportasi
-                        },
                         {
                             # range makanan -5000 karena monthnya di ubah
                             "range": "C2",
@@ -544,7 +536,7 @@ class TestWorksheet(TestCase):
                     ["2025-10", "Makanan & Minuman", 15000],
                 ]
 
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 fake_response = MagicMock()
                 fake_response.json.return_value = {
@@ -553,7 +545,7 @@ class TestWorksheet(TestCase):
                 fake_response.text = "API Error"
                 fake_response.status_code = 500
 
-                fake_ws.batch_update.side_effect = gspread.exceptions.APIError(
+                fake_sh.values_batch_update.side_effect = gspread.exceptions.APIError(
                     fake_response
                 )
 
@@ -572,8 +564,9 @@ class TestWorksheet(TestCase):
                         )
                     obj.change_data_model()
 
-                mock_logger.exception.assert_any_call(
-                    "API error saat mengubah sheet: APIError: [Error]: API Error"
+                self.assertIn(
+                    "API error saat mengubah sheet: APIError: [Error]: API Error",
+                    logged_messages(mock_logger.exception),
                 )
 
     def test_except_error(self, mock_logger):
@@ -595,9 +588,9 @@ class TestWorksheet(TestCase):
                     ["2025-10", "Makanan & Minuman", 15000],
                 ]
 
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
-                fake_ws.batch_update.side_effect = Exception("Except Error")
+                fake_sh.values_batch_update.side_effect = Exception("Except Error")
 
                 file = {
                     "is_new_file": True,
@@ -614,6 +607,7 @@ class TestWorksheet(TestCase):
                         )
                     obj.change_data_model()
 
-                mock_logger.exception.assert_any_call(
-                    "Gagal memperbarui sheet: Except Error"
+                self.assertIn(
+                    "Gagal memperbarui sheet: Except Error",
+                    logged_messages(mock_logger.exception),
                 )
@@ -2,8 +2,12 @@ from django.test import TestCase, override_settings
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 import tempfile
-from finlogic.file_processors import ProcessFile
-from finlogic.tests.helper_test import generate_dummy_file_monthly_expense
+from finlogic.file_processors import ProcessFile, sheets_client
+from finlogic.tests.helper_test import (
+    generate_dummy_file_monthly_expense,
+    logged_messages,
+    set_fake_values,
+)
 import tempfile
 from django.conf import settings
 import json
@@ -21,7 +25,11 @@ from finlogic.models import FileIntegrity
 )
 @patch("finlogic.file_processors.logger")
 class TestWorksheet(TestCase):
-    # @patch("finlogic.file_processors.hashlib.sha256")
+    def setUp(self):
+        # client di-cache per worker, reset agar mock tiap test dipakai
+        sheets_client.clear()
+
+    # @patch("finlogic.hashing.hashlib.sha256")
     def test_success(self, mock_logger):
         # generate_fake_hash(mock_sha256)
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -38,10 +46,11 @@ class TestWorksheet(TestCase):
 
                 # value palsu google sheets
                 # tanpa data hanya header
-                fake_ws.get_all_values.return_value = [
+                get_all_values_default = [
                     ["month", "total_expense", "avg_per_day", "days_count"],
                     ["2025-09", 120000, 6000, 20],
                 ]
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 file = {
                     "is_new_file": True,
@@ -74,8 +83,9 @@ class TestWorksheet(TestCase):
                 # yang masuk rows_for_append adalah month 2025-10
                 self.assertEqual(rows_for_append, [["2025-10", 10000, 10000, 1]])
 
-                mock_logger.info.assert_any_call(
-                    "Memulai pemrosesan file sheets bagian Monthly Expense"
+                self.assertIn(
+                    "Memulai pemrosesan file sheets bagian Monthly Expense",
+                    logged_messages(mock_logger.info),
                 )
                 mock_logger.info.assert_any_call(
                     "Data bagian yang di update berhasil di upload"
@@ -106,7 +116,7 @@ class TestWorksheet(TestCase):
                     ["month", "total_expense", "avg_per_day", "days_count"],
                     ["2025-09", 120000, 6000, 20],
                 ]
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 file = {
                     "is_new_file": True,
@@ -143,7 +153,7 @@ class TestWorksheet(TestCase):
                 for item in rows_for_append:
                     get_all_values_default.append(item)
 
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 # tambah data baru (simulasi file berubah)
                 with dummy_file.open("a", newline="") as f:
@@ -167,11 +177,7 @@ class TestWorksheet(TestCase):
                 self.assertEqual(
                     rows_for_update,
                     [
-                        # nilai awal dari google sheets 120000
-                        # ditambah 5000 dari dummy_file
-                        # days_count nambah 1 hari karena dummy_file
-                        # rata rata hasil variabel avg_combined
-                        {"range": "B2:D2", "values": [[125000, 5952, 21]]},
+                        # baris 2025-09 tidak berubah jadi tidak di update
                         # ini adalah baris 2025-10 nilai ini nambah 5000 karena menambah data baru di file csv sehingga days_count juga bertambah 1
                         {"range": "B3:D3", "values": [[15000, 7500, 2]]},
                     ],
@@ -211,7 +217,7 @@ class TestWorksheet(TestCase):
                     ["month", "total_expense", "avg_per_day", "days_count"],
                     ["2025-09", 120000, 6000, 20],
                 ]
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 file = {
                     "is_new_file": True,
@@ -248,7 +254,7 @@ class TestWorksheet(TestCase):
                 for item in rows_for_append:
                     get_all_values_default.append(item)
 
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 # update data (simulasi file berubah)
                 with dummy_file.open("w", newline="") as f:
@@ -276,11 +282,7 @@ class TestWorksheet(TestCase):
                 self.assertEqual(
                     rows_for_update,
                     [
-                        # nilai awal dari google sheets 120000
-                        # ditambah 5000 dari dummy_file
-                        # days_count nambah 1 hari karena dummy_file
-                        # rata rata hasil variabel avg_combined
-                        {"range": "B2:D2", "values": [[125000, 5952, 21]]},
+                        # baris 2025-09 tidak berubah jadi tidak di update
                         # ini adalah baris 2025-10 nilai ini diubah jadi 20000
                         {"range": "B3:D3", "values": [[20000, 20000, 1]]},
                     ],
@@ -320,7 +322,7 @@ class TestWorksheet(TestCase):
                     ["month", "total_expense", "avg_per_day", "days_count"],
                     ["2025-09", 120000, 6000, 20],
                 ]
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 file = {
                     "is_new_file": True,
@@ -357,7 +359,7 @@ class TestWorksheet(TestCase):
                 for item in rows_for_append:
                     get_all_values_default.append(item)
 
-                fake_ws.get_all_values.return_value = get_all_values_default
+                set_fake_values(fake_sh, fake_ws, get_all_values_default)
 
                 # update data (simulasi file berubah)
                 with dummy_file.open("w", newline="") as f:
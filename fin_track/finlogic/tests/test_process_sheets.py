@@ -0,0 +1,92 @@
+from django.test import TestCase, override_settings
+from unittest.mock import patch
+import tempfile
+from finlogic.file_processors import ProcessFile, sheets_client
+from finlogic.tests.helper_test import generate_dummy_file, patch_sheets
+
+
+@patch("finlogic.file_processors.logger")
+class TestProcessSheets(TestCase):
+    def setUp(self):
+        sheets_client.clear()
+        self.sheets = {
+            "Category Expense": [
+                ["month", "category", "total_expense"],
+                ["2025-10", "Makanan & Minuman", "15000"],
+            ],
+            "Monthly Expense": [
+                ["month", "total_expense", "avg_per_day", "days_count"],
+                ["2025-09", "120000", "6000", "20"],
+                ["2025-10", "15000", "15000", "1"],
+            ],
+        }
+
+        self.fake_sh, self.fake_ws = patch_sheets(self, self.sheets)
+
+    def process(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path, dummy_file = generate_dummy_file(tmpdir)
+            file = {"is_new_file": True, "file_name": "data_1.csv", "file": dummy_file}
+
+            obj = ProcessFile(file)
+            obj.check_changes_data_file()
+            obj.group_file_data()
+            return obj.process_sheets()
+
+    def test_one_read_and_one_write(self, mock_logger):
+        plans = self.process()
+
+        self.assertEqual(
+            plans["Category Expense"],
+            (
+                [{"range": "C2", "values": [[20000]]}],
+                [["2025-10", "Transportasi", 10000]],
+            ),
+        )
+        self.assertEqual(
+            plans["Monthly Expense"],
+            ([{"range": "B3:D3", "values": [[30000, 15000, 2]]}], []),
+        )
+
+        self.fake_sh.values_batch_get.assert_called_once_with(
+            ["'Category Expense'!A1:C", "'Monthly Expense'!A1:D"]
+        )
+        # append ditulis ke range tepat setelah baris terakhir
+        self.fake_sh.values_batch_update.assert_called_once_with(
+            {
+                "valueInputOption": "RAW",
+                "data": [
+                    {"range": "'Category Expense'!C2", "values": [[20000]]},
+                    {
+                        "range": "'Category Expense'!A3:C3",
+                        "values": [["2025-10", "Transportasi", 10000]],
+                    },
+                    {"range": "'Monthly Expense'!B3:D3", "values": [[30000, 15000, 2]]},
+                ],
+            }
+        )
+        self.fake_ws.add_rows.assert_not_called()
+        self.fake_ws.batch_update.assert_not_called()
+        self.fake_ws.append_rows.assert_not_called()
+
+    def test_add_rows_when_grid_full(self, mock_logger):
+        self.fake_ws.row_count = 2
+
+        self.process()
+
+        self.fake_ws.add_rows.assert_called_once_with(101)
+
+    def test_nothing_changed(self, mock_logger):
+        self.sheets["Category Expense"] = self.sheets["Category Expense"][:1]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path, dummy_file = generate_dummy_file(tmpdir)
+            file = {"is_new_file": True, "file_name": "data_1.csv", "file": dummy_file}
+
+            obj = ProcessFile(file)
+            obj.grouped_data_category, obj.grouped_monthly_data = {}, {}
+            plans = obj.process_sheets()
+
+        self.assertEqual(
+            plans, {"Category Expense": ([], []), "Monthly Expense": ([], [])}
+        )
+        self.fake_sh.values_batch_update.assert_not_called()
@@ -0,0 +1,150 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from unittest.mock import patch
+from datetime import datetime, timedelta
+from finlogic.models import ProcessingRun, ProcessingRunDaily
+from finlogic.run_history import (
+    cleanup_runs,
+    daily_stage_stats,
+    percentile,
+    rollup_runs,
+)
+from finlogic.run_stats import RunStats
+
+
+def create_run(started_at, outcome="success", parse=1.0, rows_read=100):
+    return ProcessingRun.objects.create(
+        file_name="data_1.csv",
+        outcome=outcome,
+        started_at=started_at,
+        wall_time=parse + 1,
+        stages={"parse": {"wall": parse, "cpu": parse}},
+        rows_read=rows_read,
+        api_calls=2,
+    )
+
+
+@patch("finlogic.run_history.logger")
+@patch("finlogic.run_stats.logger")
+class TestRunHistory(TestCase):
+    def setUp(self):
+        # 2025-10-01 10:00 waktu lokal (Asia/Jakarta)
+        self.day = timezone.make_aware(datetime(2025, 10, 1, 10))
+
+    def test_save_run_from_stats(self, *mocks):
+        stats = RunStats("data_1.csv")
+        stats.count("rows_read", 10)
+        stats.count("api_calls", 2)
+        stats.count("cells_updated", 6)
+        with stats.stage("parse"):
+            pass
+
+        # save_run adalah hook default di settings
+        stats.finish("failed", KeyError("x"))
+
+        run = ProcessingRun.objects.get()
+        self.assertEqual(run.outcome, "failed")
+        self.assertEqual(run.error_class, "KeyError")
+        self.assertEqual(run.started_at, stats.started_at)
+        self.assertEqual((run.rows_read, run.api_calls), (10, 2))
+        self.assertEqual(run.counters["cells_updated"], 6)
+        self.assertIn("parse", run.stages)
+
+    def test_percentile(self, *mocks):
+        values = list(range(1, 21))
+
+        self.assertEqual(percentile(values, 50), 10)
+        self.assertEqual(percentile(values, 95), 19)
+        self.assertEqual(percentile([3], 95), 3)
+        self.assertIsNone(percentile([], 50))
+
+    def test_rollup_runs(self, *mocks):
+        for i in range(4):
+            create_run(self.day + timedelta(hours=i), parse=i + 1)
+        create_run(self.day, outcome="failed")
+        create_run(self.day + timedelta(days=1))
+        recent = create_run(self.day + timedelta(days=10))
+
+        deleted = rollup_runs(self.day + timedelta(days=5))
+
+        self.assertEqual(deleted, 6)
+        self.assertEqual(list(ProcessingRun.objects.all()), [recent])
+        daily = ProcessingRunDaily.objects.get(day="2025-10-01", outcome="success")
+        self.assertEqual(daily.runs, 4)
+        self.assertEqual(daily.rows_read, 400)
+        self.assertEqual(daily.api_calls, 8)
+        self.assertEqual(daily.wall_time, 14)
+        self.assertEqual(daily.stages, {"parse": {"p50": 2, "p95": 4}})
+        self.assertEqual(ProcessingRunDaily.objects.count(), 3)
+
+    def test_rollup_merged_with_existing_day(self, *mocks):
+        create_run(self.day, parse=1)
+        rollup_runs(self.day + timedelta(hours=1))
+        create_run(self.day + timedelta(hours=2), parse=3)
+
+        rollup_runs(self.day + timedelta(days=1))
+
+        daily = ProcessingRunDaily.objects.get()
+        self.assertEqual(daily.runs, 2)
+        self.assertEqual(daily.rows_read, 200)
+        self.assertEqual(daily.stages, {"parse": {"p50": 2, "p95": 2}})
+
+    @override_settings(PROCESSING_RUN_RETENTION_DAYS=30, PROCESSING_RUN_ROLLUP=False)
+    def test_cleanup_without_rollup(self, *mocks):
+        create_run(timezone.now() - timedelta(days=31))
+        recent = create_run(timezone.now() - timedelta(days=29))
+
+        self.assertEqual(cleanup_runs(), 1)
+
+        self.assertEqual(list(ProcessingRun.objects.all()), [recent])
+        self.assertFalse(ProcessingRunDaily.objects.exists())
+
+    def test_daily_stage_stats(self, *mocks):
+        create_run(self.day, parse=1)
+        rollup_runs(self.day + timedelta(hours=1))
+        create_run(self.day + timedelta(days=1), parse=2)
+        create_run(self.day + timedelta(days=1, hours=1), parse=4)
+
+        rows = daily_stage_stats(self.day - timedelta(days=1))
+
+        self.assertEqual(
+            rows,
+            [
+                {
+                    "day": self.day.date(),
+                    "runs": 1,
+                    "stages": {"parse": {"p50": 1, "p95": 1}},
+                },
+                {
+                    "day": self.day.date() + timedelta(days=1),
+                    "runs": 2,
+                    "stages": {"parse": {"p50": 2, "p95": 4}},
+                },
+            ],
+        )
+
+
+class TestProcessingRunAdmin(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_superuser(
+            email="admin@example.com", username="admin", password="pass"
+        )
+        self.client.force_login(user)
+
+    def test_stats_view(self):
+        create_run(timezone.now(), parse=1.5)
+
+        response = self.client.get(
+            reverse("admin:finlogic_processingrun_stats"), {"days": "7"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["stages"], ["parse"])
+        self.assertContains(response, "1.500 / 1.500")
+
+    def test_changelist_links_stats(self):
+        response = self.client.get(reverse("admin:finlogic_processingrun_changelist"))
+
+        self.assertContains(response, reverse("admin:finlogic_processingrun_stats"))
@@ -0,0 +1,173 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from unittest.mock import patch
+import tempfile
+from pathlib import Path
+import csv
+from finlogic.fake_sheets import FakeGspreadClient, FakeSpreadsheet
+from finlogic.file_processors import sheets_client
+from finlogic.run_stats import RunStats
+from finlogic.tasks import check_and_process_file_task
+from finlogic.tests.helper_test import generate_dummy_file, logged_messages
+
+# record yang diterima hook test
+received = []
+
+
+def collect_stats(record):
+    received.append(record)
+
+
+def broken_hook(record):
+    raise RuntimeError("hook rusak")
+
+
+@patch("finlogic.run_stats.logger")
+class TestRunStats(SimpleTestCase):
+    def setUp(self):
+        received.clear()
+
+    @patch("finlogic.run_stats.time.process_time", side_effect=[0, 0, 1])
+    @patch("finlogic.run_stats.time.perf_counter", side_effect=[0, 10, 12])
+    def test_stage_and_split(self, mock_perf_counter, mock_process_time, mock_logger):
+        stats = RunStats("data_1.csv")
+
+        with stats.stage("parse"):
+            pass
+        stats.split("parse", "hash", 0.5, 5)
+
+        self.assertEqual(stats.stages["parse"], {"wall": 1.5, "cpu": 0})
+        # waktu hash tidak boleh lebih besar dari waktu parsing
+        self.assertEqual(stats.stages["hash"], {"wall": 0.5, "cpu": 1})
+
+    def test_counters(self, mock_logger):
+        stats = RunStats("data_1.csv")
+
+        stats.count("rows_read", 10)
+        stats.count("rows_skipped")
+        stats.count_request(["A1:C1"], {"valueRanges": []})
+
+        self.assertEqual(stats.counters["rows_read"], 10)
+        self.assertEqual(stats.counters["rows_skipped"], 1)
+        self.assertEqual(stats.counters["api_calls"], 1)
+        self.assertEqual(stats.counters["bytes_sent"], len('["A1:C1"]'))
+        self.assertEqual(stats.counters["bytes_received"], len('{"valueRanges":[]}'))
+
+    @override_settings(
+        RUN_STATS_HOOKS=[
+            "finlogic.tests.test_run_stats.broken_hook",
+            "finlogic.tests.test_run_stats.collect_stats",
+        ]
+    )
+    def test_finish_logged_and_hooks_called(self, mock_logger):
+        stats = RunStats("data_1.csv")
+        with stats.stage("sheet_write"), stats.stage("hash"):
+            pass
+
+        record = stats.finish("failed", ValueError("x"))
+
+        mock_logger.info.assert_called_once_with(record)
+        self.assertEqual(received, [record])
+        self.assertEqual(record["outcome"], "failed")
+        self.assertEqual(record["error"], "ValueError")
+        # urutan tahap sesuai urutan pemrosesan
+        self.assertEqual(list(record["stages"]), ["hash", "sheet_write"])
+        self.assertEqual(
+            logged_messages(mock_logger.exception),
+            ["Hook statistik pemrosesan gagal dijalankan: hook rusak"],
+        )
+
+
+@override_settings(
+    CELERY_TASK_ALWAYS_EAGER=True,
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    RUN_STATS_HOOKS=["finlogic.tests.test_run_stats.collect_stats"],
+)
+@patch("finlogic.run_stats.logger")
+@patch("finlogic.file_processors.logger")
+@patch("finlogic.file_processors.Credentials.from_service_account_file")
+class TestTaskRunStats(TestCase):
+    def setUp(self):
+        received.clear()
+        sheets_client.clear()
+        self.addCleanup(sheets_client.clear)
+        self.sh = FakeSpreadsheet()
+
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        _, self.dummy_file = generate_dummy_file(tmpdir.name)
+        self.enterContext(
+            override_settings(QUARANTINE_DIR=Path(tmpdir.name) / "quarantine")
+        )
+        self.enterContext(patch("finlogic.validation.logger"))
+        with self.dummy_file.open("a", newline="") as f:
+            csv.writer(f).writerow(["", "Transportasi", "", 10000])
+
+    def run_task(self):
+        file = {"is_new_file": True, "file_name": "data_1.csv", "file": self.dummy_file}
+        with patch("finlogic.tasks.get_files_csv", return_value=[file]), patch(
+            "finlogic.file_processors.gspread.authorize",
+            return_value=FakeGspreadClient(self.sh),
+        ):
+            check_and_process_file_task()
+        (record,) = received
+        return record
+
+    def test_success(self, *mocks):
+        record = self.run_task()
+
+        self.assertEqual(record["file_name"], "data_1.csv")
+        self.assertEqual(record["outcome"], "success")
+        self.assertIsNone(record["error"])
+        self.assertEqual(
+            set(record["stages"]),
+            {
+                "credential_load",
+                "hash",
+                "parse",
+                "worksheet_fetch",
+                "diff_planning",
+                "sheet_write",
+                "db_save",
+                "email_enqueue",
+            },
+        )
+        counters = record["counters"]
+        self.assertEqual(counters["rows_read"], 3)
+        self.assertEqual(counters["rows_skipped"], 1)
+        self.assertEqual(counters["groups_category"], 2)
+        self.assertEqual(counters["groups_monthly"], 1)
+        self.assertEqual(counters["rows_appended"], 3)
+        self.assertEqual(counters["cells_updated"], 0)
+        # termasuk request metadata worksheet (client.worksheet)
+        self.assertEqual(counters["api_calls"], sum(self.sh.calls.values()))
+        self.assertEqual(counters["bytes_sent"], self.sh.bytes_sent)
+
+    def test_failed(self, *mocks):
+        self.sh.fail("values_batch_update", status=429)
+
+        record = self.run_task()
+
+        self.assertEqual(record["outcome"], "failed")
+        self.assertEqual(record["error"], "APIError")
+        self.assertEqual(record["counters"]["api_errors"], 1)
+        self.assertNotIn("db_save", record["stages"])
+
+    def test_read_error_counted(self, *mocks):
+        self.sh.fail("worksheet", status=500)
+
+        record = self.run_task()
+
+        self.assertEqual(record["outcome"], "failed")
+        self.assertEqual(record["counters"]["api_errors"], 1)
+        self.assertEqual(record["counters"]["api_calls"], sum(self.sh.calls.values()))
+
+    def test_auth_retry_counted(self, *mocks):
+        # token tidak berlaku > client dibuat ulang lalu request diulang
+        self.sh.fail("values_batch_update", status=401)
+
+        record = self.run_task()
+
+        self.assertEqual(record["outcome"], "success")
+        self.assertEqual(self.sh.calls["values_batch_update"], 2)
+        self.assertEqual(record["counters"]["api_errors"], 1)
+        self.assertEqual(record["counters"]["api_calls"], sum(self.sh.calls.values()))
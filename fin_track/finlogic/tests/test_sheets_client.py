@@ -0,0 +1,130 @@
+from django.test import TestCase, override_settings
+from unittest.mock import patch, MagicMock
+from finlogic.file_processors import ProcessFile, SheetsClient, sheets_client
+from google.auth.exceptions import RefreshError
+import gspread
+from finlogic.tests.helper_test import logged_messages
+
+
+@patch("finlogic.file_processors.logger")
+@patch("finlogic.file_processors.Credentials.from_service_account_file")
+class TestSheetsClient(TestCase):
+    def setUp(self):
+        sheets_client.clear()
+
+    def test_client_reused_between_process(self, mock_creds, mock_logger):
+        with patch("finlogic.file_processors.gspread.authorize") as mock_authorize:
+            fake_gc = MagicMock()
+            fake_sh = MagicMock()
+            mock_authorize.return_value = fake_gc
+            fake_gc.open_by_key.return_value = fake_sh
+
+            file = {"is_new_file": True, "file_name": "data_1.csv", "file": None}
+            obj_1 = ProcessFile(file)
+            obj_2 = ProcessFile(file)
+
+            self.assertIs(obj_1.sh, fake_sh)
+            self.assertIs(obj_2.sh, fake_sh)
+            # kredensial, autorisasi dan open spreadsheet hanya sekali
+            self.assertEqual(mock_creds.call_count, 1)
+            self.assertEqual(mock_authorize.call_count, 1)
+            self.assertEqual(fake_gc.open_by_key.call_count, 1)
+
+            obj_1.client.worksheet("Category Expense")
+            obj_2.client.worksheet("Category Expense")
+            self.assertEqual(fake_sh.worksheet.call_count, 1)
+
+    def test_rebuild_when_settings_changed(self, mock_creds, mock_logger):
+        with patch("finlogic.file_processors.gspread.authorize") as mock_authorize:
+            fake_gc = MagicMock()
+            mock_authorize.return_value = fake_gc
+
+            file = {"is_new_file": True, "file_name": "data_1.csv", "file": None}
+            with override_settings(ID_FILE_GOOGLE_SHEETS="fakeid1"):
+                ProcessFile(file)
+            with override_settings(ID_FILE_GOOGLE_SHEETS="fakeid2"):
+                ProcessFile(file)
+
+            self.assertEqual(mock_authorize.call_count, 2)
+            fake_gc.open_by_key.assert_called_with("fakeid2")
+
+    def test_rebuild_once_when_auth_error(self, mock_creds, mock_logger):
+        with patch("finlogic.file_processors.gspread.authorize") as mock_authorize:
+            fake_gc = MagicMock()
+            fake_sh = MagicMock()
+            fake_ws = MagicMock()
+            mock_authorize.return_value = fake_gc
+            fake_gc.open_by_key.return_value = fake_sh
+            fake_sh.worksheet.side_effect = [RefreshError("token expired"), fake_ws]
+
+            client = SheetsClient()
+            worksheet = client.worksheet("Category Expense")
+
+            self.assertEqual(worksheet, fake_ws)
+            self.assertEqual(mock_authorize.call_count, 2)
+            self.assertIn(
+                "Autentikasi Google Sheets gagal, membuat ulang client: token expired",
+                logged_messages(mock_logger.warning),
+            )
+
+    def test_rebuild_when_batch_request_auth_error(self, mock_creds, mock_logger):
+        with patch("finlogic.file_processors.gspread.authorize") as mock_authorize:
+            fake_gc = MagicMock()
+            old_sh, new_sh = MagicMock(), MagicMock()
+            mock_authorize.return_value = fake_gc
+            fake_gc.open_by_key.side_effect = [old_sh, new_sh]
+
+            fake_response = MagicMock()
+            fake_response.json.return_value = {
+                "error": {"message": "Unauthorized", "code": 401}
+            }
+            fake_response.status_code = 401
+            old_sh.values_batch_get.side_effect = gspread.exceptions.APIError(
+                fake_response
+            )
+            new_sh.values_batch_get.return_value = {"valueRanges": []}
+
+            client = SheetsClient()
+            client.worksheet("Category Expense")
+            response = client.values_batch_get(["'Category Expense'!A1:C1"])
+
+            self.assertEqual(response, {"valueRanges": []})
+            self.assertEqual(mock_authorize.call_count, 2)
+            new_sh.values_batch_get.assert_called_once_with(
+                ["'Category Expense'!A1:C1"]
+            )
+            # cache worksheet client lama tidak dipakai lagi
+            self.assertEqual(client.worksheets, {})
+            client.values_batch_update({"data": []})
+            new_sh.values_batch_update.assert_called_once_with({"data": []})
+            old_sh.values_batch_update.assert_not_called()
+
+    def test_not_rebuild_when_api_error(self, mock_creds, mock_logger):
+        with patch("finlogic.file_processors.gspread.authorize") as mock_authorize:
+            fake_gc = MagicMock()
+            fake_sh = MagicMock()
+            mock_authorize.return_value = fake_gc
+            fake_gc.open_by_key.return_value = fake_sh
+
+            fake_response = MagicMock()
+            fake_response.json.return_value = {
+                "error": {"message": "API Error", "code": 500}
+            }
+            fake_response.status_code = 500
+            fake_sh.worksheet.side_effect = gspread.exceptions.APIError(fake_response)
+
+            client = SheetsClient()
+            with self.assertRaises(gspread.exceptions.APIError):
+                client.worksheet("Category Expense")
+
+            self.assertEqual(mock_authorize.call_count, 1)
+
+    def test_inject_client(self, mock_creds, mock_logger):
+        fake_client = MagicMock()
+        file = {"is_new_file": True, "file_name": "data_1.csv", "file": None}
+
+        obj = ProcessFile(file, client=fake_client)
+
+        self.assertIs(obj.client, fake_client)
+        self.assertEqual(obj.sh, fake_client.get_spreadsheet.return_value)
+        mock_creds.assert_not_called()
@@ -0,0 +1,219 @@
+from django.test import TestCase, override_settings
+from unittest.mock import patch
+from pathlib import Path
+import tempfile
+import csv
+from finlogic.models import FileIntegrity
+from finlogic.file_processors import ProcessFile, sheets_client
+from finlogic.tests.helper_test import logged_messages, patch_sheets
+
+
+def append_rows(path, rows):
+    with path.open("a", newline="") as f:
+        csv.writer(f).writerows(rows)
+
+
+@override_settings(
+    CELERY_TASK_ALWAYS_EAGER=True,
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    SHEETS_MIRROR=False,
+    TAIL_PROCESSING=True,
+)
+@patch("finlogic.file_processors.logger")
+class TestTailProcessing(TestCase):
+    def setUp(self):
+        sheets_client.clear()
+        # isi worksheet setelah data_1.csv pertama kali diproses
+        self.sheets = {
+            "Category Expense": [
+                ["month", "category", "total_expense"],
+                ["2025-10", "Transportasi", "15000"],
+            ],
+            "Monthly Expense": [
+                ["month", "total_expense", "avg_per_day", "days_count"],
+                ["2025-10", "15000", "7500", "2"],
+            ],
+        }
+
+        patch_sheets(self, self.sheets)
+
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = Path(tmpdir.name) / "data_1.csv"
+        self.enterContext(
+            override_settings(QUARANTINE_DIR=Path(tmpdir.name) / "quarantine")
+        )
+        self.enterContext(patch("finlogic.validation.logger"))
+        with self.path.open("w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["date", "category", "subcategory", "price"])
+            writer.writerow(["2025-10-23", "Transportasi", "Tiket Umum", 10000])
+            writer.writerow(["2025-10-24", "Transportasi", "Bensin", 5000])
+
+        self.process(is_new_file=True)
+
+    def process(self, is_new_file=False):
+        file = {
+            "is_new_file": is_new_file,
+            "file_name": "data_1.csv",
+            "file": self.path,
+        }
+        obj = ProcessFile(file)
+        # stat file di test selalu berubah dalam tick yang sama
+        obj.stat_unchanged = lambda: False
+        if not obj.check_changes_data_file():
+            return obj, None
+        obj.group_file_data()
+        plans = obj.process_sheets()
+        obj.change_data_model()
+        return obj, plans
+
+    def test_new_file_records_offset(self, mock_logger):
+        model = FileIntegrity.objects.get(filename="data_1.csv")
+
+        self.assertEqual(model.processed_offset, self.path.stat().st_size)
+        self.assertEqual(model.processed_rows, 2)
+        self.assertEqual(
+            model.processed_dates, {"2025-10": ["2025-10-23", "2025-10-24"]}
+        )
+        # chunk state di tabel terpisah
+        self.assertEqual(
+            sum(chunk["rows"] for chunk in model.load_chunks()["chunks"]), 2
+        )
+
+    def test_only_tail_rows_processed(self, mock_logger):
+        offset = self.path.stat().st_size
+        append_rows(
+            self.path,
+            [
+                ["2025-10-24", "Transportasi", "Bensin", 3000],
+                ["2025-10-25", "Hiburan", "Bioskop", 50000],
+                ["2025-10-25", "", "Bioskop", 1000],
+            ],
+        )
+
+        obj, plans = self.process()
+
+        self.assertTrue(obj.tail)
+        # hanya baris baru yang di grouping
+        self.assertEqual(
+            obj.grouped_data_category,
+            {"2025-10": {"Transportasi": 3000, "Hiburan": 50000}},
+        )
+        self.assertEqual(
+            plans["Category Expense"],
+            (
+                [{"range": "C2", "values": [[18000]]}],
+                [["2025-10", "Hiburan", 50000]],
+            ),
+        )
+        # 2025-10-24 sudah ada di bagian file sebelumnya, hanya 2025-10-25 yang menambah hari
+        self.assertEqual(
+            plans["Monthly Expense"],
+            ([{"range": "B2:D2", "values": [[68000, 22666, 3]]}], []),
+        )
+        self.assertIn(
+            f"Isi file sebelumnya tidak berubah, hanya {self.path.stat().st_size - offset} byte baru yang diproses",
+            logged_messages(mock_logger.info),
+        )
+        # nomor baris melanjutkan baris file sebelumnya
+        self.assertEqual(obj.validation.sample_rows, [5])
+
+        model = FileIntegrity.objects.get(filename="data_1.csv")
+        self.assertEqual(
+            model.latest_category_expense_data,
+            {"2025-10|Transportasi": 18000, "2025-10|Hiburan": 50000},
+        )
+        self.assertEqual(
+            model.latest_monthly_expense_data,
+            {"2025-10": {"total_new": 68000, "days_count_new": 3}},
+        )
+        self.assertEqual(model.processed_offset, self.path.stat().st_size)
+        self.assertEqual(model.processed_rows, 5)
+        # chunk prefix file ikut disimpan
+        self.assertEqual(
+            sum(chunk["rows"] for chunk in model.load_chunks()["chunks"]), 5
+        )
+
+    def test_prefix_rejected_rows_reported(self, mock_logger):
+        # baris ditolak di bagian file sebelumnya tetap masuk ringkasan validasi
+        append_rows(self.path, [["2025-10-25", "", "Bioskop", 1000]])
+        self.process()
+        append_rows(
+            self.path,
+            [
+                ["2025-10-26", "Hiburan", "Bioskop", 5000],
+                ["2025-10-26", "Hiburan", "", 2000],
+            ],
+        )
+
+        obj, _ = self.process()
+
+        self.assertTrue(obj.tail)
+        self.assertEqual(obj.validation.rejected, 2)
+        self.assertEqual(obj.validation.sample_rows, [3, 5])
+
+    def test_prefix_changed_full_processing(self, mock_logger):
+        data = self.path.read_text().replace("10000", "20000")
+        self.path.write_text(data)
+        append_rows(self.path, [["2025-10-25", "Transportasi", "Bensin", 3000]])
+
+        obj, plans = self.process()
+
+        self.assertFalse(obj.tail)
+        mock_logger.info.assert_any_call(
+            "Isi file sebelumnya berubah, file diproses ulang dari awal"
+        )
+        self.assertEqual(
+            plans["Category Expense"], ([{"range": "C2", "values": [[28000]]}], [])
+        )
+        self.assertEqual(
+            FileIntegrity.objects.get(
+                filename="data_1.csv"
+            ).latest_monthly_expense_data,
+            {"2025-10": {"total_new": 28000, "days_count_new": 3}},
+        )
+
+    def test_unfinished_last_row_not_used_as_offset(self, mock_logger):
+        with self.path.open("a", newline="") as f:
+            f.write("2025-10-25,Transportasi,Bensin,3000")
+
+        obj, _ = self.process()
+
+        self.assertTrue(obj.tail)
+        self.assertIsNone(
+            FileIntegrity.objects.get(filename="data_1.csv").processed_offset
+        )
+
+    @override_settings(TAIL_PROCESSING=False)
+    def test_tail_processing_disabled(self, mock_logger):
+        append_rows(self.path, [["2025-10-25", "Transportasi", "Bensin", 3000]])
+
+        obj, plans = self.process()
+
+        self.assertFalse(obj.tail)
+        self.assertEqual(
+            plans["Category Expense"], ([{"range": "C2", "values": [[18000]]}], [])
+        )
+
+    @patch("finlogic.aggregators.CHUNK_MIN_ROWS", 1)
+    @patch("finlogic.aggregators.CHUNK_MASK", 0)
+    def test_edited_row_only_chunk_parsed(self, mock_logger):
+        # proses ulang dari awal agar chunk per baris tersimpan
+        FileIntegrity.objects.all().delete()
+        self.process(is_new_file=True)
+
+        data = self.path.read_bytes().replace(b"10000", b"20000")
+        self.path.write_bytes(data)
+
+        obj, plans = self.process()
+
+        self.assertFalse(obj.tail)
+        self.assertEqual((obj.aggregator.parsed, obj.aggregator.reused), (1, 1))
+        self.assertIn(
+            "1 chunk file tidak berubah, 1 chunk diproses ulang",
+            logged_messages(mock_logger.info),
+        )
+        self.assertEqual(
+            plans["Category Expense"], ([{"range": "C2", "values": [[25000]]}], [])
+        )
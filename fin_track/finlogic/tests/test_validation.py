@@ -0,0 +1,93 @@
+from django.test import SimpleTestCase, override_settings
+from unittest.mock import patch
+from pathlib import Path
+import tempfile
+import csv
+from finlogic.validation import ValidationReport, parse_header
+
+
+@patch("finlogic.validation.QUARANTINE_BUFFER_ROWS", 2)
+@patch("finlogic.validation.logger")
+class TestValidationReport(SimpleTestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.quarantine_dir = Path(tmpdir.name) / "quarantine"
+        self.enterContext(
+            override_settings(
+                QUARANTINE_DIR=self.quarantine_dir, VALIDATION_SAMPLE_ROWS=2
+            )
+        )
+        self.header = ["date", "category", "subcategory", "price"]
+
+    def test_counts_and_quarantine(self, mock_logger):
+        report = ValidationReport("data_1.csv", self.header)
+        report.reject(2, ["category"], ["2025-10-23", "", "Bioskop", "1000"])
+        report.reject(5, ["subcategory", "price"], ["2025-10-23", "Hiburan"])
+        report.reject(9, ["category"], ["2025-10-24", "", "Bensin", "7000"])
+
+        summary = report.finish()
+
+        self.assertEqual(summary["rows_rejected"], 3)
+        self.assertEqual(summary["reasons"], {"empty_field": 2, "missing_column": 1})
+        self.assertEqual(
+            summary["fields"], {"category": 2, "subcategory": 1, "price": 1}
+        )
+        # nomor baris dibatasi VALIDATION_SAMPLE_ROWS
+        self.assertEqual(summary["sample_rows"], [2, 5])
+        mock_logger.warning.assert_called_once_with(summary)
+
+        # baris di buffer dan di file sementara ditulis semua
+        with open(summary["quarantine_file"], newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["row", "reason", "fields", *self.header])
+        self.assertEqual([row[0] for row in rows[1:]], ["2", "5", "9"])
+        self.assertEqual(
+            rows[2],
+            ["5", "missing_column", "subcategory, price", "2025-10-23", "Hiburan"],
+        )
+
+    def test_finish_once(self, mock_logger):
+        report = ValidationReport("data_1.csv", self.header)
+        report.reject(2, ["category"], ["2025-10-23", "", "Bioskop", "1000"])
+
+        report.finish()
+        report.finish()
+
+        self.assertEqual(len(list(self.quarantine_dir.iterdir())), 1)
+        mock_logger.warning.assert_called_once()
+
+    def test_no_rejected_rows(self, mock_logger):
+        report = ValidationReport("data_1.csv", self.header)
+
+        summary = report.finish()
+
+        self.assertEqual(summary["rows_rejected"], 0)
+        self.assertIsNone(summary["quarantine_file"])
+        self.assertFalse(self.quarantine_dir.exists())
+        mock_logger.info.assert_called_once_with(summary)
+        self.assertEqual(report.message(), "")
+
+    def test_message(self, mock_logger):
+        report = ValidationReport("data_1.csv", self.header)
+        report.reject(2, ["category"], ["2025-10-23", "", "Bioskop", "1000"])
+        report.finish()
+
+        self.assertEqual(
+            report.message(),
+            "File data_1.csv: 1 baris data dilewati\n"
+            "- Field kosong: 1 baris\n"
+            "Field kosong: category (1)\n"
+            "Contoh nomor baris: 2\n"
+            f"Baris yang dilewati disimpan di: {report.quarantine_file}",
+        )
+
+
+class TestParseHeader(SimpleTestCase):
+    def test_header_line(self):
+        self.assertEqual(
+            parse_header('date,"category",subcategory,price\r\n'),
+            ["date", "category", "subcategory", "price"],
+        )
+        # file kosong
+        self.assertEqual(parse_header(None), [])
@@ -0,0 +1,146 @@
+from django.test import TestCase, override_settings
+from unittest.mock import patch, MagicMock
+import tempfile
+from finlogic.file_processors import ProcessFile, sheets_client
+from finlogic.models import WorksheetMirror
+from finlogic.tests.helper_test import (
+    generate_dummy_file,
+    logged_messages,
+    set_fake_values,
+)
+
+
+@patch("finlogic.file_processors.logger")
+class TestWorksheetMirror(TestCase):
+    def setUp(self):
+        sheets_client.clear()
+        self.values = [
+            ["month", "category", "total_expense"],
+            ["2025-09", "Transportasi", "10000"],
+            ["2025-10", "Makanan & Minuman", "15000"],
+        ]
+
+        patcher = patch("finlogic.file_processors.gspread.authorize")
+        mock_authorize = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        fake_gc = MagicMock()
+        self.fake_sh = MagicMock()
+        self.fake_ws = MagicMock()
+        mock_authorize.return_value = fake_gc
+        fake_gc.open_by_key.return_value = self.fake_sh
+        self.fake_sh.worksheet.return_value = self.fake_ws
+        set_fake_values(self.fake_sh, self.fake_ws, self.values)
+
+    def get_rows(self, months):
+        file = {"is_new_file": True, "file_name": "data_1.csv", "file": None}
+        self.fake_sh.values_batch_get.reset_mock()
+        return ProcessFile(file).get_worksheet_rows("Category Expense", months)
+
+    def test_create_mirror(self, mock_logger):
+        worksheet, rows = self.get_rows({"2025-10"})
+
+        self.assertEqual(rows, {3: ["2025-10", "Makanan & Minuman", "15000"]})
+        self.fake_sh.values_batch_get.assert_called_once_with(
+            ["'Category Expense'!A1:C"]
+        )
+
+        mirror = WorksheetMirror.objects.get(name="Category Expense")
+        self.assertEqual(mirror.rows, self.values[1:])
+
+    def test_use_mirror_when_match(self, mock_logger):
+        self.get_rows({"2025-10"})
+        worksheet, rows = self.get_rows({"2025-09"})
+
+        self.assertEqual(rows, {2: ["2025-09", "Transportasi", "10000"]})
+        # hanya 1 request untuk cek header, kolom key dan baris yang dibaca
+        self.fake_sh.values_batch_get.assert_called_once_with(
+            [
+                "'Category Expense'!A1:C1",
+                "'Category Expense'!A2:B",
+                "'Category Expense'!A2:C2",
+            ]
+        )
+
+    def test_refetch_when_drift(self, mock_logger):
+        self.get_rows({"2025-10"})
+        # baris ditambah langsung di google sheets
+        self.values.append(["2025-10", "Hiburan", "7000"])
+
+        worksheet, rows = self.get_rows({"2025-10"})
+
+        self.assertEqual(
+            rows,
+            {
+                3: ["2025-10", "Makanan & Minuman", "15000"],
+                4: ["2025-10", "Hiburan", "7000"],
+            },
+        )
+        self.fake_sh.values_batch_get.assert_called_with(["'Category Expense'!A1:C"])
+        self.assertIn(
+            "Mirror worksheet 'Category Expense' berbeda dengan google sheets, worksheet diambil ulang",
+            logged_messages(mock_logger.warning),
+        )
+
+    def test_refetch_when_touched_row_edited(self, mock_logger):
+        self.values.append(["2025-11", "Hiburan", "7000"])
+        self.get_rows({"2025-09"})
+        # baris di tengah worksheet diubah manual
+        self.values[2][2] = "16000"
+
+        worksheet, rows = self.get_rows({"2025-10"})
+
+        self.assertEqual(rows, {3: ["2025-10", "Makanan & Minuman", "16000"]})
+        self.fake_sh.values_batch_get.assert_called_with(["'Category Expense'!A1:C"])
+
+    def test_refetch_when_key_edited(self, mock_logger):
+        self.get_rows({"2025-09"})
+        self.values[2][1] = "Hiburan"
+
+        worksheet, rows = self.get_rows({"2025-09"})
+
+        self.fake_sh.values_batch_get.assert_called_with(["'Category Expense'!A1:C"])
+        mirror = WorksheetMirror.objects.get(name="Category Expense")
+        self.assertEqual(mirror.rows[1], ["2025-10", "Hiburan", "15000"])
+
+    @override_settings(SHEETS_MIRROR_VERIFY=False)
+    def test_without_verify(self, mock_logger):
+        self.get_rows({"2025-10"})
+        self.get_rows({"2025-10"})
+
+        self.fake_sh.values_batch_get.assert_not_called()
+
+    def test_mirror_follow_changes(self, mock_logger):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path, dummy_file = generate_dummy_file(tmpdir)
+            file = {"is_new_file": True, "file_name": "data_1.csv", "file": dummy_file}
+
+            obj = ProcessFile(file)
+            obj.check_changes_data_file()
+            obj.group_file_data()
+            obj.process_file_category_expense()
+
+        mirror = WorksheetMirror.objects.get(name="Category Expense")
+        self.assertEqual(
+            mirror.rows,
+            [
+                ["2025-09", "Transportasi", "10000"],
+                ["2025-10", "Makanan & Minuman", 20000],  # 15000 + 5000
+                ["2025-10", "Transportasi", 10000],
+            ],
+        )
+
+    def test_drop_mirror_when_upload_failed(self, mock_logger):
+        self.fake_sh.values_batch_update.side_effect = Exception("Except Error")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fake_path, dummy_file = generate_dummy_file(tmpdir)
+            file = {"is_new_file": True, "file_name": "data_1.csv", "file": dummy_file}
+
+            obj = ProcessFile(file)
+            obj.check_changes_data_file()
+            obj.group_file_data()
+            with self.assertRaises(Exception):
+                obj.process_file_category_expense()
+
+        self.assertFalse(WorksheetMirror.objects.exists())
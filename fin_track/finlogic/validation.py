@@ -0,0 +1,138 @@
+from django.conf import settings
+from django.utils.timezone import localtime
+from collections import Counter
+from pathlib import Path
+import csv
+import logging
+import shutil
+import tempfile
+
+logger = logging.getLogger("fintrack")
+
+# alasan baris data ditolak
+REASONS = {
+    "empty_field": "Field kosong",
+    "missing_column": "Jumlah kolom kurang dari header",
+}
+# baris ditolak ditulis ke file sementara setiap QUARANTINE_BUFFER_ROWS baris
+QUARANTINE_BUFFER_ROWS = 1000
+
+
+def parse_header(header):
+    # baris header hasil ingest (ChunkedAggregator.header) > list kolom, list kosong jika file kosong
+    return next(csv.reader([header]), []) if header else []
+
+
+class ValidationReport:
+    """
+    Ringkasan baris data yang ditolak saat agregasi 1 file.
+    Jumlah baris ditolak dihitung per alasan dan per field, nomor baris yang disimpan dibatasi
+    settings.VALIDATION_SAMPLE_ROWS. Semua baris ditolak ditulis sekaligus ke file karantina csv
+    di settings.QUARANTINE_DIR saat finish, file tidak dibuat jika data file tidak diproses
+    """
+
+    def __init__(self, file_name, header=None):
+        self.file_name = file_name
+        self.header = header or []
+        self.rejected = 0
+        self.reasons = Counter()
+        self.fields = Counter()
+        self.sample_rows = []
+        self.sample_size = settings.VALIDATION_SAMPLE_ROWS
+        self.quarantine_file = None
+        self.finished = False
+        # baris ditolak > [nomor_baris, alasan, field, *isi baris]
+        self.buffer = []
+        # file sementara di memori, pindah ke disk jika besar
+        self.spool = None
+
+    def reject(self, i, missing_fields, row):
+        reason = "missing_column" if len(row) < len(self.header) else "empty_field"
+        self.rejected += 1
+        self.reasons[reason] += 1
+        self.fields.update(missing_fields)
+        if len(self.sample_rows) < self.sample_size:
+            self.sample_rows.append(i)
+        self.buffer.append([i, reason, ", ".join(missing_fields), *row])
+        if len(self.buffer) >= QUARANTINE_BUFFER_ROWS:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if self.spool is None:
+            self.spool = tempfile.SpooledTemporaryFile(
+                max_size=1024 * 1024, mode="w+", newline="", encoding="utf-8"
+            )
+        csv.writer(self.spool).writerows(self.buffer)
+        self.buffer = []
+
+    def write_quarantine(self):
+        self.flush()
+        directory = Path(settings.QUARANTINE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = (
+            directory
+            / f"{Path(self.file_name).stem}_{localtime().strftime('%Y%m%d_%H%M%S')}.csv"
+        )
+        with path.open("w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(["row", "reason", "fields", *self.header])
+            self.spool.seek(0)
+            shutil.copyfileobj(self.spool, f)
+        self.close()
+        return path
+
+    def close(self):
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+        self.buffer = []
+
+    def as_dict(self):
+        return {
+            "type": "validation_summary",
+            "file_name": self.file_name,
+            "rows_rejected": self.rejected,
+            "reasons": dict(self.reasons),
+            "fields": dict(self.fields.most_common()),
+            "sample_rows": self.sample_rows,
+            "quarantine_file": (
+                str(self.quarantine_file) if self.quarantine_file else None
+            ),
+        }
+
+    def finish(self):
+        # dipanggil 1 kali setelah data file diproses > tulis file karantina dan 1 record ringkasan ke log
+        if self.finished:
+            return self.as_dict()
+        self.finished = True
+        if self.rejected:
+            try:
+                self.quarantine_file = self.write_quarantine()
+            except OSError as e:
+                logger.error("File karantina %s gagal ditulis: %s", self.file_name, e)
+                self.close()
+            logger.warning(self.as_dict())
+        else:
+            logger.info(self.as_dict())
+        return self.as_dict()
+
+    def message(self):
+        # ringkasan untuk email, kosong jika tidak ada baris yang ditolak
+        if not self.rejected:
+            return ""
+        lines = [
+            f"File {self.file_name}: {self.rejected} baris data dilewati",
+            *(
+                f"- {REASONS.get(reason, reason)}: {count} baris"
+                for reason, count in self.reasons.most_common()
+            ),
+            "Field kosong: "
+            + ", ".join(
+                f"{field} ({count})" for field, count in self.fields.most_common()
+            ),
+            "Contoh nomor baris: " + ", ".join(str(i) for i in self.sample_rows),
+        ]
+        if self.quarantine_file:
+            lines.append(f"Baris yang dilewati disimpan di: {self.quarantine_file}")
+        return "\n".join(lines)